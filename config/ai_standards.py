@@ -1,7 +1,7 @@
 """AI-powered code quality analysis."""
 
 import os
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
 from openai import AsyncOpenAI  # Use async client
 from termcolor import colored
 import json
@@ -14,11 +14,33 @@ AI_MODELS = {
     'DETAILED': 'gpt-4-turbo-preview'
 }
 
+# Model routing across AI_MODELS tiers (see quality_monitor.routing)
+AI_ROUTING = {
+    'fast_max_lines': 60,       # Starting size limit for FAST; learned afterwards
+    'fast_max_risk': 0.5,       # Riskier files start on DEFAULT
+    'min_confidence': 0.4,      # Escalate results less confident than this
+    'max_disagreement': 0.2,    # Tolerated FAST disagreement rate per size bucket
+    'max_latency_ratio': 0.8,   # FAST must be at least this much faster than DEFAULT
+    'score_tolerance': 15,      # Score gap that counts as disagreement
+    'audit_every': 20,          # Also run DEFAULT on every Nth FAST result
+    'probe_every': 10,          # While FAST is off, still try it on every Nth small change
+    'latency_window': 20,       # Recent timings per tier that latency decisions use
+    'min_samples': 5            # Comparisons or timings before they are trusted
+}
+
+# Latency budget for interactive AI analysis (see quality_monitor.deadline)
+AI_DEADLINE = {
+    'budget_seconds': 1.0,          # Plan's response target; heuristic result after this
+    'hedge_after_seconds': None,    # Send a duplicate request if still waiting (None: never)
+    'late_timeout_seconds': 30.0    # How long a late remote result may still replace it
+}
+
 ANALYSIS_PROMPT = """Analyze this Python code and return a JSON object.
 
 IMPORTANT: Your response must be VALID JSON with this EXACT structure:
 {
     "score": <integer between 0 and 100>,
+    "confidence": <number between 0 and 1: how sure you are of the score>,
     "issues": [
         {
             "type": "STYLE",
@@ -36,6 +58,98 @@ Code to analyze:
 {code}
 """
 
+# Key of the marker a streaming callback receives instead of an issue when
+# the issues it has so far are superseded by the ones that follow
+RESET_ISSUES = "reset_issues"
+
+def emit_issues(result: Dict, on_issue: Optional[Callable[[Dict], None]]) -> Dict:
+    """Hand a complete result's issues to a streaming callback."""
+    if on_issue:
+        for issue in result.get("issues", []):
+            on_issue(issue)
+    return result
+
+def reset_issues(on_issue: Optional[Callable[[Dict], None]], source: str) -> None:
+    """Tell a streaming callback to drop the issues it has received so far."""
+    if on_issue:
+        on_issue({RESET_ISSUES: True, "source": source})
+
+class IncrementalIssueParser:
+    """Incremental parser for a streamed analysis JSON object.
+    
+    Fed successive chunks of the response, it returns each element of the
+    top-level "issues" array as soon as that element's closing brace
+    arrives. It scans each character once and tracks only string state and
+    container depth. `finish` parses the complete object.
+    """
+    
+    def __init__(self):
+        self.text = ""
+        self.issues: List[Dict] = []
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None
+        self._in_issues = False
+        self._element_start: Optional[int] = None
+    
+    def feed(self, chunk: str) -> List[Dict]:
+        """Consume a chunk and return the issues it completed."""
+        self.text += chunk
+        text, completed = self.text, []
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:  # Top-level key (or value)
+                        self._last_key = text[self._string_start + 1:pos]
+                continue
+            
+            if char == '"':
+                self._in_string, self._string_start = True, pos
+            elif char in '{[':
+                if char == '[' and len(self._stack) == 1 and self._last_key == "issues":
+                    self._in_issues = True
+                elif char == '{' and self._in_issues and len(self._stack) == 2:
+                    self._element_start = pos
+                self._stack.append(char)
+            elif char in '}]':
+                if self._stack:
+                    self._stack.pop()
+                if self._in_issues and len(self._stack) == 2 and self._element_start is not None:
+                    issue = self._parse_element(text[self._element_start:pos + 1])
+                    if issue is not None:
+                        completed.append(issue)
+                    self._element_start = None
+                elif self._in_issues and len(self._stack) == 1:
+                    self._in_issues = False  # Closed the issues array
+        
+        self._pos = len(text)
+        self.issues.extend(completed)
+        return completed
+    
+    def finish(self) -> Dict:
+        """Parse the complete response."""
+        content = self.text.strip()
+        if not content.startswith('{'):
+            raise ValueError("Response is not JSON")
+        return json.loads(content)
+    
+    @staticmethod
+    def _parse_element(element: str) -> Optional[Dict]:
+        try:
+            issue = json.loads(element)
+        except json.JSONDecodeError:
+            return None
+        return issue if isinstance(issue, dict) else None
+
 class AIQualityAnalyzer:
     def __init__(self):
         self.client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
@@ -45,22 +159,21 @@ class AIQualityAnalyzer:
         else:
             self.mock_mode = False
     
-    async def analyze_code(self, code: str, model: str = AI_MODELS['DEFAULT']) -> Dict:
-        """Analyze code quality using AI with mock fallback."""
+    async def analyze_code(self, code: str, model: str = AI_MODELS['DEFAULT'],
+                           context=None) -> Dict:
+        """Analyze code quality using AI with mock fallback.
+        
+        `context` is an optional AnalysisContext for the same code whose
+        precomputed lines are reused by the heuristic fallback.
+        """
         if self.mock_mode:
-            return await self._mock_analysis(code)
+            return await self._mock_analysis(code, context)
         
         try:
             # Ensure we get JSON response
             response = await self.client.chat.completions.create(
                 model=model,
-                messages=[{
-                    "role": "system",
-                    "content": "You are a code analyzer. Respond with ONLY a JSON object."
-                }, {
-                    "role": "user",
-                    "content": ANALYSIS_PROMPT.format(code=code)
-                }],
+                messages=self._messages(code),
                 temperature=0.0,
                 response_format={"type": "json_object"},
                 max_tokens=1000,
@@ -84,23 +197,95 @@ class AIQualityAnalyzer:
                 raise ValueError("Response is not JSON")
             
             try:
-                result = json.loads(content)
-                return {
-                    "score": int(result.get("score", 0)),
-                    "issues": result.get("issues", []),
-                    "suggestions": result.get("suggestions", [])
-                }
+                return self._ai_result(json.loads(content))
             except json.JSONDecodeError as e:
                 print(colored(f"JSON error at pos {e.pos}: {content[e.pos-10:e.pos+10]}", "red"))
                 raise
             
         except Exception as e:
             print(colored(f"OpenAI request failed: {str(e)}", "red"))
-            return await self._mock_analysis(code)
+            return await self._mock_analysis(code, context)
+    
+    async def analyze_code_stream(self, code: str, model: str = AI_MODELS['DEFAULT'],
+                                  context=None, on_issue=None) -> Dict:
+        """Analyze code with a streamed completion.
+        
+        `on_issue` is called with each issue as soon as its JSON object is
+        complete, long before the whole response has arrived. Returns the
+        same result dict as `analyze_code`. If the stream fails midway, the
+        heuristic issues follow a reset (see `reset_issues`).
+        """
+        if self.mock_mode:
+            result = await self._mock_analysis(code, context)
+            emit_issues(result, on_issue)
+            return result
+        
+        parser = IncrementalIssueParser()
+        streamed = []
+        try:
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=self._messages(code),
+                temperature=0.0,
+                response_format={"type": "json_object"},
+                max_tokens=1000,
+                stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    for issue in parser.feed(delta):
+                        streamed.append(issue)
+                        if on_issue:
+                            on_issue(issue)
+            
+            return self._ai_result(parser.finish())
+        except Exception as e:
+            print(colored(f"OpenAI streaming request failed: {str(e)}", "red"))
+            result = await self._mock_analysis(code, context)
+            if streamed:
+                reset_issues(on_issue, result.get("source", "heuristic"))
+            emit_issues(result, on_issue)
+            return result
+    
+    async def heuristic_analysis(self, code: str, context=None) -> Dict:
+        """Local heuristic analysis, used when the remote model is unavailable or slow."""
+        return await self._mock_analysis(code, context)
+    
+    @staticmethod
+    def _messages(code: str) -> List[Dict]:
+        """Chat messages asking for a JSON analysis of code."""
+        return [{
+            "role": "system",
+            "content": "You are a code analyzer. Respond with ONLY a JSON object."
+        }, {
+            "role": "user",
+            "content": ANALYSIS_PROMPT.replace("{code}", code)  # Prompt has literal JSON braces
+        }]
+    
+    @staticmethod
+    def _ai_result(response: Dict) -> Dict:
+        """Result dict of a parsed response; missing or malformed fields mark it incomplete."""
+        result = {
+            "score": 0,
+            "issues": response.get("issues", []),
+            "suggestions": response.get("suggestions", []),
+            "source": "ai"
+        }
+        try:
+            result["score"] = int(response["score"])
+        except (KeyError, TypeError, ValueError):
+            result["incomplete"] = True
+        if not isinstance(result["issues"], list) or not isinstance(result["suggestions"], list):
+            result.update(issues=[], suggestions=[], incomplete=True)
+        if isinstance(response.get("confidence"), (int, float)):
+            result["confidence"] = min(1.0, max(0.0, float(response["confidence"])))
+        return result
     
-    async def _mock_analysis(self, code: str) -> Dict:
+    async def _mock_analysis(self, code: str, context=None) -> Dict:
         """Enhanced mock analysis with real quality checks."""
         try:
+            lines = context.lines if context is not None else code.split('\n')
             quality_score = 70
             issues = []
             suggestions = []
@@ -243,7 +428,7 @@ class AIQualityAnalyzer:
                 })
             
             # Line Length (-10 each)
-            long_lines = [i+1 for i, line in enumerate(code.split('\n')) 
+            long_lines = [i+1 for i, line in enumerate(lines) 
                          if len(line.strip()) > 80]
             if long_lines:
                 quality_score -= 10
@@ -255,12 +440,13 @@ class AIQualityAnalyzer:
                 })
             
             # Whitespace Consistency (-5 each)
-            indent_pattern = re.compile(r'^( +)[^\n\s][^\n]*$', re.MULTILINE)  # Only non-empty lines
             indents = set()
-            for match in indent_pattern.finditer(code):
-                spaces = len(match.group(1))
-                if spaces > 0:  # Only care about actual indentation
-                    indents.add(spaces)
+            for line in lines:
+                stripped = line.lstrip(' ')
+                if stripped and not stripped[0].isspace():  # Only non-empty lines
+                    spaces = len(line) - len(stripped)
+                    if spaces > 0:  # Only care about actual indentation
+                        indents.add(spaces)
 
             if len(indents) > 1 and not all(i % 4 == 0 for i in indents):
                 quality_score -= 5
@@ -316,18 +502,20 @@ class AIQualityAnalyzer:
                 return {
                     "score": 95,
                     "issues": [],
-                    "suggestions": ["Code looks good, consider adding tests"]
+                    "suggestions": ["Code looks good, consider adding tests"],
+                    "source": "heuristic"
                 }
             
             return {
                 "score": max(min(quality_score, 100), 0),
                 "issues": issues,
-                "suggestions": suggestions or ["Improve code quality"]
+                "suggestions": suggestions or ["Improve code quality"],
+                "source": "heuristic"
             }
             
         except Exception as e:
             print(colored(f"Mock analysis failed: {str(e)}", "yellow"))
-            return {"score": 0, "issues": [], "suggestions": []}
+            return {"score": 0, "issues": [], "suggestions": [], "source": "heuristic"}
     
     def enhance_suggestions(self, issues: List[Dict]) -> List[Dict]:
         """Add AI-powered suggestions to issues."""
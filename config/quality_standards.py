@@ -22,7 +22,77 @@ REQUIRED_SECTIONS = [
 LEARNING_THRESHOLDS = {
     'min_success_ratio': 0.8,  # Learn from good code
     'pattern_min_length': 5,   # Meaningful patterns
-    'max_issues_to_learn': 1   # Limited issues allowed
+    'max_issues_to_learn': 1,  # Limited issues allowed
+    'min_metric_samples': 20   # Functions seen before percentiles are trusted
+}
+
+# Learning state shared between monitor processes (see quality_monitor.learning_sync)
+LEARNING_SYNC = {
+    'directory': 'monitor_data/learning_sync',  # One append-only delta log per process
+    'interval_seconds': 30.0                     # Minimum time between automatic syncs
+}
+
+# Adaptive Thresholds: threshold -> (function metric, project percentile)
+ADAPTIVE_PERCENTILES = {
+    'max_function_lines': ('body_length', 0.95),
+    'max_nested_depth': ('nesting_depth', 0.95),
+    'min_docstring_words': ('docstring_words', 0.10)
+}
+
+# File Ingestion Limits (bytes)
+INGESTION_LIMITS = {
+    'mmap_min_bytes': 256 * 1024,            # Map instead of read above this size
+    'max_full_check_bytes': 1024 * 1024,     # Larger files get line-based checks only
+    'max_read_bytes': 16 * 1024 * 1024,      # Larger files are skipped entirely
+    'header_sniff_bytes': 2048               # Prefix whose leading comments may mark generated code
+}
+
+# Markers of generated code (matched case-insensitively in the leading comment lines)
+GENERATED_MARKERS = [
+    "@generated",
+    "do not edit",
+    "generated by the protocol buffer compiler",
+    "autogenerated",
+    "auto-generated",
+    "code generated by"
+]
+
+# Directory names holding vendored third-party code
+VENDORED_DIRS = [
+    "vendor",
+    "_vendor",
+    "third_party",
+    "site-packages"
+]
+
+# AI Gating: when the expensive AI analysis is worth running
+AI_GATING = {
+    'skip_on_critical': True,          # Cheap CRITICAL findings (e.g. syntax errors) decide the outcome
+    'min_changed_lines': 3,            # Smaller edits keep the cheap results
+    'risk_threshold': 0.6,             # Files at least this likely to have issues get AI
+    'uncertain_score_range': (50, 85)  # Cheap scores in this range are worth a second opinion
+}
+
+# Speculative pre-analysis of files agents are about to edit (see quality_monitor.prefetch)
+PREFETCH = {
+    'co_edit_window_seconds': 300.0,  # Edits by one agent this close together are co-edits
+    'co_edit_recent': 20,             # Recent edits per agent paired with each new edit
+    'co_edit_min_count': 2,           # Co-edits seen before a pair is prefetched
+    'max_co_edits': 3,                # Co-edited files prefetched per trigger
+    'max_import_neighbours': 5        # Imported and importing files prefetched per trigger
+}
+
+# Soak test bounds for the long-running watcher (see quality_monitor.soak)
+SOAK_LIMITS = {
+    'duration_seconds': 60.0,       # Length of the edit storm
+    'warmup_seconds': 5.0,          # Caches fill up before growth is measured
+    'sample_interval_seconds': 1.0, # Memory sampling period
+    'rounds': 5,                    # Heap snapshots after warmup; growth is judged per round
+    'files': 50,                    # Files in the synthetic tree
+    'edits_per_burst': 20,          # Edits per storm burst
+    'max_rss_growth_mb': 64,        # Allowed process RSS growth after warmup
+    'max_traced_growth_mb': 16,     # Allowed steady Python heap growth after warmup
+    'max_p99_latency_ms': 1000      # Plan target: response < 1 second
 }
 
 __all__ = [
@@ -32,5 +102,13 @@ __all__ = [
     'MIN_COMMENT_RATIO',
     'MIN_DOCSTRING_WORDS',
     'REQUIRED_SECTIONS',
-    'LEARNING_THRESHOLDS'
+    'LEARNING_THRESHOLDS',
+    'LEARNING_SYNC',
+    'ADAPTIVE_PERCENTILES',
+    'INGESTION_LIMITS',
+    'GENERATED_MARKERS',
+    'VENDORED_DIRS',
+    'AI_GATING',
+    'PREFETCH',
+    'SOAK_LIMITS'
 ] 
\ No newline at end of file
@@ -3,5 +3,7 @@
 from .quality_monitor import QualityMonitor
 from .ai_integration import IntegratedQualityChecker
 from .file_monitor import FileChangeHandler
+from .coordination import CoordinationBus
+from .pipeline import QualityPipeline
 
-__all__ = ['QualityMonitor', 'IntegratedQualityChecker', 'FileChangeHandler'] 
\ No newline at end of file
+__all__ = ['QualityMonitor', 'IntegratedQualityChecker', 'FileChangeHandler', 'CoordinationBus', 'QualityPipeline']
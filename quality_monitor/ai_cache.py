@@ -0,0 +1,177 @@
+"""Reuse of AI analysis results for semantically equivalent code.
+
+Results are keyed by a fingerprint of the normalized AST rather than the
+raw text, so reformatting, re-indenting, comment edits and whitespace
+changes map to the same key and do not trigger a new paid request.
+
+How source features are treated:
+
+* Comments and formatting are not part of the AST and never change the key.
+* Docstrings are kept (their wording matters to documentation findings) but
+  compared with whitespace collapsed, so re-wrapping or re-indenting them
+  does not change the key.
+* Code that does not parse falls back to a whitespace-normalized text hash.
+"""
+
+import ast
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from termcolor import colored
+
+from config.ai_standards import AI_MODELS, emit_issues, reset_issues  # Re-exported
+
+AI_CACHE_SIZE = 2048
+AI_CACHE_FILE = Path("monitor_data/ai_cache.json")
+
+DOCSTRING_OWNERS = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def semantic_fingerprint(code: str, tree: Optional[ast.AST] = None) -> str:
+    """Fingerprint code by its normalized AST.
+
+    An already parsed `tree` for the same code can be passed in; it is
+    left unchanged.
+    """
+    if tree is None:
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError):
+            return _text_fingerprint(code)
+
+    docstrings = []
+    for node in ast.walk(tree):
+        if isinstance(node, DOCSTRING_OWNERS) and node.body:
+            first = node.body[0]
+            if (isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant)
+                    and isinstance(first.value.value, str)):
+                docstrings.append((first.value, first.value.value))
+
+    try:
+        for constant, text in docstrings:
+            constant.value = " ".join(text.split())
+        dump = ast.dump(tree, annotate_fields=False, include_attributes=False)
+    finally:
+        for constant, text in docstrings:
+            constant.value = text  # Shared trees must not see the normalization
+    return "ast:" + hashlib.blake2b(dump.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _text_fingerprint(code: str) -> str:
+    """Whitespace-normalized text hash for code that does not parse."""
+    text = " ".join(code.split())
+    return "text:" + hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class AnalysisCache:
+    """LRU cache of AI results keyed by (model, semantic fingerprint).
+
+    Concurrent requests for equivalent code share one in-flight call.
+    Only genuine AI results are cached; heuristic fallbacks are not.
+    """
+
+    def __init__(self, max_entries: int = AI_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "shared": 0}
+
+    async def analyze(self, analyzer, code: str, model: Optional[str] = None,
+                      context=None, on_issue: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Return a cached result for equivalent code, or ask the analyzer.
+
+        `context` is an optional AnalysisContext for `code`; its AST is
+        reused for the fingerprint and it is handed on to the analyzer.
+        `on_issue` receives each issue as soon as it is known: streamed
+        from analyzers with `analyze_code_stream`, otherwise once the
+        result is complete.
+        """
+        model = model or AI_MODELS['DEFAULT']
+        key = f"{model}:{self._fingerprint(code, context)}"
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return emit_issues(self._copy(self._entries[key], reused=True), on_issue)
+
+        if key in self._in_flight:
+            self.stats["shared"] += 1
+            shared = self._copy(await asyncio.shield(self._in_flight[key]), reused=True)
+            return emit_issues(shared, on_issue)
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            streaming = on_issue is not None and hasattr(analyzer, "analyze_code_stream")
+            if streaming:
+                result = await analyzer.analyze_code_stream(
+                    code, model=model, context=context, on_issue=on_issue
+                )
+            else:
+                result = await analyzer.analyze_code(code, model=model, context=context)
+            future.set_result(result)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Retrieved here even if nobody shared the call
+            raise
+        finally:
+            del self._in_flight[key]
+
+        if result.get("source") == "ai":
+            self._store(key, result)
+        return self._copy(result) if streaming else emit_issues(self._copy(result), on_issue)
+
+    def store(self, code: str, result: Dict, model: Optional[str] = None, context=None) -> None:
+        """Cache a result obtained outside `analyze` (e.g. a late remote answer)."""
+        if result.get("source") == "ai":
+            model = model or AI_MODELS['DEFAULT']
+            self._store(f"{model}:{self._fingerprint(code, context)}", result)
+
+    def save(self, cache_file: Path = AI_CACHE_FILE) -> None:
+        """Persist cached results so they survive restarts."""
+        try:
+            cache_file = Path(cache_file)
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(list(self._entries.items()), f)
+        except (OSError, TypeError) as e:
+            print(colored(f"Error saving AI cache: {e}", "yellow"))
+
+    def load(self, cache_file: Path = AI_CACHE_FILE) -> None:
+        """Load results saved with `save`."""
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                for key, result in json.load(f):
+                    self._store(key, result)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(colored(f"Error loading AI cache: {e}", "yellow"))
+
+    @staticmethod
+    def _fingerprint(code: str, context=None) -> str:
+        if context is None:
+            return semantic_fingerprint(code)
+        try:
+            return semantic_fingerprint(code, context.tree)
+        except (SyntaxError, ValueError):
+            return _text_fingerprint(code)
+
+    def _store(self, key: str, result: Dict) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _copy(result: Dict, reused: bool = False) -> Dict:
+        """Copy a result so callers cannot mutate the cached one."""
+        copied = json.loads(json.dumps(result))
+        if reused:
+            copied["reused"] = True
+        return copied
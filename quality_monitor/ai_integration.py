@@ -1,12 +1,25 @@
 """AI-enhanced quality monitoring."""
 
-import ast
-from typing import Dict, List, Optional
+import difflib
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
 from termcolor import colored
 import json
 
-from .quality_monitor import QualityMonitor
-from config.ai_standards import AIQualityAnalyzer
+from .quality_monitor import QualityMonitor, syntax_issue
+from .ai_cache import AnalysisCache
+from .context import AnalysisContext
+from .gating import AIGate
+from .deadline import LatencyBudget
+from .routing import ModelRouter
+from config.ai_standards import RESET_ISSUES, AIQualityAnalyzer
+
+# Partial-result events published by IntegratedQualityChecker.check_code
+EVENT_STANDARD_ISSUES = "standard_issues"
+EVENT_AI_ISSUE = "ai_issue"
+EVENT_AI_RESET = "ai_reset"
+EVENT_RESULT = "result"
 
 class IntegratedQualityChecker:
     """Combines traditional and AI-powered quality checks."""
@@ -16,13 +29,46 @@ class IntegratedQualityChecker:
         try:
             self.standard_checker = QualityMonitor()
             self.ai_checker = AIQualityAnalyzer()
+            self.ai_cache = AnalysisCache()
+            self.ai_gate = AIGate()
+            self.router = ModelRouter(cache=self.ai_cache)
+            self.latency_budget = LatencyBudget(cache=self.ai_cache)
+            self._previous_lines: Dict[str, List[str]] = {}
+            self._subscribers: List[Callable[[Dict], None]] = []
             print(colored("Integrated Quality Checker initialized", "green"))
         except Exception as e:
             print(colored(f"Error initializing checkers: {e}", "red"))
             raise
     
-    async def check_code(self, code: str) -> Dict:
-        """Run both standard and AI-powered checks on code."""
+    async def close(self) -> None:
+        """Abandon AI requests still running past their latency budget."""
+        await self.latency_budget.cancel_late()
+    
+    def subscribe(self, callback: Callable[[Dict], None]) -> None:
+        """Receive partial results while `check_code` runs.
+        
+        Events are dicts with an "event" key: EVENT_STANDARD_ISSUES once the
+        cheap checks finish, EVENT_AI_ISSUE for each AI issue as it streams
+        in, and EVENT_RESULT with the final merged result. EVENT_AI_RESET
+        means the AI issues streamed so far are superseded by the ones that
+        follow, e.g. the heuristic's once the remote analysis gave up. If the AI missed
+        its latency budget, a second EVENT_RESULT marked "late" replaces the
+        heuristic result once the remote answer arrives.
+        """
+        self._subscribers.append(callback)
+    
+    def unsubscribe(self, callback: Callable[[Dict], None]) -> None:
+        """Stop receiving partial results."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+    
+    async def check_code(self, code: str, file_path: Optional[str] = None) -> Dict:
+        """Run cheap checks, then AI analysis when the gate says it is worth it.
+        
+        With a `file_path`, edits are compared with the previous version of
+        the same file and the file's learned issue rate counts as risk.
+        Partial results are published to subscribers as they arrive.
+        """
         results = {
             "score": 0,
             "issues": [],
@@ -30,36 +76,117 @@ class IntegratedQualityChecker:
         }
         
         try:
-            # Parse code for standard checks
-            tree = ast.parse(code)
+            # Parse code once for standard and AI checks
+            context = AnalysisContext(code, file_path)
             
-            # Run standard checks
-            standard_issues = []
-            for checker in self.standard_checker.checkers:
-                issues = checker.check(code, tree)
-                standard_issues.extend(issues)
+            # Run standard checks, cheapest first
+            started = time.perf_counter()
+            try:
+                standard_issues = self.standard_checker.registry.run(context)
+            except SyntaxError as e:
+                # A CRITICAL finding, so by default the gate does not ask the AI
+                standard_issues = [syntax_issue(e)] + self.standard_checker.token_checker.check(context)
+            self._publish({"event": EVENT_STANDARD_ISSUES, "file": file_path,
+                           "issues": standard_issues})
+            
+            changed_lines = self._changed_lines(file_path, context.lines)
+            risk = self._file_risk(file_path)
+            decision = self.ai_gate.decide(standard_issues, file_path, changed_lines, risk)
+            results["ai_decision"] = decision
+            if not decision["run"]:
+                results.update({
+                    "score": decision["score"],
+                    "issues": standard_issues,
+                    "suggestions": list(dict.fromkeys(
+                        i["suggestion"] for i in standard_issues if i.get("suggestion")
+                    ))
+                })
+                return self._finish(file_path, results)
             
             # Get AI analysis
             print(colored("\nRunning AI analysis...", "cyan"))
-            ai_result = await self.ai_checker.analyze_code(code)
+            first_issue = []
+            
+            def on_issue(issue: Dict) -> None:
+                if issue.get(RESET_ISSUES):
+                    self._publish({"event": EVENT_AI_RESET, "file": file_path,
+                                   "source": issue["source"]})
+                    return
+                if not first_issue:
+                    first_issue.append((time.perf_counter() - started) * 1000)
+                self._publish({"event": EVENT_AI_ISSUE, "file": file_path, "issue": issue})
+            
+            def on_late(late_result: Dict) -> None:
+                self._finish(file_path, self._merge(standard_issues, late_result, late=True))
+            
+            def routed(forward) -> Awaitable[Dict]:
+                return self.router.analyze(
+                    self.ai_checker, code, context, changed_lines, risk, on_issue=forward
+                )
+            
+            # One budget for the routed analysis, escalations included
+            fallback = getattr(self.ai_checker, "heuristic_analysis", None)
+            ai_result = await self.latency_budget.guard(
+                routed, fallback and (lambda: fallback(code, context)), on_issue, on_late
+            )
+            if first_issue:
+                results["first_ai_issue_ms"] = first_issue[0]
+            if ai_result and ai_result.get("deadline_exceeded"):
+                results["deadline_exceeded"] = True  # A late AI result may follow
             
             if ai_result:
-                # Combine all issues
-                all_issues = standard_issues + ai_result["issues"]
-                
-                # Update results
-                results.update({
-                    "score": ai_result["score"],
-                    "issues": all_issues,  # Include both standard and AI issues
-                    "suggestions": ai_result["suggestions"]
-                })
+                results.update(self._merge(standard_issues, ai_result))
             
-            return results
+            return self._finish(file_path, results)
             
         except Exception as e:
             print(colored(f"Error during code analysis: {e}", "red"))
             return results
     
+    @staticmethod
+    def _merge(standard_issues: List[Dict], ai_result: Dict, late: bool = False) -> Dict:
+        """Combine standard issues with an AI result."""
+        merged = {
+            "score": ai_result["score"],
+            "issues": standard_issues + ai_result["issues"],  # Include both standard and AI issues
+            "suggestions": ai_result["suggestions"]
+        }
+        if late:
+            merged["late"] = True  # Replaces an earlier heuristic result
+        return merged
+    
+    def _finish(self, file_path: Optional[str], results: Dict) -> Dict:
+        """Publish a final (or late replacement) result and return it."""
+        self._publish({"event": EVENT_RESULT, "file": file_path, "result": results})
+        return results
+    
+    def _publish(self, event: Dict) -> None:
+        """Deliver a partial-result event; subscriber errors are contained."""
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception as e:
+                print(colored(f"Subscriber error on {event['event']}: {e}", "yellow"))
+    
+    def _changed_lines(self, file_path: Optional[str], lines: List[str]) -> Optional[int]:
+        """Lines changed since the last check of the same file, if known."""
+        if file_path is None:
+            return None
+        previous = self._previous_lines.get(file_path)
+        self._previous_lines[file_path] = lines
+        if previous is None:
+            return None
+        matcher = difflib.SequenceMatcher(None, previous, lines, autojunk=False)
+        return sum(max(i2 - i1, j2 - j1)
+                   for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal")
+    
+    def _file_risk(self, file_path: Optional[str]) -> Optional[float]:
+        """Posterior probability that a file in this directory has issues."""
+        if file_path is None:
+            return None
+        beliefs = self.standard_checker.learning_system.beliefs
+        return beliefs.any_issue_rate(os.path.dirname(str(file_path))).mean
+    
     def _enhance_suggestions(self, standard_issues: List[Dict], ai_issues: List[Dict]) -> List[Dict]:
         """Combine and enhance suggestions from both sources."""
         try:
@@ -0,0 +1,179 @@
+"""Issue baseline for new-issue-only gating.
+
+Every issue gets a fingerprint that does not depend on its line number:
+a hash of the file's relative path, the rule (`TYPE:Category`), the
+qualified name of the innermost enclosing class or function, and the
+whitespace-normalized text of the flagged line. Issues without a line use
+their message with numbers masked. Identical issues in the same file are
+told apart by occurrence. Edits elsewhere in a file therefore leave the
+fingerprints of untouched issues unchanged.
+
+A baseline is a set of fingerprints saved one per line (sorted, so diffs
+stay readable). Lookup is O(1) per issue, so CI can fail only on issues
+that are not in the baseline.
+
+Usage: python -m quality_monitor.baseline [--update] [paths ...]
+"""
+
+import argparse
+import ast
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from termcolor import colored
+
+from .context import AnalysisContext
+
+BASELINE_FILE = Path(".quality_baseline")
+BASELINE_HEADER = "# quality baseline v1: one issue fingerprint per line"
+FINGERPRINT_BYTES = 8
+MODULE_SYMBOL = "<module>"
+
+NUMBERS = re.compile(r"\d+")
+SYMBOL_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def symbol_spans(tree: ast.AST) -> List[Tuple[int, int, str]]:
+    """(start, end, qualified name) of every class and function."""
+    spans = []
+
+    def visit(node: ast.AST, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, SYMBOL_NODES):
+                name = f"{prefix}{child.name}"
+                spans.append((child.lineno, child.end_lineno or child.lineno, name))
+                visit(child, name + ".")
+            else:
+                visit(child, prefix)
+
+    visit(tree, "")
+    return spans
+
+
+def enclosing_symbol(spans: List[Tuple[int, int, str]], line: Optional[int]) -> str:
+    """Qualified name of the innermost symbol containing a line."""
+    best = None
+    for start, end, name in spans:
+        if line is not None and start <= line <= end and (best is None or start >= best[0]):
+            best = (start, name)
+    return best[1] if best else MODULE_SYMBOL
+
+
+def relative_path(file_path: str, root: Optional[Path] = None) -> str:
+    path = Path(file_path).resolve()
+    try:
+        return path.relative_to((root or Path.cwd()).resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def issue_fingerprints(file_path: str, issues: List[Dict], context: AnalysisContext,
+                       root: Optional[Path] = None) -> List[str]:
+    """Line-shift-stable fingerprints for a file's issues, in order."""
+    path = relative_path(file_path, root)
+    try:
+        spans = symbol_spans(context.tree)
+    except (SyntaxError, ValueError):
+        spans = []
+
+    seen: Dict[str, int] = {}
+    fingerprints = []
+    for issue in issues:
+        line = issue.get("line")
+        if line is not None and 1 <= line <= len(context.lines):
+            snippet = " ".join(context.line(line).split())
+        else:
+            snippet = NUMBERS.sub("N", issue.get("message", ""))
+        key = "\0".join((path, f"{issue.get('type')}:{issue.get('category')}",
+                         enclosing_symbol(spans, line), snippet))
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        digest = hashlib.blake2b(f"{key}\0{occurrence}".encode("utf-8"),
+                                 digest_size=FINGERPRINT_BYTES)
+        fingerprints.append(digest.hexdigest())
+    return fingerprints
+
+
+class IssueBaseline:
+    """Set of accepted issue fingerprints."""
+
+    def __init__(self, fingerprints: Optional[Iterable[str]] = None,
+                 root: Optional[Path] = None):
+        self.fingerprints: Set[str] = set(fingerprints or ())
+        self.root = root  # Fingerprinted paths are relative to this (default: cwd)
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self.fingerprints
+
+    def record(self, file_path: str, issues: List[Dict], context: AnalysisContext) -> None:
+        """Accept a file's current issues."""
+        self.fingerprints.update(issue_fingerprints(file_path, issues, context, self.root))
+
+    def new_issues(self, file_path: str, issues: List[Dict],
+                   context: AnalysisContext) -> List[Dict]:
+        """Issues absent from the baseline, tagged with their fingerprint."""
+        fingerprints = issue_fingerprints(file_path, issues, context, self.root)
+        return [
+            dict(issue, fingerprint=fingerprint)
+            for issue, fingerprint in zip(issues, fingerprints)
+            if fingerprint not in self.fingerprints
+        ]
+
+    def save(self, baseline_file: Path = BASELINE_FILE) -> None:
+        """Write the fingerprints, sorted, one per line."""
+        try:
+            with open(baseline_file, 'w', encoding='utf-8') as f:
+                f.write(BASELINE_HEADER + "\n")
+                f.writelines(fingerprint + "\n" for fingerprint in sorted(self.fingerprints))
+        except OSError as e:
+            print(colored(f"Error saving issue baseline: {e}", "yellow"))
+
+    @classmethod
+    def load(cls, baseline_file: Path = BASELINE_FILE,
+             root: Optional[Path] = None) -> "IssueBaseline":
+        """Load a saved baseline; a missing file is an empty baseline."""
+        try:
+            with open(baseline_file, 'r', encoding='utf-8') as f:
+                return cls((line.strip() for line in f
+                            if line.strip() and not line.startswith("#")), root)
+        except FileNotFoundError:
+            return cls(root=root)
+
+
+def main() -> int:
+    from .quality_monitor import QualityMonitor
+
+    parser = argparse.ArgumentParser(description="Report issues that are not in the baseline.")
+    parser.add_argument("paths", nargs="*", default=["."])
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--update", action="store_true", help="accept all current issues")
+    args = parser.parse_args()
+
+    baseline = IssueBaseline() if args.update else IssueBaseline.load(args.baseline)
+    monitor = QualityMonitor(baseline=None if args.update else baseline)
+    for root in args.paths:
+        files = [Path(root)] if root.endswith(".py") else sorted(Path(root).rglob("*.py"))
+        for file_path in files:
+            context = monitor.check_file(str(file_path))
+            if args.update and context is not None:
+                baseline.record(str(file_path), monitor.issues.get(str(file_path), []), context)
+
+    if args.update:
+        baseline.save(args.baseline)
+        print(colored(f"Baseline of {len(baseline)} issues written to {args.baseline}", "green"))
+        return 0
+    new = sum(len(issues) for issues in monitor.new_issues.values())
+    for file_path, issues in monitor.new_issues.items():
+        for issue in issues:
+            print(colored(f"{file_path}:{issue.get('line', '?')}: {issue['type']}: {issue['message']}", "red"))
+    print(colored(f"{new} new issues", "red" if new else "green"))
+    return 1 if new else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,215 @@
+"""Bayesian beliefs about code quality.
+
+Two conjugate models, both updated by incrementing counts:
+
+* Beta posteriors for the probability that a checked file shows a given
+  issue (`TYPE:Category`), globally and per directory.
+* Dirichlet posteriors over the mix of issues, overall and over issue
+  types within each category, read straight from issue pattern counts.
+
+Posterior summaries are cached per scope (global or directory). A new
+file only rebuilds the scopes it counts towards; new counts of known
+issues only refresh the Dirichlet shares of the cached summaries.
+Credible intervals use the normal approximation to the posterior,
+clipped to [0, 1].
+"""
+
+import math
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Uniform priors
+PRIOR_ALPHA = 1.0
+PRIOR_BETA = 1.0
+DIRICHLET_PRIOR = 1.0
+
+# Issue types every category's Dirichlet prior is spread over
+ISSUE_TYPES = ("CRITICAL", "IMPORTANT", "STYLE")
+
+# 95% credible intervals
+CREDIBLE_Z = 1.96
+
+# Directories need this many files before their own posteriors are used
+MIN_DIRECTORY_FILES = 5
+
+
+class BetaPosterior:
+    """Beta(alpha, beta) belief about a probability."""
+
+    __slots__ = ("alpha", "beta")
+
+    def __init__(self, alpha: float, beta: float):
+        self.alpha = alpha
+        self.beta = beta
+
+    @property
+    def mean(self) -> float:
+        return self.alpha / (self.alpha + self.beta)
+
+    @property
+    def variance(self) -> float:
+        total = self.alpha + self.beta
+        return self.alpha * self.beta / (total * total * (total + 1))
+
+    def interval(self, z: float = CREDIBLE_Z) -> Tuple[float, float]:
+        """Approximate credible interval around the posterior mean."""
+        spread = z * math.sqrt(self.variance)
+        return max(self.mean - spread, 0.0), min(self.mean + spread, 1.0)
+
+
+def new_posterior_state() -> Dict:
+    """Return empty sufficient statistics for the file-level posteriors."""
+    return {"files": 0, "files_with_issues": 0, "file_hits": {}, "directories": {}}
+
+
+class BayesianQualityModel:
+    """Conjugate posteriors over issue occurrence, updated in O(1) per observation."""
+
+    def __init__(self, state: Dict, issue_counts: Dict[str, int]):
+        # Both dicts belong to the learning system's patterns
+        self.state = state
+        self.issue_counts = issue_counts
+        self._cache: Dict[Optional[str], Dict] = {}
+        self._counts_version = 0  # Bumped when known issue counts change
+
+    def observe_file(self, file_path: str, issues: List[Dict]) -> None:
+        """Add one file's evidence to the global and directory posteriors."""
+        keys = {f"{issue['type']}:{issue['category']}" for issue in issues}
+        directory = str(Path(file_path).parent)
+        scope = self.state["directories"].setdefault(
+            directory, {"files": 0, "files_with_issues": 0, "file_hits": {}}
+        )
+        for stats in (self.state, scope):
+            stats["files"] += 1
+            if keys:
+                stats["files_with_issues"] += 1
+            for key in keys:
+                stats["file_hits"][key] = stats["file_hits"].get(key, 0) + 1
+        self.invalidate([None, directory])
+
+    def observe_issues(self, issues: List[Dict]) -> None:
+        """Add issues to the counts behind the Dirichlet posteriors."""
+        new_key = False
+        for issue in issues:
+            key = f"{issue['type']}:{issue['category']}"
+            new_key = new_key or key not in self.issue_counts
+            self.issue_counts[key] = self.issue_counts.get(key, 0) + 1
+        if new_key:
+            self.invalidate()  # Every scope lists every known issue
+        elif issues:
+            self._counts_version += 1
+
+    def invalidate(self, scopes: Optional[Iterable[Optional[str]]] = None) -> None:
+        """Drop cached summaries of some scopes (None: global), or of all."""
+        if scopes is None:
+            self._cache.clear()
+            return
+        for scope in scopes:
+            self._cache.pop(scope, None)
+
+    def file_rate(self, key: str, directory: Optional[str] = None) -> BetaPosterior:
+        """Posterior probability that a file (in a directory) shows an issue."""
+        stats = self._scope(directory)
+        hits = stats["file_hits"].get(key, 0)
+        return BetaPosterior(PRIOR_ALPHA + hits, PRIOR_BETA + stats["files"] - hits)
+
+    def any_issue_rate(self, directory: Optional[str] = None) -> BetaPosterior:
+        """Posterior probability that a file shows any issue at all."""
+        stats = self._scope(directory)
+        hits = stats["files_with_issues"]
+        return BetaPosterior(PRIOR_ALPHA + hits, PRIOR_BETA + stats["files"] - hits)
+
+    def issue_share(self, key: str) -> BetaPosterior:
+        """Dirichlet marginal: share of all issues that are of this kind."""
+        return self._issue_share(key, self._dirichlet_total())
+
+    def category_types(self, category: str) -> Dict[str, float]:
+        """Dirichlet posterior mean over issue types within a category."""
+        counts = dict.fromkeys(ISSUE_TYPES, 0)
+        for key, count in self.issue_counts.items():
+            issue_type, issue_category = key.split(':', 1)
+            if issue_category == category:
+                counts[issue_type] = count
+        total = sum(counts.values()) + DIRICHLET_PRIOR * len(counts)
+        return {
+            issue_type: (DIRICHLET_PRIOR + count) / total
+            for issue_type, count in counts.items()
+        }
+
+    def predictions(self, directory: Optional[str] = None) -> List[Dict]:
+        """Cached per-issue beliefs for a scope, most likely first."""
+        return self._summary(self._resolve_directory(directory))["predictions"]
+
+    def confidence(self) -> float:
+        """How settled current beliefs are: 1 minus mean credible interval width."""
+        return self._summary(None)["confidence"]
+
+    def _dirichlet_total(self) -> float:
+        return sum(self.issue_counts.values()) + DIRICHLET_PRIOR * max(len(self.issue_counts), 1)
+
+    def _issue_share(self, key: str, total: float) -> BetaPosterior:
+        alpha = DIRICHLET_PRIOR + self.issue_counts.get(key, 0)
+        return BetaPosterior(alpha, max(total - alpha, DIRICHLET_PRIOR))
+
+    def _scope(self, directory: Optional[str]) -> Dict:
+        directory = self._resolve_directory(directory)
+        return self.state["directories"][directory] if directory else self.state
+
+    def _resolve_directory(self, directory: Optional[str]) -> Optional[str]:
+        """Use a directory's own posteriors only once it has enough evidence."""
+        stats = self.state["directories"].get(directory) if directory else None
+        if stats and stats["files"] >= MIN_DIRECTORY_FILES:
+            return directory
+        return None
+
+    def _summary(self, directory: Optional[str]) -> Dict:
+        """Build (or reuse) posterior summaries for a scope."""
+        stats = self.state["directories"][directory] if directory else self.state
+        summary = self._cache.get(directory)
+        if summary is not None:
+            if summary["counts_version"] == self._counts_version:
+                return summary
+            if stats["files"]:
+                return self._refresh_shares(summary)
+            # Legacy scope without file evidence: its beliefs are the shares
+
+        dirichlet_total = self._dirichlet_total()
+        summary = {"predictions": [], "confidence": 0.0, "keys": [],
+                   "counts_version": self._counts_version}
+
+        widths, ranked = [], []
+        for key, count in self.issue_counts.items():
+            share = self._issue_share(key, dirichlet_total)
+            # File-level evidence is preferred; legacy counts fall back to the mix
+            posterior = self.file_rate(key, directory) if stats["files"] else share
+            low, high = posterior.interval()
+            widths.append(high - low)
+            issue_type, category = key.split(':', 1)
+            ranked.append((key, {
+                "type": issue_type,
+                "message": category,
+                "count": count,
+                "confidence": posterior.mean,
+                "interval": (low, high),
+                "share": share.mean
+            }))
+        if stats["files"]:
+            low, high = self.any_issue_rate(directory).interval()
+            widths.append(high - low)
+
+        ranked.sort(key=lambda item: item[1]["confidence"], reverse=True)
+        summary["keys"] = [key for key, _ in ranked]
+        summary["predictions"] = [prediction for _, prediction in ranked]
+        if widths:
+            summary["confidence"] = 1.0 - sum(widths) / len(widths)
+        self._cache[directory] = summary
+        return summary
+
+    def _refresh_shares(self, summary: Dict) -> Dict:
+        """Update counts and Dirichlet shares in place; file-level beliefs are unchanged."""
+        dirichlet_total = self._dirichlet_total()
+        for key, prediction in zip(summary["keys"], summary["predictions"]):
+            prediction["count"] = self.issue_counts[key]
+            prediction["share"] = self._issue_share(key, dirichlet_total).mean
+        summary["counts_version"] = self._counts_version
+        return summary
@@ -0,0 +1,211 @@
+"""Record and replay of AI analyses for offline benchmarks and tests.
+
+A RecordingAnalyzer wraps a live analyzer (normally AIQualityAnalyzer) and
+saves every request, its result and its timing to a cassette: a JSON file
+of takes keyed by model and exact code. Streamed calls also save when each
+issue arrived.
+
+A ReplayAnalyzer serves those takes without a key or network access, so
+throughput, caching, routing and deadline features can be benchmarked
+deterministically. Latency is emulated as the recorded time multiplied by
+`latency_scale` (0 replays instantly). A key recorded several times
+replays its takes in order and then starts over.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from termcolor import colored
+
+from config.ai_standards import AI_MODELS
+
+from .ai_cache import emit_issues
+
+CASSETTE_DIR = Path(__file__).resolve().parent.parent / "tests" / "cassettes"
+CASSETTE_VERSION = 1
+HEURISTIC_MODEL = "heuristic"  # Takes recorded from heuristic_analysis
+
+
+def cassette_key(code: str, model: str) -> str:
+    """Exact-text key: replay must not blur answers to different code."""
+    digest = hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{model}:{digest}"
+
+
+class Cassette:
+    """Recorded takes per (model, code), loaded from and saved to JSON."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else None
+        self.takes: Dict[str, List[Dict]] = {}
+        self._replayed: Dict[str, int] = {}
+        if self.path is not None:
+            self.load()
+
+    def __len__(self) -> int:
+        return sum(len(takes) for takes in self.takes.values())
+
+    def ai_takes(self) -> int:
+        """Takes of real AI answers, i.e. not of heuristic fallbacks."""
+        return sum(len(takes) for key, takes in self.takes.items()
+                   if not key.startswith(f"{HEURISTIC_MODEL}:"))
+
+    def record(self, code: str, model: str, result: Dict, latency_ms: float,
+               issue_offsets_ms: Optional[List[float]] = None) -> None:
+        """Append a take for this request."""
+        take = {
+            "request": {"model": model, "code": code},
+            "result": result,
+            "latency_ms": round(latency_ms, 3),
+            "recorded_at": time.time()
+        }
+        if issue_offsets_ms is not None:
+            take["issue_offsets_ms"] = [round(offset, 3) for offset in issue_offsets_ms]
+        self.takes.setdefault(cassette_key(code, model), []).append(take)
+
+    def next_take(self, code: str, model: str) -> Dict:
+        """Next take for this request, cycling; KeyError if never recorded."""
+        key = cassette_key(code, model)
+        takes = self.takes.get(key)
+        if not takes:
+            raise KeyError(f"No recording for {model} request ({len(code)} chars of code)")
+        index = self._replayed.get(key, 0)
+        self._replayed[key] = index + 1
+        return takes[index % len(takes)]
+
+    def save(self, path: Optional[Path] = None) -> None:
+        """Write the cassette as JSON."""
+        path = Path(path or self.path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"version": CASSETTE_VERSION, "takes": self.takes}, f, indent=1)
+        except (OSError, TypeError) as e:
+            print(colored(f"Error saving cassette {path}: {e}", "yellow"))
+
+    def load(self, path: Optional[Path] = None) -> None:
+        """Read takes saved with `save`; a missing file is an empty cassette."""
+        path = Path(path or self.path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(colored(f"Error loading cassette {path}: {e}", "yellow"))
+            return
+        if data.get("version") != CASSETTE_VERSION:
+            print(colored(f"Ignoring cassette {path}: unsupported version", "yellow"))
+            return
+        for key, takes in data.get("takes", {}).items():
+            self.takes.setdefault(key, []).extend(takes)
+
+
+class RecordingAnalyzer:
+    """Analyzer wrapper that records real AI answers to a cassette.
+
+    Heuristic fallbacks returned by the live analyzer (no key, failed
+    request) are passed through but not recorded as AI answers.
+    """
+
+    def __init__(self, analyzer, cassette: Cassette):
+        self.analyzer = analyzer
+        self.cassette = cassette
+
+    async def analyze_code(self, code: str, model: str = AI_MODELS['DEFAULT'],
+                           context=None) -> Dict:
+        started = time.perf_counter()
+        result = await self.analyzer.analyze_code(code, model=model, context=context)
+        if result.get("source") == "ai":
+            self.cassette.record(code, model, result, _elapsed_ms(started))
+        return result
+
+    async def analyze_code_stream(self, code: str, model: str = AI_MODELS['DEFAULT'],
+                                  context=None, on_issue=None) -> Dict:
+        started = time.perf_counter()
+        offsets = []
+
+        def timed(issue: Dict) -> None:
+            offsets.append(_elapsed_ms(started))
+            if on_issue:
+                on_issue(issue)
+
+        result = await self.analyzer.analyze_code_stream(
+            code, model=model, context=context, on_issue=timed
+        )
+        if result.get("source") == "ai":
+            self.cassette.record(code, model, result, _elapsed_ms(started), offsets)
+        return result
+
+    async def heuristic_analysis(self, code: str, context=None) -> Dict:
+        started = time.perf_counter()
+        result = await self.analyzer.heuristic_analysis(code, context)
+        self.cassette.record(code, HEURISTIC_MODEL, result, _elapsed_ms(started))
+        return result
+
+
+class ReplayAnalyzer:
+    """Offline analyzer serving recorded takes with emulated latency."""
+
+    def __init__(self, cassette: Cassette, latency_scale: float = 1.0,
+                 fallback=None):
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+        self.fallback = fallback  # Analyzer for unrecorded requests; None raises KeyError
+        self.stats = {"replayed": 0, "missed": 0}
+
+    async def analyze_code(self, code: str, model: str = AI_MODELS['DEFAULT'],
+                           context=None) -> Dict:
+        return await self.analyze_code_stream(code, model, context)
+
+    async def analyze_code_stream(self, code: str, model: str = AI_MODELS['DEFAULT'],
+                                  context=None, on_issue=None) -> Dict:
+        """Replay a take, emitting issues at their recorded offsets."""
+        try:
+            take = self.cassette.next_take(code, model)
+        except KeyError:
+            self.stats["missed"] += 1
+            if self.fallback is None:
+                raise
+            return await self._ask_fallback(code, model, context, on_issue)
+
+        self.stats["replayed"] += 1
+        result = json.loads(json.dumps(take["result"]))  # Callers may mutate it
+        issues = result.get("issues", [])
+        offsets = take.get("issue_offsets_ms", [])
+        offsets = offsets + [take["latency_ms"]] * (len(issues) - len(offsets))
+        elapsed = 0.0
+        for issue, offset in zip(issues, offsets):
+            elapsed = await self._wait(offset, elapsed)
+            if on_issue:
+                on_issue(issue)
+        await self._wait(take["latency_ms"], elapsed)
+        return result
+
+    async def heuristic_analysis(self, code: str, context=None) -> Dict:
+        return await self.analyze_code(code, model=HEURISTIC_MODEL, context=context)
+
+    async def _wait(self, offset_ms: float, elapsed_ms: float) -> float:
+        """Sleep until `offset_ms` into the take; returns the new position."""
+        if offset_ms > elapsed_ms and self.latency_scale > 0:
+            await asyncio.sleep((offset_ms - elapsed_ms) * self.latency_scale / 1000)
+        return max(offset_ms, elapsed_ms)
+
+    async def _ask_fallback(self, code: str, model: str, context,
+                            on_issue: Optional[Callable[[Dict], None]]) -> Dict:
+        if model == HEURISTIC_MODEL:
+            return await self.fallback.heuristic_analysis(code, context)
+        if on_issue is not None and hasattr(self.fallback, "analyze_code_stream"):
+            return await self.fallback.analyze_code_stream(
+                code, model=model, context=context, on_issue=on_issue
+            )
+        result = await self.fallback.analyze_code(code, model=model, context=context)
+        return emit_issues(result, on_issue)
+
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
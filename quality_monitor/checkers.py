@@ -1,39 +1,60 @@
 """Quality checkers for different aspects of code."""
 
 import ast
-from typing import Dict, List
-from config.quality_standards import (
-    MAX_FUNCTION_LINES,
-    MAX_NESTED_DEPTH,
-    MIN_DOCSTRING_WORDS,
-    MIN_COMMENT_RATIO
-)
+import tokenize
+from typing import Dict, List, Optional
+from .context import AnalysisContext
+from .registry import COST_AST, COST_LINES, COST_TOKENS
+from .runtime_config import RUNTIME_CONFIG, RuntimeConfig
 
-class StyleChecker:
+class ConfiguredChecker:
+    """Base for checkers whose thresholds come from the runtime config.
+    
+    `settings` names every setting the checker reads; its cached results
+    are invalidated when one of them changes.
+    """
+    
+    settings = ()
+    
+    def __init__(self, config: Optional[RuntimeConfig] = None):
+        self.config = config or RUNTIME_CONFIG
+
+class StyleChecker(ConfiguredChecker):
     """Checks code style and formatting."""
     
-    def check(self, content: str, tree: ast.AST) -> List[Dict]:
+    cost = COST_AST
+    settings = ("MAX_FUNCTION_LINES",)
+    
+    def check(self, context: AnalysisContext) -> List[Dict]:
+        max_lines = self.config["MAX_FUNCTION_LINES"]
         issues = []
+        tree = context.tree
         
         # Check function length
         for node in ast.walk(tree):
             if isinstance(node, ast.FunctionDef):
                 func_lines = len(node.body)
-                if func_lines > MAX_FUNCTION_LINES:
+                if func_lines > max_lines:
                     issues.append({
                         "type": "STYLE",
                         "category": "Function Length",
                         "message": f"Function '{node.name}' is too long ({func_lines} lines)",
-                        "suggestion": f"Break into smaller functions (max {MAX_FUNCTION_LINES} lines)"
+                        "suggestion": f"Break into smaller functions (max {max_lines} lines)",
+                        "line": node.lineno
                     })
         
         return issues
 
-class DocumentationChecker:
+class DocumentationChecker(ConfiguredChecker):
     """Checks documentation completeness."""
     
-    def check(self, content: str, tree: ast.AST) -> List[Dict]:
+    cost = COST_AST
+    settings = ("MIN_DOCSTRING_WORDS",)
+    
+    def check(self, context: AnalysisContext) -> List[Dict]:
+        min_words = self.config["MIN_DOCSTRING_WORDS"]
         issues = []
+        tree = context.tree
         
         # Check docstrings
         for node in ast.walk(tree):
@@ -44,34 +65,42 @@ class DocumentationChecker:
                         "type": "IMPORTANT",
                         "category": "Documentation",
                         "message": f"Missing docstring in {node.__class__.__name__.lower()} '{node.name}'",
-                        "suggestion": "Add descriptive docstring"
+                        "suggestion": "Add descriptive docstring",
+                        "line": node.lineno
                     })
-                elif len(docstring.split()) < MIN_DOCSTRING_WORDS:
+                elif len(docstring.split()) < min_words:
                     issues.append({
                         "type": "STYLE",
                         "category": "Documentation",
                         "message": f"Brief docstring in {node.__class__.__name__.lower()} '{node.name}'",
-                        "suggestion": "Expand docstring with more details"
+                        "suggestion": "Expand docstring with more details",
+                        "line": node.lineno
                     })
         
         return issues 
 
-class ComplexityChecker:
+class ComplexityChecker(ConfiguredChecker):
     """Checks code complexity and nesting."""
     
-    def check(self, content: str, tree: ast.AST) -> List[Dict]:
+    cost = COST_AST
+    settings = ("MAX_NESTED_DEPTH",)
+    
+    def check(self, context: AnalysisContext) -> List[Dict]:
+        max_depth = self.config["MAX_NESTED_DEPTH"]
         issues = []
+        tree = context.tree
         
         for node in ast.walk(tree):
             # Check nesting depth
             if isinstance(node, ast.FunctionDef):
                 depth = self._get_nesting_depth(node)
-                if depth > MAX_NESTED_DEPTH:
+                if depth > max_depth:
                     issues.append({
                         "type": "IMPORTANT",
                         "category": "Complexity",
                         "message": f"Function '{node.name}' has deep nesting (depth {depth})",
-                        "suggestion": f"Reduce nesting to max {MAX_NESTED_DEPTH} levels"
+                        "suggestion": f"Reduce nesting to max {max_depth} levels",
+                        "line": node.lineno
                     })
                 
                 # Check for bare except
@@ -81,7 +110,8 @@ class ComplexityChecker:
                             "type": "IMPORTANT",
                             "category": "ErrorHandling",
                             "message": "Found bare except clause",
-                            "suggestion": "Catch specific exceptions instead of using bare except"
+                            "suggestion": "Catch specific exceptions instead of using bare except",
+                            "line": child.lineno
                         })
                     
                     # Check for pass in except
@@ -91,7 +121,8 @@ class ComplexityChecker:
                                 "type": "IMPORTANT",
                                 "category": "ErrorHandling",
                                 "message": "Silent failure with pass in except block",
-                                "suggestion": "Handle or log the error instead of passing silently"
+                                "suggestion": "Handle or log the error instead of passing silently",
+                                "line": child.lineno
                             })
         
         return issues
@@ -107,4 +138,144 @@ class ComplexityChecker:
                 child_depth = 1 + self._get_nesting_depth(child)
                 max_child_depth = max(max_child_depth, child_depth)
                 
-        return max_child_depth
\ No newline at end of file
+        return max_child_depth
+
+
+class TokenChecker:
+    """Cheap token-based subset of the checks for files that do not parse.
+    
+    Works on the token stream up to the first tokenize error, so it still
+    reports on the intact part of a file that is being edited.
+    """
+    
+    cost = COST_TOKENS
+    
+    def check(self, context: AnalysisContext) -> List[Dict]:
+        issues = []
+        tokens = [t for t in context.tokens if t.type not in (tokenize.COMMENT, tokenize.NL)]
+        
+        for i, token in enumerate(tokens):
+            if token.type != tokenize.NAME:
+                continue
+            if token.string == "except":
+                issues.extend(self._check_except(tokens, i))
+            elif token.string in ("def", "class") and i + 1 < len(tokens):
+                issues.extend(self._check_docstring(tokens, i))
+        
+        return issues
+    
+    def _check_except(self, tokens: List[tokenize.TokenInfo], i: int) -> List[Dict]:
+        """Flag bare excepts and except blocks that only pass."""
+        issues = []
+        line = tokens[i].start[0]
+        if i + 1 < len(tokens) and tokens[i + 1].string == ":":
+            issues.append({
+                "type": "IMPORTANT",
+                "category": "ErrorHandling",
+                "message": "Found bare except clause",
+                "suggestion": "Catch specific exceptions instead of using bare except",
+                "line": line
+            })
+        
+        body = self._block_start(tokens, i)
+        if body is not None and tokens[body].string == "pass":
+            issues.append({
+                "type": "IMPORTANT",
+                "category": "ErrorHandling",
+                "message": "Silent failure with pass in except block",
+                "suggestion": "Handle or log the error instead of passing silently",
+                "line": line
+            })
+        return issues
+    
+    def _check_docstring(self, tokens: List[tokenize.TokenInfo], i: int) -> List[Dict]:
+        """Flag definitions whose block does not open with a docstring."""
+        kind = "function" if tokens[i].string == "def" else "class"
+        name = tokens[i + 1].string
+        body = self._block_start(tokens, i)
+        if body is None:
+            return []  # Header not finished yet
+        
+        if tokens[body].type != tokenize.STRING:
+            return [{
+                "type": "IMPORTANT",
+                "category": "Documentation",
+                "message": f"Missing docstring in {kind}def '{name}'",
+                "suggestion": "Add descriptive docstring",
+                "line": tokens[i].start[0]
+            }]
+        return []
+    
+    @staticmethod
+    def _block_start(tokens: List[tokenize.TokenInfo], i: int) -> Optional[int]:
+        """Index of the first token in the block opened by the header at i."""
+        depth = 0
+        for j in range(i + 1, len(tokens)):
+            if tokens[j].type == tokenize.OP and tokens[j].string in "([{":
+                depth += 1
+            elif tokens[j].type == tokenize.OP and tokens[j].string in ")]}":
+                depth -= 1
+            elif depth == 0 and tokens[j].string == ":":
+                k = j + 1
+                while k < len(tokens) and tokens[k].type in (tokenize.NEWLINE, tokenize.INDENT):
+                    k += 1
+                return k if k < len(tokens) else None
+            elif tokens[j].type == tokenize.NEWLINE:
+                return None
+        return None
+
+class LineChecker(ConfiguredChecker):
+    """Degraded line-based checks for files too large to parse in full."""
+    
+    cost = COST_LINES
+    settings = ("MAX_LINE_LENGTH",)
+    
+    def check(self, context: AnalysisContext) -> List[Dict]:
+        max_length = self.config["MAX_LINE_LENGTH"]
+        issues = [{
+            "type": "STYLE",
+            "category": "Size",
+            "message": f"Only line-based checks were run ({context.note})",
+            "suggestion": "Split the module into smaller files",
+            "line": 1
+        }]
+        long_lines = []
+        
+        for number, line in enumerate(context.lines, 1):
+            if len(line) > max_length:
+                long_lines.append(number)
+            if line.strip().startswith("except:"):
+                issues.append({
+                    "type": "IMPORTANT",
+                    "category": "ErrorHandling",
+                    "message": "Found bare except clause",
+                    "suggestion": "Catch specific exceptions instead of using bare except",
+                    "line": number
+                })
+        
+        if long_lines:
+            issues.append({
+                "type": "STYLE",
+                "category": "Formatting",
+                "message": f"{len(long_lines)} lines longer than {max_length} characters",
+                "suggestion": f"Keep lines under {max_length} characters",
+                "line": long_lines[0]
+            })
+        return issues
+
+def collect_function_metrics(tree: ast.AST) -> List[Dict]:
+    """Collect the per-function metrics the checkers above evaluate."""
+    nesting = ComplexityChecker()
+    metrics = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef):
+            docstring = ast.get_docstring(node)
+            metrics.append({
+                "name": node.name,
+                "start_line": node.lineno,
+                "end_line": getattr(node, "end_lineno", node.lineno),
+                "body_length": len(node.body),
+                "nesting_depth": nesting._get_nesting_depth(node),
+                "docstring_words": len(docstring.split()) if docstring else 0
+            })
+    return metrics
@@ -0,0 +1,397 @@
+"""Project-wide duplicate code detection.
+
+Two complementary indexes over normalized token streams (identifiers,
+numbers and strings are replaced by placeholders, so renamed copies still
+match):
+
+* Winnowing: k-gram hashes are thinned to one fingerprint per window and
+  kept in an inverted index from fingerprint to (file, line). Any shared
+  run of at least `WINNOW_KGRAM + WINNOW_WINDOW - 1` tokens is guaranteed
+  to share a fingerprint.
+* MinHash LSH: each function gets a MinHash signature over its token
+  shingles; banded signatures are indexed so near-duplicate functions are
+  found without comparing every pair.
+
+Both indexes live in sorted NumPy runs (an LSM-style layout): new entries
+collect in a small buffer that is sorted into a run, and runs of similar
+size are merged. Re-indexing a file bumps its version, which retires its
+old entries lazily, so updates are incremental.
+
+A duplicate is reported on the file being checked, which names the file
+it matched. That file was checked before the copy existed, so it is
+queued for a re-check (see `take_pending`) to report the pair as well.
+Likewise when a copy is changed or removed, the files that reported it
+are queued so their stale issues go away. Entries cost 20 bytes and
+a typical module adds one to two hundred, so 100k files stay in the low
+hundreds of megabytes.
+"""
+
+import ast
+import io
+import keyword
+import tokenize
+import zlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from termcolor import colored
+
+from .registry import COST_INDEX
+
+# Winnowing parameters (tokens)
+WINNOW_KGRAM = 12
+WINNOW_WINDOW = 16
+MIN_SHARED_FINGERPRINTS = 5
+
+# MinHash LSH parameters
+SHINGLE_SIZE = 5
+MINHASH_BANDS = 8
+MINHASH_ROWS = 8
+MIN_FUNCTION_TOKENS = 40
+CLONE_SIMILARITY = 0.8
+
+# Index layout
+RUN_SIZE = 50_000
+HASH_BASE = np.uint64(1_000_003)
+MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+MINHASH_SEED = 20241127
+
+PLACEHOLDERS = {tokenize.NUMBER: "NUM", tokenize.STRING: "STR"}
+SKIPPED_TOKENS = {
+    tokenize.COMMENT, tokenize.NL, tokenize.INDENT, tokenize.DEDENT,
+    tokenize.ENCODING, tokenize.ENDMARKER
+}
+
+
+def normalized_tokens(content: str, tokens: Optional[Iterable] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Return stable token ids and their line numbers for source text.
+
+    Pass `tokens` to reuse a token stream that was already produced.
+    """
+    ids, lines = [], []
+    for token in tokens if tokens is not None else _clean_tokens(content):
+        if token.type in SKIPPED_TOKENS:
+            continue
+        text = PLACEHOLDERS.get(token.type, token.string)
+        if token.type == tokenize.NAME and not keyword.iskeyword(text):
+            text = "ID"
+        ids.append(_token_id(text))
+        lines.append(token.start[0])
+    return np.array(ids, dtype=np.uint64), np.array(lines, dtype=np.int32)
+
+
+def _clean_tokens(content: str):
+    """Yield tokens up to the first tokenize error."""
+    try:
+        yield from tokenize.generate_tokens(io.StringIO(content).readline)
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        return  # Index what tokenized cleanly
+
+
+_TOKEN_IDS: Dict[str, int] = {}
+
+
+def _token_id(text: str) -> int:
+    """Stable integer for a token (str hashes vary between processes)."""
+    token_id = _TOKEN_IDS.get(text)
+    if token_id is None:
+        token_id = _TOKEN_IDS[text] = zlib.crc32(text.encode("utf-8")) + 1
+    return token_id
+
+
+def kgram_hashes(token_ids: np.ndarray, k: int) -> np.ndarray:
+    """Polynomial hash of every k-token window (wrapping uint64 arithmetic)."""
+    count = len(token_ids) - k + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(k):
+        hashes = hashes * HASH_BASE + token_ids[offset:offset + count]
+    return hashes
+
+
+def winnow(hashes: np.ndarray, window: int) -> np.ndarray:
+    """Positions selected by winnowing (rightmost minimum of each window)."""
+    if len(hashes) == 0:
+        return np.empty(0, dtype=np.int64)
+    if len(hashes) <= window:
+        return np.array([len(hashes) - 1 - int(np.argmin(hashes[::-1]))])
+    windows = np.lib.stride_tricks.sliding_window_view(hashes, window)
+    rightmost = window - 1 - np.argmin(windows[:, ::-1], axis=1)
+    return np.unique(np.arange(len(windows)) + rightmost)
+
+
+class SortedRunIndex:
+    """Multimap from uint64 keys to (owner, payload, version) entries."""
+
+    def __init__(self):
+        self._runs: List[Tuple[np.ndarray, ...]] = []
+        self._pending: List[Tuple[np.ndarray, ...]] = []
+        self._pending_count = 0
+        self._pending_run: Optional[Tuple[np.ndarray, ...]] = None
+
+    def __len__(self) -> int:
+        return sum(len(run[0]) for run in self._runs) + self._pending_count
+
+    def add(self, keys: np.ndarray, owner: int, payloads: np.ndarray, version: int,
+            live_versions: np.ndarray) -> None:
+        """Add entries for one owner; `live_versions` retires stale ones on merge."""
+        if not len(keys):
+            return
+        self._pending.append((
+            keys.astype(np.uint64),
+            np.full(len(keys), owner, dtype=np.int32),
+            payloads.astype(np.int32),
+            np.full(len(keys), version, dtype=np.int32)
+        ))
+        self._pending_count += len(keys)
+        self._pending_run = None
+        if self._pending_count >= RUN_SIZE:
+            self._flush(live_versions)
+
+    def lookup(self, keys: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Find entries matching any key; returns (query index, owner, payload, version)."""
+        found = [self._lookup_run(run, keys) for run in self._runs]
+        if self._pending:
+            if self._pending_run is None:
+                pending = self._concat(self._pending)
+                order = np.argsort(pending[0], kind="stable")
+                self._pending_run = tuple(column[order] for column in pending)
+            found.append(self._lookup_run(self._pending_run, keys))
+        found = [part for part in found if len(part[0])]
+        if not found:
+            empty = np.empty(0, dtype=np.int32)
+            return np.empty(0, dtype=np.int64), empty, empty, empty
+        return tuple(np.concatenate(column) for column in zip(*found))
+
+    def _flush(self, live_versions: np.ndarray) -> None:
+        """Sort the buffer into a run, then merge runs of similar size."""
+        self._runs.append(self._sorted(self._concat(self._pending), live_versions))
+        self._pending, self._pending_count, self._pending_run = [], 0, None
+        while len(self._runs) > 1 and len(self._runs[-2][0]) <= 2 * len(self._runs[-1][0]):
+            newer = self._runs.pop()
+            older = self._runs.pop()
+            merged = tuple(np.concatenate(pair) for pair in zip(older, newer))
+            self._runs.append(self._sorted(merged, live_versions))
+
+    @staticmethod
+    def _concat(parts: List[Tuple[np.ndarray, ...]]) -> Tuple[np.ndarray, ...]:
+        return tuple(np.concatenate(column) for column in zip(*parts))
+
+    @staticmethod
+    def _sorted(run: Tuple[np.ndarray, ...], live_versions: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Drop retired entries and sort by key."""
+        keys, owners, payloads, versions = run
+        live = versions == live_versions[owners]
+        order = np.argsort(keys[live], kind="stable")
+        return tuple(column[live][order] for column in (keys, owners, payloads, versions))
+
+    @staticmethod
+    def _lookup_run(run: Tuple[np.ndarray, ...], keys: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Vectorized range lookup of many keys in one run."""
+        run_keys = run[0]
+        if len(keys) == 0 or len(run_keys) == 0:
+            return (np.empty(0, dtype=np.int64),) + tuple(c[:0] for c in run[1:])
+        starts = np.searchsorted(run_keys, keys, side="left")
+        stops = np.searchsorted(run_keys, keys, side="right")
+        counts = stops - starts
+        query_index = np.repeat(np.arange(len(keys)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.repeat(starts, counts) + offsets
+        return (query_index,) + tuple(column[positions] for column in run[1:])
+
+
+class CloneIndex:
+    """Incremental cross-file duplicate detector."""
+
+    cost = COST_INDEX
+
+    def __init__(self):
+        self.files: List[str] = []
+        self._file_ids: Dict[str, int] = {}
+        self._versions = np.zeros(1024, dtype=np.int32)
+        self._fingerprints = SortedRunIndex()
+        self._bands = SortedRunIndex()
+        self._functions: Dict[int, Dict] = {}
+        self._partners: Dict[int, Set[int]] = {}  # File -> files its issues name
+        self._pending: Dict[str, None] = {}  # Files whose duplicate issues are out of date
+
+        rng = np.random.default_rng(MINHASH_SEED)
+        permutations = MINHASH_BANDS * MINHASH_ROWS
+        self._hash_a = rng.integers(1, int(MERSENNE_PRIME), permutations, dtype=np.uint64)
+        self._hash_b = rng.integers(0, int(MERSENNE_PRIME), permutations, dtype=np.uint64)
+
+    def check(self, context) -> List[Dict]:
+        """Re-index a file's AnalysisContext and report its duplicates as standard issues."""
+        if context.path is None:
+            return []
+        try:
+            return self.update_file(context.path, context.content, context.tree, context.tokens)
+        except Exception as e:
+            print(colored(f"Duplicate detection failed for {context.path}: {e}", "yellow"))
+            return []
+
+    def update_file(self, file_path: str, content: str, tree: Optional[ast.AST] = None,
+                    tokens: Optional[Iterable] = None) -> List[Dict]:
+        """Replace a file's fingerprints and return duplicate-code issues for it."""
+        file_id, version = self._new_version(str(file_path))
+        token_ids, token_lines = normalized_tokens(content, tokens)
+
+        # Winnowed fingerprints of the whole file
+        grams = kgram_hashes(token_ids, WINNOW_KGRAM)
+        selected = winnow(grams, WINNOW_WINDOW)
+        fingerprints, fingerprint_lines = grams[selected], token_lines[selected]
+
+        functions = self._function_signatures(tree, token_ids, token_lines) if tree else []
+        partners: Set[int] = set()
+        function_issues = self._near_duplicate_functions(file_id, functions, partners)
+        covered = [(f["start_line"], f["end_line"]) for f, _ in function_issues]
+        block_issues = self._shared_blocks(file_id, fingerprints, fingerprint_lines, covered, partners)
+
+        self._fingerprints.add(fingerprints, file_id, fingerprint_lines, version, self._versions)
+        self._index_functions(file_id, version, functions)
+        self._update_partners(file_id, partners)
+        return [issue for _, issue in function_issues] + block_issues
+
+    def remove_file(self, file_path: str) -> None:
+        """Retire every entry for a deleted file."""
+        if str(file_path) in self._file_ids:
+            file_id = self._file_ids[str(file_path)]
+            self._new_version(str(file_path))
+            self._functions.pop(file_id, None)
+            self._update_partners(file_id, set())
+            self._partners.pop(file_id, None)
+
+    def take_pending(self) -> List[str]:
+        """Files to re-check because a duplicate of theirs appeared, changed or went away."""
+        pending, self._pending = list(self._pending), {}
+        return pending
+
+    def discard_pending(self, files: Iterable[str]) -> None:
+        """Unqueue files that are already up to date."""
+        for file_path in files:
+            self._pending.pop(str(file_path), None)
+
+    def _update_partners(self, file_id: int, partners: Set[int]) -> None:
+        """Queue files whose issues about this one no longer match what it reports."""
+        previous = self._partners.get(file_id, set())
+        for owner in partners | previous:
+            # New partners have not reported this file yet; lost ones still do
+            if (owner in partners) != (file_id in self._partners.get(owner, ())):
+                self._pending[self.files[owner]] = None
+        self._partners[file_id] = partners
+
+    def _new_version(self, file_path: str) -> Tuple[int, int]:
+        """Intern a file and bump its version, retiring older entries."""
+        file_id = self._file_ids.get(file_path)
+        if file_id is None:
+            file_id = self._file_ids[file_path] = len(self.files)
+            self.files.append(file_path)
+            if file_id >= len(self._versions):
+                self._versions = np.concatenate((self._versions, np.zeros_like(self._versions)))
+        self._versions[file_id] += 1
+        return file_id, int(self._versions[file_id])
+
+    def _function_signatures(self, tree: ast.AST, token_ids: np.ndarray,
+                             token_lines: np.ndarray) -> List[Dict]:
+        """MinHash signatures for every function large enough to matter."""
+        shingles = kgram_hashes(token_ids, SHINGLE_SIZE) % MERSENNE_PRIME
+        shingle_lines = token_lines[:len(shingles)]
+        functions = []
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            end_line = getattr(node, "end_lineno", node.lineno)
+            in_span = (shingle_lines >= node.lineno) & (shingle_lines <= end_line)
+            if in_span.sum() < MIN_FUNCTION_TOKENS - SHINGLE_SIZE + 1:
+                continue
+            values = np.unique(shingles[in_span])
+            signature = ((self._hash_a[:, None] * values[None, :] + self._hash_b[:, None])
+                         % MERSENNE_PRIME).min(axis=1)
+            functions.append({
+                "name": node.name,
+                "start_line": node.lineno,
+                "end_line": end_line,
+                "signature": signature.astype(np.uint32)
+            })
+        return functions
+
+    def _band_keys(self, signature: np.ndarray) -> np.ndarray:
+        """One bucket key per LSH band."""
+        bands = signature.astype(np.uint64).reshape(MINHASH_BANDS, MINHASH_ROWS)
+        keys = np.arange(MINHASH_BANDS, dtype=np.uint64)
+        for column in range(MINHASH_ROWS):
+            keys = keys * HASH_BASE + bands[:, column]
+        return keys
+
+    def _near_duplicate_functions(self, file_id: int, functions: List[Dict],
+                                  partners: Set[int]) -> List[Tuple[Dict, Dict]]:
+        """Find the closest indexed twin of each function via LSH candidates."""
+        issues = []
+        for position, function in enumerate(functions):
+            _, owners, payloads, versions = self._bands.lookup(self._band_keys(function["signature"]))
+            live = (versions == self._versions[owners]) & (owners != file_id)
+            candidates = {(int(o), int(p)) for o, p in zip(owners[live], payloads[live])}
+            # Earlier functions of the same file are candidates too
+            candidates.update((file_id, other) for other in range(position))
+
+            best = None
+            for owner, index in candidates:
+                other = functions[index] if owner == file_id else self._functions[owner]["functions"][index]
+                similarity = float(np.mean(function["signature"] == other["signature"]))
+                if similarity >= CLONE_SIMILARITY and (not best or similarity > best[0]):
+                    best = (similarity, owner, other)
+            if best:
+                similarity, owner, other = best
+                if owner != file_id:
+                    partners.add(owner)
+                issues.append((function, {
+                    "type": "IMPORTANT",
+                    "category": "Duplication",
+                    "message": (
+                        f"Function '{function['name']}' duplicates '{other['name']}' in "
+                        f"{self.files[owner]}:{other['start_line']} (~{similarity:.0%} similar)"
+                    ),
+                    "suggestion": "Extract the shared logic into one reusable function",
+                    "line": function["start_line"]
+                }))
+        return issues
+
+    def _shared_blocks(self, file_id: int, fingerprints: np.ndarray, lines: np.ndarray,
+                       covered: List[Tuple[int, int]], partners: Set[int]) -> List[Dict]:
+        """Report regions sharing many fingerprints with another file."""
+        query_index, owners, payloads, versions = self._fingerprints.lookup(fingerprints)
+        live = (versions == self._versions[owners]) & (owners != file_id)
+        query_index, owners, payloads = query_index[live], owners[live], payloads[live]
+
+        issues = []
+        for owner in np.unique(owners):
+            matched_lines = lines[np.unique(query_index[owners == owner])]
+            outside = np.ones(len(matched_lines), dtype=bool)
+            for start, end in covered:
+                outside &= (matched_lines < start) | (matched_lines > end)
+            if outside.sum() < MIN_SHARED_FINGERPRINTS:
+                continue
+            first, last = int(matched_lines[outside].min()), int(matched_lines[outside].max())
+            partners.add(int(owner))
+            issues.append({
+                "type": "IMPORTANT",
+                "category": "Duplication",
+                "message": (
+                    f"Lines {first}-{last} duplicate code in {self.files[owner]} "
+                    f"(around line {int(payloads[owners == owner].min())})"
+                ),
+                "suggestion": "Move the duplicated block into a shared helper",
+                "line": first
+            })
+        return issues
+
+    def _index_functions(self, file_id: int, version: int, functions: List[Dict]) -> None:
+        """Store signatures and add their LSH band keys to the index."""
+        if not functions:
+            self._functions.pop(file_id, None)
+            return
+        self._functions[file_id] = {"functions": functions}
+        keys = np.concatenate([self._band_keys(f["signature"]) for f in functions])
+        payloads = np.repeat(np.arange(len(functions)), MINHASH_BANDS)
+        self._bands.add(keys, file_id, payloads, version, self._versions)
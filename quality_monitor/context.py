@@ -0,0 +1,92 @@
+"""Per-file analysis context.
+
+Holds one read of a source file (see ingestion.ingest_file) and everything
+derived from it (lines, line offsets, token stream, AST, content hash).
+Each derived value is computed on first use and then shared by the
+checkers, the learning system, duplicate detection and the AI path.
+"""
+
+import ast
+import hashlib
+import io
+import tokenize
+from typing import List, Optional
+
+# How much analysis a file receives
+MODE_FULL = "full"        # AST-based checks
+MODE_LINES = "lines"      # Too large: line-based checks only
+MODE_SKIP = "skip"        # Generated, vendored or oversized: not checked
+
+
+class AnalysisContext:
+    """Lazily derived views of one source text."""
+
+    def __init__(self, content: str, path: Optional[str] = None, encoding: str = "utf-8",
+                 mode: str = MODE_FULL, note: Optional[str] = None):
+        self.path = str(path) if path is not None else None
+        self.content = content
+        self.encoding = encoding
+        self.mode = mode
+        self.note = note  # Why the file is degraded or skipped
+        self._lines: Optional[List[str]] = None
+        self._line_offsets: Optional[List[int]] = None
+        self._tokens: Optional[List[tokenize.TokenInfo]] = None
+        self._tree: Optional[ast.AST] = None
+        self._parse_error: Optional[SyntaxError] = None
+        self._hash: Optional[str] = None
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self.content.split('\n')
+        return self._lines
+
+    @property
+    def line_offsets(self) -> List[int]:
+        """Character offset at which each line starts."""
+        if self._line_offsets is None:
+            offsets, position = [], 0
+            for line in self.lines:
+                offsets.append(position)
+                position += len(line) + 1
+            self._line_offsets = offsets
+        return self._line_offsets
+
+    @property
+    def tokens(self) -> List[tokenize.TokenInfo]:
+        """Token stream, up to the first tokenize error for broken code."""
+        if self._tokens is None:
+            self._tokens = list(self._generate_tokens())
+        return self._tokens
+
+    @property
+    def tree(self) -> ast.AST:
+        """Parsed AST. Raises the same SyntaxError on every access if invalid."""
+        if self._parse_error is not None:
+            raise self._parse_error
+        if self._tree is None:
+            try:
+                self._tree = ast.parse(self.content)
+            except SyntaxError as e:
+                self._parse_error = e
+                raise
+        return self._tree
+
+    @property
+    def content_hash(self) -> str:
+        if self._hash is None:
+            self._hash = hashlib.blake2b(self.content.encode('utf-8'), digest_size=16).hexdigest()
+        return self._hash
+
+    def line(self, number: int) -> str:
+        """Return a 1-based line, or '' if out of range."""
+        if 1 <= number <= len(self.lines):
+            return self.lines[number - 1]
+        return ""
+
+    def _generate_tokens(self):
+        """Yield tokens, stopping quietly at the first tokenize error."""
+        try:
+            yield from tokenize.generate_tokens(io.StringIO(self.content).readline)
+        except (tokenize.TokenError, IndentationError, SyntaxError):
+            return
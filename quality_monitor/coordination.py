@@ -0,0 +1,217 @@
+"""Agent coordination bus.
+
+Agents coordinate through a shared, append-only log (see project_plan.txt,
+section 4). The bus keeps file claims and statuses in memory, delivers
+events to local subscribers synchronously and appends every event to the
+on-disk log so other processes and later sessions can follow along.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from termcolor import colored
+
+# Shared log location
+COORDINATION_LOG = Path("monitor_data/coordination_log.jsonl")
+
+# File statuses from the plan
+STATUS_AVAILABLE = "available"
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_NEEDS_REVIEW = "needs_review"
+STATUS_INDICATORS = {
+    STATUS_AVAILABLE: "🟢",
+    STATUS_IN_PROGRESS: "🟡",
+    STATUS_NEEDS_REVIEW: "🔴"
+}
+
+# Event topics
+TOPIC_STATUS = "status"
+TOPIC_QUALITY = "quality"
+TOPIC_FILE = "file"
+ANY_FILE = "*"
+
+Callback = Callable[[Dict], None]
+
+
+def normalize_path(file_path) -> str:
+    """Return the key used for a file on the bus."""
+    return os.path.abspath(str(file_path))
+
+
+def format_event(event: Dict) -> str:
+    """Format an event with the plan's `[TIMESTAMP] AGENT_ID: ACTION` protocol."""
+    timestamp = event["timestamp"][:16].replace("T", " ")
+    target = f" {event['file']}" if event.get("file") else ""
+    return f"[{timestamp}] {event['agent']}: {event['action']}{target}"
+
+
+class CoordinationBus:
+    """In-process publish/subscribe bus backed by an append-only log."""
+
+    def __init__(self, log_file: Optional[Path] = COORDINATION_LOG):
+        self.log_file = Path(log_file) if log_file else None
+        self.statuses: Dict[str, Dict] = {}
+        self._subscribers: Dict[Tuple[str, str], List[Callback]] = defaultdict(list)
+        self._lock = threading.RLock()
+        self._log_handle = None
+
+        if self.log_file:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            self._replay_statuses()
+            self._log_handle = open(self.log_file, 'a', encoding='utf-8')
+        print(colored("Coordination Bus initialized", "green"))
+
+    def subscribe(self, topic: str, callback: Callback,
+                  file_path: Optional[str] = None) -> Tuple:
+        """Register a callback for a topic, optionally for a single file."""
+        key = (topic, normalize_path(file_path) if file_path else ANY_FILE)
+        with self._lock:
+            self._subscribers[key].append(callback)
+        return key + (callback,)
+
+    def unsubscribe(self, token: Tuple) -> None:
+        """Remove a subscription returned by `subscribe`."""
+        topic, file_key, callback = token
+        with self._lock:
+            callbacks = self._subscribers.get((topic, file_key), [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def publish(self, topic: str, agent: str, action: str,
+                file_path: Optional[str] = None, data: Optional[Dict] = None,
+                log_data: Optional[Dict] = None) -> Dict:
+        """Deliver an event to subscribers, then append it to the log.
+
+        `log_data` replaces `data` in the on-disk entry, so large payloads
+        (such as full issue lists) can be summarised in the log.
+        """
+        event = {
+            "timestamp": datetime.now().isoformat(),
+            "topic": topic,
+            "agent": agent,
+            "action": action,
+            "file": normalize_path(file_path) if file_path else None,
+            "data": data or {}
+        }
+        self._deliver(event)
+        self._append(dict(event, data=log_data if log_data is not None else event["data"]))
+        return event
+
+    def claim(self, file_path: str, agent: str) -> bool:
+        """Claim a file for an agent. Returns False if another agent holds it."""
+        key = normalize_path(file_path)
+        with self._lock:
+            current = self.statuses.get(key)
+            if (current and current["status"] == STATUS_IN_PROGRESS
+                    and current["agent"] != agent):
+                return False
+            self.statuses[key] = {"status": STATUS_IN_PROGRESS, "agent": agent}
+        self.publish(TOPIC_STATUS, agent, "claim", key, {"status": STATUS_IN_PROGRESS})
+        return True
+
+    def release(self, file_path: str, agent: str, needs_review: bool = False) -> bool:
+        """Release a claim held by an agent, optionally asking for review."""
+        key = normalize_path(file_path)
+        with self._lock:
+            current = self.statuses.get(key)
+            if not current or current["agent"] != agent:
+                return False
+        status = STATUS_NEEDS_REVIEW if needs_review else STATUS_AVAILABLE
+        self.set_status(key, status, agent)
+        return True
+
+    def set_status(self, file_path: str, status: str, agent: str) -> None:
+        """Publish a status change for a file."""
+        if status not in STATUS_INDICATORS:
+            raise ValueError(f"Unknown file status: {status}")
+        key = normalize_path(file_path)
+        with self._lock:
+            self.statuses[key] = {"status": status, "agent": agent}
+        self.publish(TOPIC_STATUS, agent, status, key, {"status": status})
+
+    def status_of(self, file_path: str) -> str:
+        """Return the current status of a file."""
+        entry = self.statuses.get(normalize_path(file_path))
+        return entry["status"] if entry else STATUS_AVAILABLE
+
+    def claimed_by(self, file_path: str) -> Optional[str]:
+        """Return the agent holding a claim on a file, if any."""
+        entry = self.statuses.get(normalize_path(file_path))
+        if entry and entry["status"] == STATUS_IN_PROGRESS:
+            return entry["agent"]
+        return None
+
+    def claimed_files(self, agent: Optional[str] = None) -> List[str]:
+        """List files currently in progress, optionally for one agent."""
+        with self._lock:
+            return [
+                path for path, entry in self.statuses.items()
+                if entry["status"] == STATUS_IN_PROGRESS
+                and (agent is None or entry["agent"] == agent)
+            ]
+
+    def publish_quality(self, file_path: str, issues: List[Dict],
+                        agent: str = "monitor") -> Dict:
+        """Publish a per-file quality result; the log keeps only counts."""
+        counts: Dict[str, int] = {}
+        for issue in issues:
+            counts[issue["type"]] = counts.get(issue["type"], 0) + 1
+        return self.publish(
+            TOPIC_QUALITY, agent, "checked", file_path,
+            data={"issues": issues},
+            log_data={"issue_counts": counts}
+        )
+
+    def close(self) -> None:
+        """Close the on-disk log."""
+        with self._lock:
+            if self._log_handle:
+                self._log_handle.close()
+                self._log_handle = None
+
+    def _deliver(self, event: Dict) -> None:
+        """Call subscribers for the event's file and for all files."""
+        with self._lock:
+            callbacks = list(self._subscribers.get((event["topic"], ANY_FILE), []))
+            if event["file"]:
+                callbacks += self._subscribers.get((event["topic"], event["file"]), [])
+
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                print(colored(f"Subscriber error on {event['topic']}: {e}", "yellow"))
+
+    def _append(self, event: Dict) -> None:
+        """Append one event to the shared log."""
+        try:
+            with self._lock:
+                if self._log_handle:
+                    self._log_handle.write(json.dumps(event, ensure_ascii=False) + "\n")
+                    self._log_handle.flush()
+        except (OSError, TypeError, ValueError) as e:
+            print(colored(f"Error writing coordination log: {e}", "yellow"))
+
+    def _replay_statuses(self) -> None:
+        """Rebuild file statuses from an existing log."""
+        if not self.log_file.exists():
+            return
+        try:
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Partially written line from a crashed writer
+                    if event.get("topic") == TOPIC_STATUS and event.get("file"):
+                        self.statuses[event["file"]] = {
+                            "status": event["data"]["status"],
+                            "agent": event["agent"]
+                        }
+        except OSError as e:
+            print(colored(f"Error reading coordination log: {e}", "yellow"))
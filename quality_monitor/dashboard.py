@@ -0,0 +1,211 @@
+"""Live terminal dashboard fed by per-file result changes.
+
+A DashboardModel holds one row per file and project totals. Each result
+change (from the coordination bus or a pipeline sink) replaces one row
+and adjusts the totals by the difference, so updates cost O(log n) no
+matter how many files are monitored. The worst files are kept in a heap
+with lazy invalidation: stale entries are dropped when they surface and
+the heap is rebuilt once they outnumber the live rows.
+
+The TerminalDashboard redraws in place and rewrites only the screen lines
+whose text changed since the previous frame.
+
+Indicators follow the plan: 🔴 critical, 🟡 important, 🔵 style issues;
+file status 🟢 available, 🟡 in progress, 🔴 needs review.
+"""
+
+import asyncio
+import heapq
+import sys
+import threading
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from .coordination import (
+    STATUS_AVAILABLE,
+    STATUS_INDICATORS,
+    TOPIC_QUALITY,
+    TOPIC_STATUS,
+    CoordinationBus
+)
+from .gating import cheap_score
+
+DASHBOARD_ROWS = 20
+DASHBOARD_REFRESH_SECONDS = 0.5
+
+SEVERITIES = ("CRITICAL", "IMPORTANT", "STYLE")
+SEVERITY_INDICATORS = {"CRITICAL": "🔴", "IMPORTANT": "🟡", "STYLE": "🔵"}
+
+CLEAR_LINE = "\x1b[2K"
+
+
+def move_to(line: int) -> str:
+    """ANSI cursor move to the start of a (1-based) screen line."""
+    return f"\x1b[{line};1H"
+
+
+class DashboardModel:
+    """Per-file rows and incrementally maintained totals."""
+
+    def __init__(self):
+        self.rows: Dict[str, Dict] = {}
+        self.totals = {
+            "files": 0,
+            "score_sum": 0,
+            "issues": dict.fromkeys(SEVERITIES, 0),
+            "statuses": dict.fromkeys(STATUS_INDICATORS, 0)
+        }
+        self.version = 0  # Bumped on every change
+        self._heap: List[Tuple[int, int, str, int]] = []  # (score, -issues, file, row version)
+        self._lock = threading.Lock()  # Results may arrive from checker threads
+
+    def update(self, file_path: str, issues: List[Dict]) -> None:
+        """Replace a file's result."""
+        counts = dict.fromkeys(SEVERITIES, 0)
+        for issue in issues:
+            if issue.get("type") in counts:
+                counts[issue["type"]] += 1
+        with self._lock:
+            row = self._row(file_path)
+            self.totals["score_sum"] -= row["score"]
+            for severity in SEVERITIES:
+                self.totals["issues"][severity] += counts[severity] - row["counts"][severity]
+            row["counts"], row["score"] = counts, cheap_score(issues)
+            self.totals["score_sum"] += row["score"]
+            self._changed(file_path, row)
+
+    def set_status(self, file_path: str, status: str) -> None:
+        """Record a file's coordination status."""
+        with self._lock:
+            row = self._row(file_path)
+            self.totals["statuses"][row["status"]] -= 1
+            self.totals["statuses"][status] += 1
+            row["status"] = status
+            self._changed(file_path, row)
+
+    def remove(self, file_path: str) -> None:
+        """Drop a file (deleted or no longer monitored)."""
+        with self._lock:
+            row = self.rows.pop(file_path, None)
+            if row is None:
+                return
+            self.totals["files"] -= 1
+            self.totals["score_sum"] -= row["score"]
+            self.totals["statuses"][row["status"]] -= 1
+            for severity in SEVERITIES:
+                self.totals["issues"][severity] -= row["counts"][severity]
+            self.version += 1
+
+    def mean_score(self) -> float:
+        return self.totals["score_sum"] / self.totals["files"] if self.totals["files"] else 100.0
+
+    def worst(self, n: int = DASHBOARD_ROWS) -> List[Tuple[str, Dict]]:
+        """The n lowest-scoring files with issues, most issues first on ties."""
+        with self._lock:
+            heap, found, live = self._heap, [], []
+            while heap and len(found) < n:
+                score, _, file_path, version = heap[0]
+                row = self.rows.get(file_path)
+                if row is None or row["version"] != version:
+                    heapq.heappop(heap)  # Superseded or removed
+                    continue
+                if score >= 100:
+                    break  # Only clean files remain
+                live.append(heapq.heappop(heap))
+                found.append((file_path, dict(row, counts=dict(row["counts"]))))
+            for entry in live:
+                heapq.heappush(heap, entry)
+            return found
+
+    def attach(self, bus: CoordinationBus) -> None:
+        """Follow quality results and file statuses published on a bus."""
+        bus.subscribe(TOPIC_QUALITY, lambda event: self.update(
+            event["file"], event["data"].get("issues", [])
+        ))
+        bus.subscribe(TOPIC_STATUS, lambda event: self.set_status(
+            event["file"], event["data"]["status"]
+        ))
+
+    async def sink(self, event) -> None:
+        """QualityPipeline report sink."""
+        issues = list(event.issues)
+        if event.ai_result:
+            issues += event.ai_result.get("issues", [])
+        self.update(event.file_path, issues)
+
+    def _row(self, file_path: str) -> Dict:
+        row = self.rows.get(file_path)
+        if row is None:
+            row = {"counts": dict.fromkeys(SEVERITIES, 0), "score": 100,
+                   "status": STATUS_AVAILABLE, "version": 0}
+            self.rows[file_path] = row
+            self.totals["files"] += 1
+            self.totals["score_sum"] += 100
+            self.totals["statuses"][STATUS_AVAILABLE] += 1
+        return row
+
+    def _changed(self, file_path: str, row: Dict) -> None:
+        """Index the new row version and bump the model version."""
+        self.version += 1
+        row["version"] = self.version
+        heapq.heappush(self._heap, self._heap_entry(file_path, row))
+        if len(self._heap) > 2 * len(self.rows) + 64:
+            self._heap = [self._heap_entry(path, r) for path, r in self.rows.items()]
+            heapq.heapify(self._heap)
+
+    @staticmethod
+    def _heap_entry(file_path: str, row: Dict) -> Tuple[int, int, str, int]:
+        return (row["score"], -sum(row["counts"].values()), file_path, row["version"])
+
+
+class TerminalDashboard:
+    """Redraws a DashboardModel in place, writing only changed lines."""
+
+    def __init__(self, model: DashboardModel, out: TextIO = sys.stdout,
+                 rows: int = DASHBOARD_ROWS):
+        self.model = model
+        self.out = out
+        self.rows = rows
+        self._screen: List[str] = []
+        self._drawn_version = -1
+
+    def frame(self) -> List[str]:
+        """Text lines of the current view."""
+        totals = self.model.totals
+        issues = "  ".join(f"{SEVERITY_INDICATORS[s]} {totals['issues'][s]}" for s in SEVERITIES)
+        statuses = "  ".join(
+            f"{STATUS_INDICATORS[s]} {count}" for s, count in totals["statuses"].items()
+        )
+        lines = [
+            f"Quality Dashboard: {totals['files']} files, mean score {self.model.mean_score():.1f}",
+            f"Issues: {issues}    Files: {statuses}",
+            ""
+        ]
+        for file_path, row in self.model.worst(self.rows):
+            counts = " ".join(f"{SEVERITY_INDICATORS[s]}{row['counts'][s]}" for s in SEVERITIES)
+            lines.append(f"{STATUS_INDICATORS[row['status']]} {row['score']:3d}  {counts}  {file_path}")
+        return lines + [""] * (self.rows + 3 - len(lines))
+
+    def refresh(self) -> int:
+        """Draw the lines that changed since the last frame; returns how many."""
+        if self.model.version == self._drawn_version:
+            return 0
+        self._drawn_version = self.model.version
+        frame = self.frame()
+        changes = [
+            move_to(number) + CLEAR_LINE + text
+            for number, text in enumerate(frame, 1)
+            if number > len(self._screen) or self._screen[number - 1] != text
+        ]
+        self._screen = frame
+        if changes:
+            self.out.write("".join(changes) + move_to(len(frame) + 1))
+            self.out.flush()
+        return len(changes)
+
+    async def run(self, interval: float = DASHBOARD_REFRESH_SECONDS,
+                  stop: Optional[asyncio.Event] = None) -> None:
+        """Refresh every `interval` seconds until `stop` is set."""
+        self.out.write("\x1b[2J")  # Clear once; later frames are incremental
+        while stop is None or not stop.is_set():
+            self.refresh()
+            await asyncio.sleep(interval)
@@ -0,0 +1,213 @@
+"""Latency budgets for AI analysis.
+
+A remote analysis gets `budget_seconds` to answer, however many model
+tiers it tries. If `hedge_after_seconds` is set and the analysis is still
+running by then, a duplicate request is sent and the first answer wins.
+If neither answers in time, the local heuristic result is returned
+instead. The remote requests keep running in the background for
+up to `late_timeout_seconds`, and a late answer replaces the heuristic
+one: it is stored in the AnalysisCache and handed to an `on_late`
+callback.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from termcolor import colored
+
+from config.ai_standards import AI_DEADLINE, AI_MODELS
+
+from .ai_cache import AnalysisCache, emit_issues, reset_issues
+
+EMPTY_RESULT = {"score": 0, "issues": [], "suggestions": [], "source": "heuristic"}
+
+
+class LatencyBudget:
+    """Shared deadline and hedging policy, with statistics."""
+
+    def __init__(self, budget: Optional[float] = None, hedge_after: Optional[float] = None,
+                 late_timeout: Optional[float] = None, cache: Optional[AnalysisCache] = None,
+                 hedge: bool = True):
+        self.budget = budget if budget is not None else AI_DEADLINE['budget_seconds']
+        self.hedge_after = hedge_after if hedge_after is not None else AI_DEADLINE['hedge_after_seconds']
+        if not hedge:
+            self.hedge_after = None
+        self.late_timeout = late_timeout if late_timeout is not None else AI_DEADLINE['late_timeout_seconds']
+        self.cache = cache  # Late AI answers are stored here
+        self.stats = {"on_time": 0, "fallbacks": 0, "hedged": 0, "hedge_wins": 0,
+                      "late_results": 0, "late_failures": 0}
+        self._late_tasks: Set[asyncio.Task] = set()
+
+    def bind(self, analyzer, on_late: Optional[Callable[[Dict], None]] = None) -> "BudgetedAnalyzer":
+        """Wrap an analyzer so its calls honour this budget."""
+        return BudgetedAnalyzer(self, analyzer, on_late)
+
+    async def wait_for_late(self) -> None:
+        """Wait for background late requests (shutdown and tests)."""
+        if self._late_tasks:
+            await asyncio.gather(*self._late_tasks, return_exceptions=True)
+
+    async def cancel_late(self) -> None:
+        """Abandon background late requests, e.g. on shutdown."""
+        for task in self._late_tasks:
+            task.cancel()
+        await self.wait_for_late()
+
+    async def guard(self, analyze: Callable[[Optional[Callable[[Dict], None]]], Awaitable[Dict]],
+                    fallback: Optional[Callable[[], Awaitable[Dict]]] = None,
+                    on_issue: Optional[Callable[[Dict], None]] = None,
+                    on_late: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Budget a whole analysis, e.g. a routed one with escalations.
+
+        `analyze(on_issue)` runs the remote analysis; hedged duplicates get
+        no `on_issue`. Partial issues stream only until the deadline, then
+        the issues of `fallback()` are emitted instead. If a hedge wins,
+        its issues are emitted once it returns. Either way, a consumer that
+        already got partial issues is first told to drop them (reset_issues).
+        """
+        expired = []
+        forwarded = []
+        hedges = []
+
+        def forward(issue: Dict) -> None:
+            if not expired:
+                forwarded.append(True)
+                on_issue(issue)
+
+        async def hedge() -> Dict:
+            result = await analyze(None)
+            hedges.append(result)
+            return result
+
+        def call(primary: bool) -> Awaitable[Dict]:
+            if primary:
+                return analyze(forward if on_issue else None)
+            return hedge()
+
+        def replace(result: Dict) -> Dict:
+            if forwarded:
+                reset_issues(on_issue, result.get("source", "ai"))
+            return emit_issues(result, on_issue)
+
+        async def heuristic() -> Dict:
+            expired.append(True)
+            return replace(await fallback() if fallback else dict(EMPTY_RESULT))
+
+        result = await self.run(call, heuristic, on_late)
+        if on_issue and any(result is won for won in hedges):
+            replace(result)
+        return result
+
+    async def run(self, call: Callable[[bool], Awaitable[Dict]],
+                  heuristic: Callable[[], Awaitable[Dict]],
+                  on_late: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Return `call(primary)`'s answer within budget, else the heuristic's."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.budget
+        hedge_at = None
+        if self.hedge_after is not None and self.hedge_after < self.budget:
+            hedge_at = loop.time() + self.hedge_after
+
+        primary = asyncio.ensure_future(call(True))
+        pending = {primary}
+        while pending and loop.time() < deadline:
+            wake = min(deadline, hedge_at) if hedge_at else deadline
+            done, pending = await asyncio.wait(
+                pending, timeout=wake - loop.time(), return_when=asyncio.FIRST_COMPLETED
+            )
+            winner = self._first_success(done)
+            if winner is not None:
+                await self._cancel(pending)
+                self.stats["on_time"] += 1
+                self.stats["hedge_wins"] += int(winner is not primary)
+                return winner.result()
+            if hedge_at and loop.time() >= hedge_at and pending:
+                pending.add(asyncio.ensure_future(call(False)))
+                self.stats["hedged"] += 1
+                hedge_at = None
+
+        self.stats["fallbacks"] += 1
+        result = dict(await heuristic(), deadline_exceeded=True)
+        if pending:
+            task = asyncio.ensure_future(self._late(pending, on_late))
+            self._late_tasks.add(task)
+            task.add_done_callback(self._late_tasks.discard)
+        return result
+
+    async def _late(self, pending: Set[asyncio.Future], on_late) -> None:
+        """Deliver the first late answer, then cancel the rest."""
+        loop = asyncio.get_running_loop()
+        give_up = loop.time() + self.late_timeout
+        try:
+            while pending and loop.time() < give_up:
+                done, pending = await asyncio.wait(
+                    pending, timeout=give_up - loop.time(), return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = self._first_success(done)
+                if winner is not None:
+                    self.stats["late_results"] += 1
+                    if on_late:
+                        on_late(winner.result())
+                    return
+            self.stats["late_failures"] += 1
+        except Exception as e:
+            print(colored(f"Error delivering late AI result: {e}", "yellow"))
+        finally:
+            await self._cancel(pending)
+
+    @staticmethod
+    async def _cancel(tasks: Set[asyncio.Future]) -> None:
+        """Cancel requests and wait until they have unwound."""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _first_success(done: Set[asyncio.Future]) -> Optional[asyncio.Future]:
+        """First finished request that returned a result (retrieves errors)."""
+        for task in done:
+            if not task.cancelled() and task.exception() is None:
+                return task
+        return None
+
+
+class BudgetedAnalyzer:
+    """Analyzer wrapper that answers within a LatencyBudget."""
+
+    def __init__(self, budget: LatencyBudget, analyzer,
+                 on_late: Optional[Callable[[Dict], None]] = None):
+        self.budget = budget
+        self.analyzer = analyzer
+        self.on_late = on_late
+
+    async def analyze_code(self, code: str, model: str = AI_MODELS['DEFAULT'],
+                           context=None) -> Dict:
+        return await self.analyze_code_stream(code, model, context)
+
+    async def analyze_code_stream(self, code: str, model: str = AI_MODELS['DEFAULT'],
+                                  context=None, on_issue=None) -> Dict:
+        """Budgeted analysis; partial issues stream only until the deadline."""
+        streams = on_issue is not None and hasattr(self.analyzer, "analyze_code_stream")
+
+        def remote(forward) -> Awaitable[Dict]:
+            if forward is not None:
+                return self.analyzer.analyze_code_stream(
+                    code, model=model, context=context, on_issue=forward
+                )
+            return self.analyzer.analyze_code(code, model=model, context=context)
+
+        fallback = getattr(self.analyzer, "heuristic_analysis", None)
+
+        def late(result: Dict) -> None:
+            if self.budget.cache is not None:
+                self.budget.cache.store(code, result, model, context)
+            if self.on_late:
+                self.on_late(dict(result, model=model))
+
+        result = await self.budget.guard(
+            remote, fallback and (lambda: fallback(code, context)),
+            on_issue if streams else None, late
+        )
+        if on_issue is not None and not streams:
+            emit_issues(result, on_issue)
+        return result
@@ -1,5 +1,6 @@
 """File monitoring module."""
 
+import os
 from typing import Dict, Optional, Set
 from watchdog.events import FileSystemEventHandler
 from termcolor import colored
@@ -7,15 +8,102 @@ from datetime import datetime
 from pathlib import Path
 
 from .quality_monitor import QualityMonitor
+from .coordination import (
+    CoordinationBus,
+    STATUS_IN_PROGRESS,
+    TOPIC_FILE,
+    TOPIC_STATUS
+)
+from .prefetch import Prefetcher
+from .scheduler import (
+    CheckScheduler,
+    PRIORITY_BACKGROUND,
+    PRIORITY_CLAIMED,
+    PRIORITY_INTERACTIVE
+)
+
+DEPENDENTS_AGENT = "dependents"  # Re-checks of importers share one fair-share queue
 
 class FileChangeHandler(FileSystemEventHandler):
     """Handles file system events."""
-    
-    def __init__(self):
-        self.quality_monitor = QualityMonitor()
+
+    def __init__(self, bus: Optional[CoordinationBus] = None, agent_id: str = "watcher"):
+        self.bus = bus
+        self.agent_id = agent_id
+        self.quality_monitor = QualityMonitor(bus=bus)
+        self.scheduler = CheckScheduler(self._run_check, idle_check=self.quality_monitor.prefetch)
         self.active_files: Set[str] = set()
+        # Warms claimed files, their import neighbours and usual co-edits while idle
+        self.prefetcher = Prefetcher(self.quality_monitor, self.scheduler, bus) if bus else None
+        if bus:
+            self.active_files.update(bus.claimed_files())
+            bus.subscribe(TOPIC_STATUS, self._on_status)
         print(colored("File Change Handler initialized", "green"))
 
     def on_modified(self, event):
-        if event.src_path.endswith('.py'):
-            self.quality_monitor.check_file(event.src_path)
\ No newline at end of file
+        self._changed(event.src_path, "modified")
+
+    def on_deleted(self, event):
+        self._changed(event.src_path, "deleted")
+
+    def on_moved(self, event):
+        # Editors often save by renaming a temporary file over the original
+        self._changed(event.src_path, "deleted")
+        self._changed(event.dest_path, "modified")
+
+    def scan(self, root: str, agent: Optional[str] = None) -> int:
+        """Queue a background check of every Python file under root."""
+        count = 0
+        for file_path in Path(root).rglob("*.py"):
+            self.scheduler.submit(str(file_path), PRIORITY_BACKGROUND, agent)
+            count += 1
+        self.scheduler.start()
+        print(colored(f"Queued background scan of {count} files", "cyan"))
+        return count
+
+    def _changed(self, file_path: str, action: str) -> None:
+        """Queue an interactive job for a changed Python or config file."""
+        is_config = self._is_config_file(file_path)
+        if not is_config and not file_path.endswith('.py'):
+            return
+        agent = self.agent_id
+        if self.bus and not is_config:
+            self.bus.publish(TOPIC_FILE, self.agent_id, action, file_path)
+            agent = self.bus.claimed_by(file_path) or agent
+        # Config reloads and removals are jobs too, so they never run in the middle of a check
+        self._submit(file_path, PRIORITY_INTERACTIVE, agent)
+
+    def _submit(self, file_path: str, priority: int, agent: str) -> None:
+        """Queue a job; without a worker thread, run its class and above now."""
+        self.scheduler.submit(file_path, priority, agent)
+        if not self.scheduler.running:
+            # Background and idle work stays queued for a later scan or drain
+            self.scheduler.run_pending(max_priority=priority)
+
+    def _run_check(self, file_path: str):
+        """Check a file, then queue importers affected by its changes."""
+        if self._is_config_file(file_path):
+            self.quality_monitor.reload_config()
+            return None
+        context = None
+        if os.path.exists(file_path):
+            context = self.quality_monitor.check_file(file_path)
+        else:
+            self.quality_monitor.remove_file(file_path)
+        for dependent in self.quality_monitor.take_dependents():
+            self.scheduler.submit(dependent, PRIORITY_BACKGROUND, DEPENDENTS_AGENT)
+        return context
+
+    def _is_config_file(self, path: str) -> bool:
+        """Whether a path is the runtime configuration overrides file."""
+        config_file = self.quality_monitor.config.config_file
+        return config_file is not None and Path(path).resolve() == config_file.resolve()
+
+    def _on_status(self, event: Dict) -> None:
+        """Track claimed files and pre-check them for the claiming agent."""
+        if event["data"].get("status") == STATUS_IN_PROGRESS:
+            self.active_files.add(event["file"])
+            if event["file"].endswith('.py'):
+                self._submit(event["file"], PRIORITY_CLAIMED, event["agent"])
+        else:
+            self.active_files.discard(event["file"])
@@ -0,0 +1,96 @@
+"""Policies that decide when AI analysis is worth its cost.
+
+Cheap checkers always run first. The gate then applies these policies in
+order, and the first one that reaches a verdict wins:
+
+1. critical - cheap checks found a CRITICAL issue, such as code that does not
+   parse: skip, the outcome is known.
+2. changed_lines - fewer than `min_changed_lines` lines changed: skip.
+3. risk - the file's posterior issue rate is at least `risk_threshold`: run.
+4. uncertainty - the cheap score falls inside `uncertain_score_range`: run.
+5. Otherwise the code is clearly clean or clearly poor: skip.
+
+With a `log_file`, each skip decision is appended to a JSONL audit log;
+AI_GATE_LOG is the conventional location. Without one nothing is written.
+"""
+
+import json
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+from termcolor import colored
+
+from config.quality_standards import AI_GATING
+
+from .metrics_store import ISSUE_COLUMNS, ISSUE_PENALTIES
+from .registry import COST_AI
+
+AI_GATE_LOG = Path("monitor_data/ai_gate_log.jsonl")  # Pass as log_file to keep an audit log
+RECENT_DECISIONS = 200
+
+
+def cheap_score(issues: List[Dict]) -> int:
+    """0-100 score from cheap-check issues, using the standard penalties."""
+    penalty = sum(ISSUE_PENALTIES[ISSUE_COLUMNS[issue["type"]]]
+                  for issue in issues if issue.get("type") in ISSUE_COLUMNS)
+    return max(0, 100 - penalty)
+
+
+class AIGate:
+    """Decides per file whether to call the AI analyzer."""
+
+    def __init__(self, policy: Optional[Dict] = None, log_file: Optional[Path] = None):
+        self.policy = dict(AI_GATING, **(policy or {}))
+        self.log_file = Path(log_file) if log_file else None
+        self.recent: Deque[Dict] = deque(maxlen=RECENT_DECISIONS)
+        self.stats = {"run": 0, "skipped": 0, "cost_saved": 0}
+
+    def decide(self, issues: List[Dict], file_path: Optional[str] = None,
+               changed_lines: Optional[int] = None, risk: Optional[float] = None) -> Dict:
+        """Apply the policies to cheap-check results and record the decision."""
+        score = cheap_score(issues)
+        low, high = self.policy['uncertain_score_range']
+
+        if self.policy['skip_on_critical'] and any(i.get("type") == "CRITICAL" for i in issues):
+            run, policy, reason = False, "critical", "cheap checks already found critical issues"
+        elif changed_lines is not None and changed_lines < self.policy['min_changed_lines']:
+            run, policy, reason = False, "changed_lines", f"only {changed_lines} lines changed"
+        elif risk is not None and risk >= self.policy['risk_threshold']:
+            run, policy, reason = True, "risk", f"high-risk file (issue rate {risk:.2f})"
+        elif low <= score <= high:
+            run, policy, reason = True, "uncertainty", f"cheap score {score} is inconclusive"
+        else:
+            verdict = "clean" if score > high else "poor"
+            run, policy, reason = False, "uncertainty", f"cheap score {score} is clearly {verdict}"
+
+        decision = {
+            "timestamp": datetime.now().isoformat(),
+            "file": file_path,
+            "run": run,
+            "policy": policy,
+            "reason": reason,
+            "score": score,
+            "changed_lines": changed_lines,
+            "risk": risk
+        }
+        self.recent.append(decision)
+        if run:
+            self.stats["run"] += 1
+        else:
+            self.stats["skipped"] += 1
+            self.stats["cost_saved"] += COST_AI
+            self._audit(decision)
+        return decision
+
+    def _audit(self, decision: Dict) -> None:
+        """Append a skip decision to the audit log."""
+        if not self.log_file:
+            return
+        try:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(decision, ensure_ascii=False) + "\n")
+        except (OSError, TypeError, ValueError) as e:
+            print(colored(f"Error writing AI gate log: {e}", "yellow"))
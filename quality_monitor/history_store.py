@@ -0,0 +1,219 @@
+"""Time-indexed history of file checks.
+
+One row per check, held in NumPy columns like the FunctionMetricsStore,
+with timestamps stored as epoch seconds so nothing is parsed at query
+time. Each row links to the previous check of the same file, and each
+file remembers its latest row, so per-file history, the state of every
+file at a point in time and regressions between two points are answered
+with vectorized walks instead of scans of `patterns["effectiveness"]`.
+Per-directory aggregates of the latest checks are kept up to date on
+every insert.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+INITIAL_CAPACITY = 1024
+
+TimePoint = Union[float, str, datetime]
+
+
+def as_epoch(when: TimePoint) -> float:
+    """Epoch seconds for a float, datetime or ISO 8601 string."""
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    if isinstance(when, datetime):
+        return when.timestamp()
+    return float(when)
+
+
+class CheckHistoryStore:
+    """Check results per file over time, indexed by file, time and directory."""
+
+    def __init__(self):
+        self.files: List[str] = []
+        self.directories: List[str] = []
+        self._file_ids: Dict[str, int] = {}
+        self._dir_ids: Dict[str, int] = {}
+        self._size = 0
+        # Per-check columns
+        self._timestamp = np.zeros(INITIAL_CAPACITY, dtype=np.float64)
+        self._file_id = np.zeros(INITIAL_CAPACITY, dtype=np.int32)
+        self._issues = np.zeros(INITIAL_CAPACITY, dtype=np.int32)
+        self._lines = np.zeros(INITIAL_CAPACITY, dtype=np.int32)
+        self._prev = np.zeros(INITIAL_CAPACITY, dtype=np.int64)  # Previous row of the file, -1 if none
+        # Per-file and per-directory indexes
+        self._latest = np.zeros(0, dtype=np.int64)
+        self._file_dir = np.zeros(0, dtype=np.int32)
+        self._dir_totals = {"files": [], "checks": [], "issues": []}
+        self._order: Optional[np.ndarray] = None  # Rows by time, rebuilt lazily
+
+    def __len__(self) -> int:
+        return self._size
+
+    def record(self, file_path: str, timestamp: TimePoint, issues: int, lines: int = 0) -> None:
+        """Add one check result."""
+        file_id = self._file(str(file_path))
+        row = self._size
+        if row == len(self._timestamp):
+            for name in ("_timestamp", "_file_id", "_issues", "_lines", "_prev"):
+                setattr(self, name, _grown(getattr(self, name), 2 * row))
+        self._timestamp[row] = as_epoch(timestamp)
+        self._file_id[row] = file_id
+        self._issues[row] = issues
+        self._lines[row] = lines
+
+        previous = self._latest[file_id]
+        self._prev[row] = previous
+        totals, dir_id = self._dir_totals, self._file_dir[file_id]
+        totals["checks"][dir_id] += 1
+        if previous < 0:
+            totals["files"][dir_id] += 1
+            totals["issues"][dir_id] += issues
+            self._latest[file_id] = row
+        elif self._timestamp[row] >= self._timestamp[previous]:
+            totals["issues"][dir_id] += issues - int(self._issues[previous])
+            self._latest[file_id] = row
+        else:
+            self._relink(row, file_id)  # Older result arriving late (e.g. from a sync)
+        self._size += 1
+        self._order = None
+
+    def record_effectiveness(self, effectiveness: Dict[str, List[Dict]]) -> None:
+        """Load `patterns["effectiveness"]`-style history."""
+        for file_path, history in effectiveness.items():
+            for entry in history:
+                self.record(file_path, entry["timestamp"], entry.get("issues_found", 0),
+                            entry.get("stats", {}).get("lines", 0))
+
+    def last_checks(self, file_path: str, n: int = 5) -> List[Dict]:
+        """The n most recent checks of a file, newest first."""
+        file_id = self._file_ids.get(str(file_path))
+        rows = []
+        row = self._latest[file_id] if file_id is not None else -1
+        while row >= 0 and len(rows) < n:
+            rows.append(row)
+            row = self._prev[row]
+        return [self._entry(row) for row in rows]
+
+    def checks_between(self, start: TimePoint, end: TimePoint) -> Dict[str, np.ndarray]:
+        """Columns of every check with start <= timestamp < end, oldest first."""
+        order = self._time_order()
+        times = self._timestamp[order]
+        rows = order[np.searchsorted(times, as_epoch(start)):np.searchsorted(times, as_epoch(end))]
+        return {
+            "file_id": self._file_id[rows],
+            "timestamp": self._timestamp[rows],
+            "issues": self._issues[rows],
+            "lines": self._lines[rows]
+        }
+
+    def state_at(self, when: Optional[TimePoint] = None) -> np.ndarray:
+        """Row of each file's latest check at `when` (now if None), -1 if none yet."""
+        rows = self._latest.copy()
+        if when is None:
+            return rows
+        cutoff = as_epoch(when)
+        pending = np.flatnonzero(rows >= 0)
+        while len(pending):
+            later = self._timestamp[rows[pending]] > cutoff
+            pending = pending[later]
+            rows[pending] = self._prev[rows[pending]]
+            pending = pending[rows[pending] >= 0]
+        return rows
+
+    def top_regressions(self, since: TimePoint, until: Optional[TimePoint] = None,
+                        n: int = 10) -> List[Dict]:
+        """Files whose issue count grew most between two points in time.
+
+        Files first checked after `since` have no baseline and are left out.
+        """
+        before, after = self.state_at(since), self.state_at(until)
+        known = np.flatnonzero((before >= 0) & (after >= 0))
+        growth = self._issues[after[known]] - self._issues[before[known]]
+        worse = growth > 0
+        known, growth = known[worse], growth[worse]
+        if not len(known) or n <= 0:
+            return []
+        n = min(n, len(known))
+        top = np.argpartition(-growth, n - 1)[:n]
+        top = top[np.argsort(-growth[top], kind="stable")]
+        return [
+            {
+                "file": self.files[known[i]],
+                "before": int(self._issues[before[known[i]]]),
+                "after": int(self._issues[after[known[i]]]),
+                "delta": int(growth[i])
+            }
+            for i in top
+        ]
+
+    def directory_aggregates(self) -> Dict[str, Dict]:
+        """Latest-check totals per directory (maintained on insert)."""
+        totals = self._dir_totals
+        return {
+            directory: {
+                "files": totals["files"][i],
+                "checks": totals["checks"][i],
+                "issues": totals["issues"][i],
+                "mean_issues": totals["issues"][i] / max(totals["files"][i], 1)
+            }
+            for i, directory in enumerate(self.directories)
+        }
+
+    def _file(self, file_path: str) -> int:
+        """Intern a file (and its directory), growing the per-file indexes."""
+        file_id = self._file_ids.get(file_path)
+        if file_id is not None:
+            return file_id
+        directory = str(Path(file_path).parent)
+        if directory not in self._dir_ids:
+            self._dir_ids[directory] = len(self.directories)
+            self.directories.append(directory)
+            for column in self._dir_totals.values():
+                column.append(0)
+
+        file_id = len(self.files)
+        self._file_ids[file_path] = file_id
+        self.files.append(file_path)
+        if file_id == len(self._latest):
+            capacity = max(2 * file_id, INITIAL_CAPACITY)
+            self._latest = _grown(self._latest, capacity, fill=-1)
+            self._file_dir = _grown(self._file_dir, capacity)
+        self._file_dir[file_id] = self._dir_ids[directory]
+        return file_id
+
+    def _relink(self, row: int, file_id: int) -> None:
+        """Insert an out-of-order row into its file's time-ordered chain."""
+        later, earlier = self._latest[file_id], self._prev[self._latest[file_id]]
+        while earlier >= 0 and self._timestamp[earlier] > self._timestamp[row]:
+            later, earlier = earlier, self._prev[earlier]
+        self._prev[row] = earlier
+        self._prev[later] = row
+
+    def _time_order(self) -> np.ndarray:
+        """Rows sorted by timestamp; usually already in order."""
+        if self._order is None:
+            times = self._timestamp[:self._size]
+            if np.all(times[1:] >= times[:-1]):
+                self._order = np.arange(self._size)
+            else:
+                self._order = np.argsort(times, kind="stable")
+        return self._order
+
+    def _entry(self, row: int) -> Dict:
+        return {
+            "file": self.files[self._file_id[row]],
+            "timestamp": datetime.fromtimestamp(self._timestamp[row]).isoformat(),
+            "issues_found": int(self._issues[row]),
+            "lines": int(self._lines[row])
+        }
+
+
+def _grown(array: np.ndarray, capacity: int, fill=0) -> np.ndarray:
+    grown = np.full(capacity, fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
@@ -0,0 +1,294 @@
+"""Incremental module import graph.
+
+Built from the ASTs that check_file already parses. For every file the
+graph keeps the modules it imports (and which names it takes from them)
+and its exports: the top-level names it defines, each with a small
+signature (kind, arguments, bases, docstring presence). Both directions
+are indexed in dicts, so updating a file or asking for its importers
+costs O(its imports + its importers), independent of project size.
+
+When a file is re-indexed, only the exports whose signature changed
+matter. Importers that take one of those names, or the whole module, are
+its affected dependents and are queued for re-check. As a checker, the
+graph reports imports of names that a project module no longer defines,
+e.g. after a rename.
+"""
+
+import ast
+from collections import deque
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from termcolor import colored
+
+from .baseline import relative_path
+from .registry import COST_INDEX
+
+WHOLE_MODULE = None  # `import m` or `from m import *`: every export is used
+DYNAMIC_EXPORTS = "__getattr__"  # Modules defining it resolve names at runtime
+SCOPE_NODES = (ast.If, ast.Try, ast.With)  # Top-level blocks whose names are still exported
+
+
+def module_name(file_path: str, root: Optional[Path] = None) -> str:
+    """Dotted module name of a file relative to the project root."""
+    parts = relative_path(file_path, root).strip("/").split("/")
+    parts[-1] = parts[-1][:-3] if parts[-1].endswith(".py") else parts[-1]
+    if parts[-1] == "__init__" and len(parts) > 1:
+        parts.pop()
+    return ".".join(parts)
+
+
+def _signature(node: ast.AST) -> tuple:
+    """What importers may depend on: kind, interface and docstring presence."""
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return ("function", ast.dump(node.args), ast.get_docstring(node) is not None)
+    if isinstance(node, ast.ClassDef):
+        members = sorted(child.name for child in node.body
+                         if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)))
+        return ("class", tuple(ast.dump(base) for base in node.bases), tuple(members),
+                ast.get_docstring(node) is not None)
+    return ("value",)
+
+
+def _target_names(target: ast.AST) -> List[str]:
+    if isinstance(target, ast.Name):
+        return [target.id]
+    if isinstance(target, (ast.Tuple, ast.List)):
+        return [name for element in target.elts for name in _target_names(element)]
+    return []
+
+
+class ImportGraph:
+    """Who imports what, kept up to date file by file."""
+
+    cost = COST_INDEX
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root  # Module names are relative to this (default: cwd)
+        self._modules: Dict[str, str] = {}                 # module -> file
+        self._file_modules: Dict[str, str] = {}            # file -> module
+        self._exports: Dict[str, Dict[str, tuple]] = {}    # file -> name -> signature
+        self._open: Set[str] = set()                       # files with star imports or __getattr__
+        self._imports: Dict[str, Dict[str, Optional[FrozenSet[str]]]] = {}  # file -> module -> names
+        self._importers: Dict[str, Dict[str, Optional[FrozenSet[str]]]] = {}  # module -> file -> names
+        self._pending: Dict[str, None] = {}  # Dependents awaiting re-check, in order
+
+    def __len__(self) -> int:
+        return len(self._file_modules)
+
+    def check(self, context) -> List[Dict]:
+        """Re-index a file's AnalysisContext and report imports of missing names."""
+        if context.path is None:
+            return []
+        try:
+            self.update_file(context.path, context.tree)
+            return self.missing_imports(context.path, context.tree)
+        except SyntaxError:
+            raise
+        except Exception as e:
+            print(colored(f"Import graph update failed for {context.path}: {e}", "yellow"))
+            return []
+
+    def update_file(self, file_path: str, tree: ast.AST) -> List[str]:
+        """Replace a file's imports and exports; returns its affected dependents.
+
+        The dependents are also queued (see `take_pending`).
+        """
+        key = str(file_path)
+        module = self._file_modules.get(key) or module_name(key, self.root)
+        old_exports = self._exports.get(key)
+        exports, is_open = self._collect_exports(tree)
+
+        self._unlink(key)
+        self._file_modules[key] = module
+        self._modules[module] = key
+        self._exports[key] = exports
+        if is_open:
+            self._open.add(key)
+        else:
+            self._open.discard(key)
+        imports = self._collect_imports(module, key, tree)
+        self._imports[key] = imports
+        for imported, names in imports.items():
+            self._importers.setdefault(imported, {})[key] = names
+
+        if old_exports is None:
+            affected = self.dependents(key)  # New module: earlier imports of it may now resolve
+        else:
+            changed = {name for name in set(exports) | set(old_exports)
+                       if exports.get(name) != old_exports.get(name)}
+            affected = self._importers_using(module, changed) if changed else []
+        self._queue(affected)
+        return affected
+
+    def remove_file(self, file_path: str) -> List[str]:
+        """Drop a deleted file; its importers are queued for re-check."""
+        key = str(file_path)
+        module = self._file_modules.pop(key, None)
+        if module is None:
+            return []
+        self._unlink(key)
+        self._imports.pop(key, None)
+        self._exports.pop(key, None)
+        self._open.discard(key)
+        if self._modules.get(module) == key:
+            del self._modules[module]
+        affected = self._importers_using(module, None)
+        self._queue(affected)
+        return affected
+
+    def dependents(self, file_path: str, transitive: bool = False) -> List[str]:
+        """Files importing a file's module, optionally through other modules."""
+        start = self._file_modules.get(str(file_path))
+        if start is None:
+            return []
+        seen = {str(file_path)}
+        found = []
+        queue = deque([start])
+        while queue:
+            for importer in self._importers.get(queue.popleft(), {}):
+                if importer not in seen:
+                    seen.add(importer)
+                    found.append(importer)
+                    if transitive:
+                        queue.append(self._file_modules[importer])
+        return found
+
+    def dependencies(self, file_path: str) -> List[str]:
+        """Indexed project files that a file imports."""
+        files = {self._modules[module]: None for module in self._imports.get(str(file_path), {})
+                 if module in self._modules}
+        files.pop(str(file_path), None)
+        return list(files)
+
+    def take_pending(self) -> List[str]:
+        """Dependents queued by recent updates, cleared on return."""
+        pending, self._pending = list(self._pending), {}
+        return pending
+
+    def discard_pending(self, files: Iterable[str]) -> None:
+        """Unqueue files that are already up to date."""
+        for file_path in files:
+            self._pending.pop(str(file_path), None)
+
+    def missing_imports(self, file_path: str, tree: ast.AST) -> List[Dict]:
+        """Issues for `from m import name` where indexed module m lacks name."""
+        module = self._file_modules.get(str(file_path))
+        issues = []
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.ImportFrom):
+                continue
+            imported = self._resolve(module, str(file_path), node)
+            source = self._modules.get(imported)
+            if source is None or source in self._open:
+                continue
+            exports = self._exports[source]
+            for alias in node.names:
+                name = alias.name
+                if name == "*" or name in exports or self._is_submodule(source, imported, name):
+                    continue
+                issues.append({
+                    "type": "IMPORTANT",
+                    "category": "Imports",
+                    "message": f"'{name}' is not defined in module '{imported}'",
+                    "suggestion": "Import the symbol under its current name or restore it",
+                    "line": node.lineno
+                })
+        return issues
+
+    def _is_submodule(self, source: str, imported: str, name: str) -> bool:
+        """Whether `from imported import name` names a module rather than a symbol."""
+        if f"{imported}.{name}" in self._modules:
+            return True
+        if not source.endswith("__init__.py"):
+            return False
+        package = Path(source).parent  # Not indexed yet, e.g. early in a scan
+        return (package / f"{name}.py").exists() or (package / name / "__init__.py").exists()
+
+    def _importers_using(self, module: str, changed: Optional[Set[str]]) -> List[str]:
+        """Importers of a module that use any changed name (None: all importers)."""
+        owner = self._modules.get(module)
+        return [
+            importer for importer, names in self._importers.get(module, {}).items()
+            if importer != owner and (changed is None or names is WHOLE_MODULE or names & changed)
+        ]
+
+    def _queue(self, files: Iterable[str]) -> None:
+        for file_path in files:
+            self._pending[file_path] = None
+
+    def _unlink(self, key: str) -> None:
+        """Remove a file's outgoing edges from the reverse index."""
+        for imported in self._imports.get(key, {}):
+            importers = self._importers.get(imported)
+            if importers is not None:
+                importers.pop(key, None)
+                if not importers:
+                    del self._importers[imported]
+
+    def _collect_imports(self, module: str, key: str,
+                         tree: ast.AST) -> Dict[str, Optional[FrozenSet[str]]]:
+        imports: Dict[str, Optional[Set[str]]] = {}
+
+        def use(imported: str, names: Optional[Iterable[str]]) -> None:
+            if imported in imports and imports[imported] is WHOLE_MODULE:
+                return
+            if names is WHOLE_MODULE:
+                imports[imported] = WHOLE_MODULE
+            else:
+                imports.setdefault(imported, set()).update(names)
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    use(alias.name, WHOLE_MODULE)
+            elif isinstance(node, ast.ImportFrom):
+                imported = self._resolve(module, key, node)
+                if not imported:
+                    continue
+                names = [alias.name for alias in node.names]
+                use(imported, WHOLE_MODULE if "*" in names else names)
+                for name in names:
+                    if name != "*":
+                        use(f"{imported}.{name}", WHOLE_MODULE)  # In case it is a submodule
+        return {imported: None if names is WHOLE_MODULE else frozenset(names)
+                for imported, names in imports.items()}
+
+    @staticmethod
+    def _resolve(module: Optional[str], key: str, node: ast.ImportFrom) -> str:
+        """Absolute name of the module a `from ... import` refers to."""
+        if not node.level:
+            return node.module or ""
+        package = (module or "").split(".")
+        if not key.endswith("__init__.py"):
+            package = package[:-1]
+        package = package[:len(package) - (node.level - 1)] if node.level > 1 else package
+        return ".".join(part for part in package + [node.module or ""] if part)
+
+    @staticmethod
+    def _collect_exports(tree: ast.AST) -> tuple:
+        """Top-level names with their signatures, and whether the set is open-ended."""
+        exports: Dict[str, tuple] = {}
+        is_open = False
+        body = deque(getattr(tree, "body", []))
+        while body:
+            node = body.popleft()
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                exports[node.name] = _signature(node)
+                is_open = is_open or node.name == DYNAMIC_EXPORTS
+            elif isinstance(node, ast.Assign):
+                for target in node.targets:
+                    exports.update((name, _signature(node)) for name in _target_names(target))
+            elif isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+                exports.update((name, _signature(node)) for name in _target_names(node.target))
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                for alias in node.names:
+                    if alias.name == "*":
+                        is_open = True
+                    else:
+                        exports[alias.asname or alias.name.split(".")[0]] = ("import",)
+            elif isinstance(node, SCOPE_NODES):
+                nested = node.body + getattr(node, "orelse", []) + getattr(node, "finalbody", [])
+                nested += [stmt for handler in getattr(node, "handlers", []) for stmt in handler.body]
+                body.extendleft(reversed(nested))
+        return exports, is_open
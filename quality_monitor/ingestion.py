@@ -0,0 +1,129 @@
+"""Source file ingestion.
+
+Reads each file once, choosing the cheapest safe route:
+
+* Vendored files and files above ``max_read_bytes`` are skipped unread.
+* The header is inspected first; generated code is skipped without
+  decoding the rest of the file. Only the leading comment lines count:
+  a marker in a docstring or string literal describes other code.
+* The PEP 263 encoding cookie is read from the header with
+  ``tokenize.detect_encoding``, so the body is decoded in a single pass.
+* Files of ``mmap_min_bytes`` or more are memory-mapped and decoded
+  straight from the mapping instead of being copied into a read buffer.
+* Files above ``max_full_check_bytes`` only get line-based checks.
+
+``ingest_source`` applies the same classification to source text that is
+already in memory, e.g. code generated by an agent, without touching disk.
+"""
+
+import io
+import mmap
+import os
+import tokenize
+from pathlib import Path
+from typing import Optional
+
+from config.quality_standards import GENERATED_MARKERS, INGESTION_LIMITS, VENDORED_DIRS
+
+from .context import MODE_FULL, MODE_LINES, MODE_SKIP, AnalysisContext
+
+
+def ingest_file(file_path) -> AnalysisContext:
+    """Read a source file into an AnalysisContext with its check mode set."""
+    path = str(file_path)
+    vendored = vendored_dir(path)
+    if vendored:
+        return AnalysisContext("", path, mode=MODE_SKIP, note=f"vendored code ({vendored}/)")
+
+    size = os.path.getsize(path)
+    if size > INGESTION_LIMITS['max_read_bytes']:
+        return AnalysisContext("", path, mode=MODE_SKIP, note=f"too large to check ({size} bytes)")
+
+    with open(path, 'rb') as f:
+        if size >= INGESTION_LIMITS['mmap_min_bytes']:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _ingest_buffer(path, mapped, size)
+        return _ingest_buffer(path, f.read(), size)
+
+
+def ingest_source(file_path, content: str) -> AnalysisContext:
+    """Classify in-memory source text the way ingest_file classifies a file."""
+    path = str(file_path)
+    vendored = vendored_dir(path)
+    if vendored:
+        return AnalysisContext("", path, mode=MODE_SKIP, note=f"vendored code ({vendored}/)")
+
+    size = len(content.encode('utf-8', 'replace'))
+    if size > INGESTION_LIMITS['max_read_bytes']:
+        return AnalysisContext("", path, mode=MODE_SKIP, note=f"too large to check ({size} bytes)")
+
+    marker = generated_marker(content[:INGESTION_LIMITS['header_sniff_bytes']].encode('utf-8', 'replace'))
+    if marker:
+        return AnalysisContext("", path, mode=MODE_SKIP,
+                               note=f"generated code ('{marker}' in header)")
+
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+    if size > INGESTION_LIMITS['max_full_check_bytes']:
+        return AnalysisContext(content, path, mode=MODE_LINES,
+                               note=f"{size} bytes exceeds the full-check limit")
+    return AnalysisContext(content, path)
+
+
+def vendored_dir(file_path: str) -> Optional[str]:
+    """Name of the vendored directory containing a file, if any."""
+    for part in Path(file_path).parent.parts:
+        if part in VENDORED_DIRS:
+            return part
+    return None
+
+
+def generated_marker(header: bytes) -> Optional[str]:
+    """Generated-code marker in the comment lines that open a file, if any."""
+    comments = []
+    for line in header.decode('latin-1').lstrip('\xef\xbb\xbf').splitlines():
+        line = line.strip()
+        if line and not line.startswith('#'):
+            break  # First statement or docstring: the header is over
+        comments.append(line)
+    text = "\n".join(comments).lower()
+    for marker in GENERATED_MARKERS:
+        if marker in text:
+            return marker
+    return None
+
+
+def detect_encoding(header: bytes) -> str:
+    """Encoding declared by a BOM or PEP 263 cookie, defaulting to UTF-8."""
+    try:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(header).readline)
+        return encoding
+    except SyntaxError:
+        return 'utf-8'  # Unknown or conflicting cookie; the parser reports it
+
+
+def _ingest_buffer(path: str, buffer, size: int) -> AnalysisContext:
+    """Sniff, decode and classify an in-memory or mapped file body."""
+    header = bytes(buffer[:INGESTION_LIMITS['header_sniff_bytes']])
+    marker = generated_marker(header)
+    if marker:
+        return AnalysisContext("", path, mode=MODE_SKIP,
+                               note=f"generated code ('{marker}' in header)")
+
+    encoding = detect_encoding(header)
+    note = None
+    with memoryview(buffer) as view:
+        try:
+            content = str(view, encoding)
+        except UnicodeDecodeError:
+            content = str(view, encoding, 'replace')
+            note = f"undecodable {encoding} bytes replaced"
+
+    if '\r' in content:  # Match text-mode reads: universal newlines
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+    if size > INGESTION_LIMITS['max_full_check_bytes']:
+        return AnalysisContext(content, path, encoding, MODE_LINES,
+                               f"{size} bytes exceeds the full-check limit")
+    return AnalysisContext(content, path, encoding, MODE_FULL, note)
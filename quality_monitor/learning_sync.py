@@ -0,0 +1,198 @@
+"""Merging learning state across monitor processes.
+
+Everything a LearningSystem learns is mergeable: pattern and issue counts
+and the posterior sufficient statistics add up, metric sketches merge by
+adding bucket counts, and effectiveness histories are append-only. Each
+replica therefore publishes only what it learned since its last sync and
+applies other replicas' deltas in any order, and all replicas converge
+on the same state.
+
+Replicas share a local directory holding one append-only delta log per
+replica (`<replica>.jsonl`). A sync appends the local delta to the
+replica's own log, then reads the lines other logs gained since the last
+sync. Nothing is rewritten and no central service is involved. A new
+replica catches up by reading every log from the start.
+"""
+
+import json
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from termcolor import colored
+
+from config.quality_standards import LEARNING_SYNC
+
+from .quantiles import QuantileSketch
+
+# LearningSystem.patterns entries made of (nested) counts
+COUNTER_KEYS = ("successful_patterns", "issue_patterns", "posteriors")
+
+
+def count_delta(current: Dict, base: Dict) -> Dict:
+    """Non-zero differences between two nested dicts of counts."""
+    delta = {}
+    for key, value in current.items():
+        if isinstance(value, dict):
+            nested = count_delta(value, base.get(key, {}))
+            if nested:
+                delta[key] = nested
+        elif value != base.get(key, 0):
+            delta[key] = value - base.get(key, 0)
+    return delta
+
+
+def add_counts(target: Dict, delta: Dict) -> None:
+    """Add nested counts into `target` in place."""
+    for key, value in delta.items():
+        if isinstance(value, dict):
+            add_counts(target.setdefault(key, {}), value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+def sketch_delta(current: QuantileSketch, base: QuantileSketch) -> Optional[Dict]:
+    """Observations added to a sketch since `base`, as `to_dict` output."""
+    if current.count == base.count:
+        return None
+    data = current.to_dict()
+    data["zero"] -= base.zero_count
+    data["buckets"] = [
+        (index, count - base.buckets.get(index, 0))
+        for index, count in data["buckets"]
+        if count != base.buckets.get(index, 0)
+    ]
+    return data
+
+
+def copy_sketch(sketch: QuantileSketch) -> QuantileSketch:
+    return QuantileSketch.from_dict(sketch.to_dict())
+
+
+class LearningSync:
+    """Exchanges a LearningSystem's deltas through a shared directory."""
+
+    def __init__(self, learning_system, directory: Optional[Path] = None,
+                 replica_id: Optional[str] = None,
+                 interval: Optional[float] = None):
+        self.learning = learning_system
+        self.directory = Path(directory or LEARNING_SYNC['directory'])
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.replica_id = replica_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.log_file = self.directory / f"{self.replica_id}.jsonl"
+        self.interval = interval if interval is not None else LEARNING_SYNC['interval_seconds']
+        self.stats = {"published": 0, "applied": 0}
+        self._offsets: Dict[str, int] = {}
+        self._last_sync = time.monotonic()
+        self._snapshot()
+        self._read_new(self.log_file)  # Restart under the same id: restore own history
+
+    def sync(self) -> Dict:
+        """Publish local learning, then apply what other replicas published."""
+        try:
+            published = self._publish()
+            applied = 0
+            for log_file in sorted(self.directory.glob("*.jsonl")):
+                if log_file != self.log_file:
+                    applied += self._read_new(log_file)
+            if applied:
+                self.learning.beliefs.invalidate()
+            self._last_sync = time.monotonic()
+            return {"published": published, "applied": applied}
+        except OSError as e:
+            print(colored(f"Error syncing learning state: {e}", "yellow"))
+            return {"published": False, "applied": 0}
+
+    def maybe_sync(self) -> Optional[Dict]:
+        """Sync if the interval has passed since the last sync."""
+        if time.monotonic() - self._last_sync >= self.interval:
+            return self.sync()
+        return None
+
+    def delta(self) -> Dict:
+        """What this replica learned since its last sync."""
+        patterns = self.learning.patterns
+        delta = {"counters": {}, "sketches": {}, "effectiveness": {}}
+        for key in COUNTER_KEYS:
+            changed = count_delta(patterns[key], self._base["counters"][key])
+            if changed:
+                delta["counters"][key] = changed
+        for metric, sketch in self.learning.metric_sketches.items():
+            changed = sketch_delta(sketch, self._base["sketches"][metric])
+            if changed:
+                delta["sketches"][metric] = changed
+        for file_path, history in patterns["effectiveness"].items():
+            seen = self._base["effectiveness"].get(file_path, 0)
+            if len(history) > seen:
+                delta["effectiveness"][file_path] = history[seen:]
+        return {part: changes for part, changes in delta.items() if changes}
+
+    def _publish(self) -> bool:
+        """Append the local delta to this replica's log."""
+        delta = self.delta()
+        if not delta:
+            return False
+        line = json.dumps({"replica": self.replica_id, "timestamp": time.time(), "delta": delta})
+        with open(self.log_file, 'ab') as f:
+            f.write(line.encode("utf-8") + b"\n")  # One write per delta: appends stay whole
+            self._offsets[str(self.log_file)] = f.tell()
+        self._snapshot()
+        self.stats["published"] += 1
+        return True
+
+    def _read_new(self, log_file: Path) -> int:
+        """Apply complete lines appended to a log since it was last read."""
+        key = str(log_file)
+        try:
+            with open(log_file, 'rb') as f:
+                f.seek(self._offsets.get(key, 0))
+                data = f.read()
+        except FileNotFoundError:
+            return 0
+
+        complete = data[:data.rfind(b"\n") + 1]  # A concurrent writer may be mid-line
+        self._offsets[key] = self._offsets.get(key, 0) + len(complete)
+        applied = 0
+        for line in complete.splitlines():
+            try:
+                delta = json.loads(line)["delta"]
+            except (ValueError, KeyError):
+                continue  # Partially written line from a crashed writer
+            self._apply(delta)
+            applied += 1
+        self.stats["applied"] += applied
+        return applied
+
+    def _apply(self, delta: Dict) -> None:
+        """Merge a delta into the learned state and the sync baseline."""
+        patterns = self.learning.patterns
+        for key, changes in delta.get("counters", {}).items():
+            add_counts(patterns[key], changes)
+            add_counts(self._base["counters"][key], changes)
+        for metric, data in delta.get("sketches", {}).items():
+            if metric in self.learning.metric_sketches:
+                self.learning.metric_sketches[metric].merge(QuantileSketch.from_dict(data))
+                self._base["sketches"][metric].merge(QuantileSketch.from_dict(data))
+        for file_path, entries in delta.get("effectiveness", {}).items():
+            history = patterns["effectiveness"].setdefault(file_path, [])
+            history.extend(entries)
+            history.sort(key=lambda entry: entry.get("timestamp", ""))
+            self._base["effectiveness"][file_path] = len(history)
+            self.learning.history.record_effectiveness({file_path: entries})
+
+    def _snapshot(self) -> None:
+        """Remember the current state as already synced."""
+        patterns = self.learning.patterns
+        self._base = {
+            "counters": {key: json.loads(json.dumps(patterns[key])) for key in COUNTER_KEYS},
+            "sketches": {
+                metric: copy_sketch(sketch)
+                for metric, sketch in self.learning.metric_sketches.items()
+            },
+            "effectiveness": {
+                file_path: len(history)
+                for file_path, history in patterns["effectiveness"].items()
+            }
+        }
@@ -0,0 +1,297 @@
+"""Columnar per-function metrics store.
+
+One row per function, held in NumPy arrays (one array per column) so
+project-wide aggregates, worst-function rankings and score distributions
+are computed with vectorized operations. File paths and function names
+are interned into string tables and stored as integer ids.
+
+A QualityMonitor given a `metrics_file` loads the store on startup, saves
+it at most every METRICS_CHECKPOINT_SECONDS while checking, and on close.
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from termcolor import colored
+
+from .runtime_config import RUNTIME_CONFIG, RuntimeConfig
+
+METRICS_STORE_FILE = Path("monitor_data/function_metrics.npz")
+METRICS_CHECKPOINT_SECONDS = 300.0
+
+# Integer columns stored per function
+COLUMNS = (
+    "file_id",
+    "name_id",
+    "start_line",
+    "end_line",
+    "body_length",
+    "nesting_depth",
+    "docstring_words",
+    "critical_issues",
+    "important_issues",
+    "style_issues"
+)
+METRIC_COLUMNS = ("body_length", "nesting_depth", "docstring_words")
+ISSUE_COLUMNS = {
+    "CRITICAL": "critical_issues",
+    "IMPORTANT": "important_issues",
+    "STYLE": "style_issues"
+}
+
+# Score penalties per issue, matching the heuristic analyzer's weights
+ISSUE_PENALTIES = {
+    "critical_issues": 25,
+    "important_issues": 15,
+    "style_issues": 5
+}
+
+INITIAL_CAPACITY = 1024
+
+
+class FunctionMetricsStore:
+    """Per-function metrics kept in NumPy-backed columns."""
+
+    def __init__(self, store_file: Path = METRICS_STORE_FILE,
+                 config: Optional[RuntimeConfig] = None):
+        self.store_file = Path(store_file)
+        self.config = config or RUNTIME_CONFIG
+        self.files: List[str] = []
+        self.names: List[str] = []
+        self._file_ids: Dict[str, int] = {}
+        self._name_ids: Dict[str, int] = {}
+        self._file_rows: Dict[int, Tuple[int, int]] = {}
+        self._columns = {column: np.zeros(INITIAL_CAPACITY, dtype=np.int32) for column in COLUMNS}
+        self._alive = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self._size = 0
+        self._dirty = False  # Changed since the last save
+        self._last_save = time.monotonic()
+
+    def __len__(self) -> int:
+        return int(self._alive[:self._size].sum())
+
+    def update_file(self, file_path: str, function_metrics: List[Dict],
+                    issues: List[Dict]) -> None:
+        """Replace the rows for a file with its latest function metrics."""
+        file_id = self._intern(str(file_path), self.files, self._file_ids)
+        self._dirty = True
+        previous = self._file_rows.pop(file_id, None)
+        if previous:
+            self._alive[previous[0]:previous[1]] = False
+        if not function_metrics:
+            return
+
+        rows = len(function_metrics)
+        self._reserve(rows)
+        start = self._size
+        block = slice(start, start + rows)
+
+        self._columns["file_id"][block] = file_id
+        self._columns["name_id"][block] = [
+            self._intern(m["name"], self.names, self._name_ids) for m in function_metrics
+        ]
+        for column in ("start_line", "end_line") + METRIC_COLUMNS:
+            self._columns[column][block] = [m[column] for m in function_metrics]
+        for column, counts in self._count_issues(function_metrics, issues).items():
+            self._columns[column][block] = counts
+
+        self._alive[block] = True
+        self._size += rows
+        self._file_rows[file_id] = (start, start + rows)
+
+    def remove_file(self, file_path: str) -> None:
+        """Drop all rows for a file."""
+        file_id = self._file_ids.get(str(file_path))
+        previous = self._file_rows.pop(file_id, None) if file_id is not None else None
+        if previous:
+            self._alive[previous[0]:previous[1]] = False
+            self._dirty = True
+
+    def column(self, name: str) -> np.ndarray:
+        """Return the live values of one column."""
+        return self._columns[name][:self._size][self._alive[:self._size]]
+
+    def scores(self) -> np.ndarray:
+        """Return a 0-100 quality score per live function."""
+        penalty = np.zeros(len(self), dtype=np.int64)
+        for column, weight in ISSUE_PENALTIES.items():
+            penalty += weight * self.column(column)
+        return np.clip(100 - penalty, 0, 100)
+
+    def aggregates(self) -> Dict:
+        """Project-wide summary statistics for every metric."""
+        count = len(self)
+        summary = {
+            "functions": count,
+            "files": len(self._file_rows),
+            "issues": {
+                column: int(self.column(column).sum()) for column in ISSUE_PENALTIES
+            }
+        }
+        if not count:
+            return summary
+
+        for column in METRIC_COLUMNS:
+            values = self.column(column)
+            p50, p95 = np.percentile(values, [50, 95])
+            summary[column] = {
+                "mean": float(values.mean()),
+                "p50": float(p50),
+                "p95": float(p95),
+                "max": int(values.max())
+            }
+        summary["over_length"] = int((self.column("body_length") > self.config["MAX_FUNCTION_LINES"]).sum())
+        summary["over_nesting"] = int((self.column("nesting_depth") > self.config["MAX_NESTED_DEPTH"]).sum())
+        summary["mean_score"] = float(self.scores().mean())
+        return summary
+
+    def top_worst(self, n: int = 10) -> List[Dict]:
+        """Return the n lowest-scoring functions, longest first on ties."""
+        count = len(self)
+        if not count or n <= 0:
+            return []
+
+        scores = self.scores()
+        # Lower score is worse; body length breaks ties
+        badness = (100 - scores) * 1_000_000 + self.column("body_length")
+        n = min(n, count)
+        worst = np.argpartition(-badness, n - 1)[:n]
+        worst = worst[np.argsort(-badness[worst], kind="stable")]
+
+        file_ids, name_ids = self.column("file_id"), self.column("name_id")
+        starts, lengths = self.column("start_line"), self.column("body_length")
+        return [
+            {
+                "file": self.files[file_ids[i]],
+                "name": self.names[name_ids[i]],
+                "start_line": int(starts[i]),
+                "body_length": int(lengths[i]),
+                "score": int(scores[i])
+            }
+            for i in worst
+        ]
+
+    def score_distribution(self, bins: int = 10) -> Dict[str, List]:
+        """Histogram of function scores over 0-100."""
+        counts, edges = np.histogram(self.scores(), bins=bins, range=(0, 100))
+        return {"counts": counts.tolist(), "edges": edges.tolist()}
+
+    def save(self, store_file: Optional[Path] = None) -> None:
+        """Persist live rows and string tables to a compressed .npz file."""
+        target = Path(store_file or self.store_file)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            np.savez_compressed(
+                target,
+                files=np.array(self.files, dtype=str),
+                names=np.array(self.names, dtype=str),
+                **{column: self.column(column) for column in COLUMNS}
+            )
+            self._dirty = False
+        except OSError as e:
+            print(colored(f"Error saving function metrics: {e}", "yellow"))
+        self._last_save = time.monotonic()
+
+    def maybe_save(self, interval: float = METRICS_CHECKPOINT_SECONDS) -> bool:
+        """Save if anything changed and `interval` seconds passed since the last save."""
+        if not self._dirty or time.monotonic() - self._last_save < interval:
+            return False
+        self.save()
+        return True
+
+    @classmethod
+    def load(cls, store_file: Path = METRICS_STORE_FILE,
+             config: Optional[RuntimeConfig] = None) -> "FunctionMetricsStore":
+        """Load a store saved with `save`; returns an empty store if missing."""
+        store = cls(store_file, config)
+        if not Path(store_file).exists():
+            return store
+        try:
+            with np.load(store_file, allow_pickle=False) as data:
+                store.files = data["files"].tolist()
+                store.names = data["names"].tolist()
+                store._file_ids = {path: i for i, path in enumerate(store.files)}
+                store._name_ids = {name: i for i, name in enumerate(store.names)}
+                rows = len(data["file_id"])
+                store._reserve(rows)
+                for column in COLUMNS:
+                    store._columns[column][:rows] = data[column]
+            store._alive[:rows] = True
+            store._size = rows
+            store._rebuild_file_rows()
+        except (OSError, KeyError, ValueError) as e:
+            print(colored(f"Error loading function metrics: {e}", "yellow"))
+            return cls(store_file, config)
+        return store
+
+    @staticmethod
+    def _intern(value: str, table: List[str], ids: Dict[str, int]) -> int:
+        """Return the id of a string, adding it to the table if new."""
+        if value not in ids:
+            ids[value] = len(table)
+            table.append(value)
+        return ids[value]
+
+    @staticmethod
+    def _count_issues(function_metrics: List[Dict], issues: List[Dict]) -> Dict[str, List[int]]:
+        """Count issues per function by type, using the innermost enclosing span."""
+        counts = {column: [0] * len(function_metrics) for column in ISSUE_COLUMNS.values()}
+        for issue in issues:
+            line, column = issue.get("line"), ISSUE_COLUMNS.get(issue.get("type"))
+            if line is None or column is None:
+                continue
+            enclosing = [
+                i for i, m in enumerate(function_metrics)
+                if m["start_line"] <= line <= m["end_line"]
+            ]
+            if enclosing:
+                innermost = max(enclosing, key=lambda i: function_metrics[i]["start_line"])
+                counts[column][innermost] += 1
+        return counts
+
+    def _reserve(self, rows: int) -> None:
+        """Make room for more rows, compacting dead rows before growing."""
+        needed = self._size + rows
+        capacity = len(self._alive)
+        if needed <= capacity:
+            return
+        if self._size - len(self) > self._size // 2:
+            self._compact()
+            needed = self._size + rows
+        new_capacity = capacity
+        while new_capacity < needed:
+            new_capacity *= 2
+        if new_capacity == capacity:
+            return
+        for column in COLUMNS:
+            grown = np.zeros(new_capacity, dtype=np.int32)
+            grown[:self._size] = self._columns[column][:self._size]
+            self._columns[column] = grown
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._alive = alive
+
+    def _compact(self) -> None:
+        """Drop dead rows, keeping each file's rows contiguous."""
+        live = self._alive[:self._size]
+        rows = int(live.sum())
+        for column in COLUMNS:
+            self._columns[column][:rows] = self._columns[column][:self._size][live]
+        self._alive[:] = False
+        self._alive[:rows] = True
+        self._size = rows
+        self._rebuild_file_rows()
+
+    def _rebuild_file_rows(self) -> None:
+        """Recompute each file's contiguous row range."""
+        self._file_rows = {}
+        file_ids = self._columns["file_id"][:self._size]
+        if not self._size:
+            return
+        boundaries = np.flatnonzero(np.diff(file_ids)) + 1
+        starts = np.concatenate(([0], boundaries))
+        stops = np.concatenate((boundaries, [self._size]))
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            self._file_rows[int(file_ids[start])] = (start, stop)
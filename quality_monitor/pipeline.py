@@ -0,0 +1,322 @@
+"""End-to-end asyncio pipeline: watch -> check -> AI -> report.
+
+Each stage reads from a bounded asyncio.Queue, so a slow stage pushes
+back on the one before it instead of buffering without limit:
+
+* Watchdog events arrive on the observer thread and are bridged into the
+  loop; the bridge blocks that thread while the check queue is full.
+  Paths already waiting to be checked are coalesced. A path that no
+  longer exists is removed from the monitor instead. Files affected by a
+  check or removal (importers, earlier copies of duplicated code) are
+  queued for a re-check.
+* Checks are CPU-bound and run in a single-thread executor (QualityMonitor
+  state is not thread-safe), keeping the event loop responsive.
+* AI analysis runs in `ai_concurrency` workers, which caps the number of
+  requests in flight. A ModelRouter picks the model tier, results go
+  through the shared AnalysisCache, and an optional AIGate decides per
+  file whether the call is worth it.
+* AI issues stream to an optional `on_issue` callback as they arrive;
+  complete results fan out concurrently to async report sinks.
+
+End-to-end latency (event received -> all sinks done) and per-stage
+latency are recorded per event in streaming quantile sketches.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from termcolor import colored
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from .ai_cache import AnalysisCache
+from .context import MODE_FULL, AnalysisContext
+from .gating import AIGate
+from .quality_monitor import QualityMonitor
+from .quantiles import QuantileSketch
+from .routing import ModelRouter
+
+PIPELINE_QUEUE_SIZE = 100
+PIPELINE_AI_CONCURRENCY = 4
+
+STAGE_CHECK = "check"
+STAGE_AI = "ai"
+STAGE_REPORT = "report"
+PIPELINE_STAGES = (STAGE_CHECK, STAGE_AI, STAGE_REPORT)
+
+
+class PipelineEvent:
+    """One file change travelling through the pipeline."""
+
+    __slots__ = ("file_path", "received", "last_mark", "context", "issues",
+                 "ai_result", "ai_decision", "timings", "latency", "removed")
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.received = self.last_mark = time.perf_counter()
+        self.context: Optional[AnalysisContext] = None
+        self.issues: List[Dict] = []
+        self.ai_result: Optional[Dict] = None
+        self.ai_decision: Optional[Dict] = None
+        self.timings: Dict[str, float] = {}  # Stage -> seconds since received
+        self.latency: Optional[float] = None
+        self.removed = False  # The file was deleted or moved away
+
+
+ReportSink = Callable[[PipelineEvent], Awaitable[None]]
+
+
+async def console_sink(event: PipelineEvent) -> None:
+    """Print a one-line summary per checked file."""
+    elapsed = (time.perf_counter() - event.received) * 1000
+    if event.removed:
+        print(colored(f"{event.file_path}: removed ({elapsed:.0f} ms)", "cyan"))
+        return
+    summary = f"{event.file_path}: {len(event.issues)} issues"
+    if event.ai_result:
+        summary += f", AI score {event.ai_result.get('score')}"
+    color = "green" if not event.issues else "yellow"
+    print(colored(f"{summary} ({elapsed:.0f} ms)", color))
+
+
+class QualityPipeline:
+    """Async driver for checks, AI analysis and reporting."""
+
+    def __init__(self, monitor: Optional[QualityMonitor] = None, analyzer=None,
+                 sinks: Optional[Iterable[ReportSink]] = None,
+                 queue_size: int = PIPELINE_QUEUE_SIZE,
+                 ai_concurrency: int = PIPELINE_AI_CONCURRENCY,
+                 ai_cache: Optional[AnalysisCache] = None,
+                 gate: Optional[AIGate] = None,
+                 on_issue: Optional[Callable[[str, Dict], None]] = None):
+        self.monitor = monitor or QualityMonitor()
+        self.analyzer = analyzer  # AI stage is skipped without one
+        self.ai_cache = ai_cache or AnalysisCache()
+        self.gate = gate  # Without a gate every fully checked file goes to the AI
+        self.router = ModelRouter(cache=self.ai_cache)
+        self.on_issue = on_issue  # Called with (file, issue) as AI issues stream in
+        self.sinks: List[ReportSink] = list(sinks) if sinks is not None else [console_sink]
+        self.queue_size = queue_size
+        self.ai_concurrency = ai_concurrency
+        self.latency = QuantileSketch()
+        self.stage_latency = {stage: QuantileSketch() for stage in PIPELINE_STAGES}
+        self.stats = {"submitted": 0, "coalesced": 0, "completed": 0, "sink_errors": 0}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._pending: Set[str] = set()
+        self._requeues: Set[asyncio.Task] = set()  # Re-checks of affected files being queued
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Create the stage queues and workers on the running loop."""
+        if self._tasks:
+            return
+        self._queues = {stage: asyncio.Queue(self.queue_size) for stage in PIPELINE_STAGES}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quality-check")
+        workers = [self._check_worker(), self._report_worker()]
+        if self.analyzer is not None:
+            workers += [self._ai_worker() for _ in range(self.ai_concurrency)]
+        self._tasks = [asyncio.create_task(worker) for worker in workers]
+
+    async def submit(self, file_path: str) -> bool:
+        """Queue a file for checking; waits while the check queue is full.
+
+        Returns False if the file was already waiting to be checked.
+        """
+        key = str(file_path)
+        if key in self._pending:
+            self.stats["coalesced"] += 1
+            return False
+        self._pending.add(key)
+        self.stats["submitted"] += 1
+        await self._queues[STAGE_CHECK].put(PipelineEvent(key))
+        return True
+
+    async def drain(self) -> None:
+        """Wait until every submitted event has been reported."""
+        while True:
+            for stage in PIPELINE_STAGES:
+                await self._queues[stage].join()
+            if not self._requeues:
+                return
+            await asyncio.gather(*self._requeues)
+
+    async def stop(self) -> None:
+        """Finish queued work, shut the workers down and close the monitor."""
+        if not self._tasks:
+            return
+        await self.drain()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+        self._tasks, self._executor = [], None
+        self.monitor.close()
+
+    async def check_sources(self, sources: Iterable[Tuple[str, str]]) -> Dict[str, List[Dict]]:
+        """Check in-memory (virtual path, source) pairs as one batch.
+
+        Runs on the check executor, so the batch is serialized with checks
+        of watched files instead of racing them on the monitor's state.
+        """
+        sources = list(sources)
+        if self._executor is None:
+            return self.monitor.check_sources(sources)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.monitor.check_sources, sources
+        )
+
+    def watch(self, root: str, recursive: bool = True) -> Observer:
+        """Start a watchdog observer feeding this pipeline (call from the loop)."""
+        observer = Observer()
+        observer.schedule(WatchdogBridge(self, asyncio.get_running_loop()), root,
+                          recursive=recursive)
+        observer.start()
+        return observer
+
+    def metrics(self) -> Dict:
+        """Queue depths, counters and latency percentiles in milliseconds."""
+        latency = {
+            name: self.latency.quantile(q)
+            for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        }
+        latency["max"] = self.latency.max
+        return dict(
+            self.stats,
+            depths={stage: queue.qsize() for stage, queue in self._queues.items()},
+            latency_ms=latency,
+            stage_p95_ms={stage: sketch.quantile(0.95)
+                          for stage, sketch in self.stage_latency.items()}
+        )
+
+    async def _check_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queues[STAGE_CHECK]
+        while True:
+            event = await queue.get()
+            try:
+                # A change arriving from now on needs a fresh check
+                self._pending.discard(event.file_path)
+                self._requeue(await loop.run_in_executor(self._executor, self._check, event))
+                event.issues = self.monitor.issues.get(event.file_path, [])
+                self._mark(event, STAGE_CHECK)
+                wants_ai = (self.analyzer is not None and event.context is not None
+                            and event.context.mode == MODE_FULL)
+                if wants_ai and self.gate is not None:
+                    beliefs = self.monitor.learning_system.beliefs
+                    risk = beliefs.any_issue_rate(os.path.dirname(event.file_path)).mean
+                    event.ai_decision = self.gate.decide(event.issues, event.file_path, risk=risk)
+                    wants_ai = event.ai_decision["run"]
+                await self._queues[STAGE_AI if wants_ai else STAGE_REPORT].put(event)
+            finally:
+                queue.task_done()
+
+    async def _ai_worker(self) -> None:
+        queue = self._queues[STAGE_AI]
+        while True:
+            event = await queue.get()
+            try:
+                try:
+                    risk = event.ai_decision["risk"] if event.ai_decision else None
+                    stream = self._issue_forwarder(event.file_path) if self.on_issue else None
+                    event.ai_result = await self.router.analyze(
+                        self.analyzer, event.context.content, event.context, risk=risk,
+                        on_issue=stream
+                    )
+                except Exception as e:
+                    print(colored(f"AI analysis failed for {event.file_path}: {e}", "yellow"))
+                self._mark(event, STAGE_AI)
+                await self._queues[STAGE_REPORT].put(event)
+            finally:
+                queue.task_done()
+
+    async def _report_worker(self) -> None:
+        queue = self._queues[STAGE_REPORT]
+        while True:
+            event = await queue.get()
+            try:
+                results = await asyncio.gather(
+                    *(sink(event) for sink in self.sinks), return_exceptions=True
+                )
+                for sink, result in zip(self.sinks, results):
+                    if isinstance(result, Exception):
+                        self.stats["sink_errors"] += 1
+                        name = getattr(sink, "__name__", type(sink).__name__)
+                        print(colored(f"Report sink {name} failed: {result}", "yellow"))
+                self._mark(event, STAGE_REPORT)
+                event.latency = event.timings[STAGE_REPORT]
+                self.latency.add(event.latency * 1000)
+                self.stats["completed"] += 1
+            finally:
+                queue.task_done()
+
+    def _check(self, event: PipelineEvent) -> List[str]:
+        """Check or remove one file on the executor; returns the files to re-check."""
+        if os.path.exists(event.file_path):
+            event.context = self.monitor.check_file(event.file_path)
+        else:
+            self.monitor.remove_file(event.file_path)
+            event.removed = True
+        return self.monitor.take_dependents()
+
+    def _requeue(self, files: List[str]) -> None:
+        """Queue re-checks from separate tasks: the check worker frees the queue slots."""
+        for file_path in files:
+            task = asyncio.ensure_future(self.submit(file_path))
+            self._requeues.add(task)
+            task.add_done_callback(self._requeues.discard)
+
+    def _issue_forwarder(self, file_path: str) -> Callable[[Dict], None]:
+        """Forward streamed AI issues for one file to `on_issue`."""
+        def forward(issue: Dict) -> None:
+            try:
+                self.on_issue(file_path, issue)
+            except Exception as e:
+                print(colored(f"Issue callback failed for {file_path}: {e}", "yellow"))
+        return forward
+
+    def _mark(self, event: PipelineEvent, stage: str) -> None:
+        """Record when an event finished a stage."""
+        now = time.perf_counter()
+        event.timings[stage] = now - event.received
+        self.stage_latency[stage].add((now - event.last_mark) * 1000)
+        event.last_mark = now
+
+
+class WatchdogBridge(FileSystemEventHandler):
+    """Forwards watchdog events from the observer thread into the pipeline.
+
+    Submission blocks the observer thread while the check queue is full,
+    so back pressure reaches the watcher instead of growing a buffer.
+    """
+
+    def __init__(self, pipeline: QualityPipeline, loop: asyncio.AbstractEventLoop):
+        self.pipeline = pipeline
+        self.loop = loop
+
+    def on_modified(self, event):
+        if not event.is_directory and event.src_path.endswith('.py'):
+            self._forward(event.src_path)
+
+    on_created = on_deleted = on_modified
+
+    def on_moved(self, event):
+        # The check stage removes the old path and checks the new one
+        if not event.is_directory:
+            for path in (event.src_path, event.dest_path):
+                if path.endswith('.py'):
+                    self._forward(path)
+
+    def _forward(self, file_path: str) -> None:
+        try:
+            future = asyncio.run_coroutine_threadsafe(self.pipeline.submit(file_path), self.loop)
+            future.result()
+        except RuntimeError as e:
+            print(colored(f"Pipeline not accepting events: {e}", "yellow"))
@@ -0,0 +1,149 @@
+"""Speculative pre-analysis of files agents are about to edit.
+
+When an agent claims or opens a file, the prefetcher queues idle-priority
+warm-ups of the file, its import neighbours (from the import graph) and
+files that were often edited together with it. Co-edits are learned from
+the coordination log at startup and from live modification events. Two
+files count as co-edited when one agent edits both within
+`co_edit_window_seconds`. A pair counts at most once per window, so
+repeated saves do not inflate it. After every edit, the file's frequent
+co-edits are prefetched as well.
+
+Warm-ups run through QualityMonitor.prefetch: results, rule caches, the
+clone index and the import graph are brought up to date without learning.
+The first real check then only pays for what the edit actually changed.
+Idle jobs run only when no other work is queued.
+"""
+
+import json
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+from termcolor import colored
+
+from config.quality_standards import PREFETCH
+
+from .coordination import STATUS_IN_PROGRESS, TOPIC_FILE, TOPIC_STATUS, CoordinationBus
+from .scheduler import PRIORITY_IDLE, CheckScheduler
+
+ACTION_OPENED = "opened"      # Published by agents that start reading a file
+ACTION_MODIFIED = "modified"  # Published by the watcher for every save
+PREFETCH_AGENT = "prefetch"
+
+
+def event_time(event: Dict) -> float:
+    """Epoch seconds of a bus event."""
+    return datetime.fromisoformat(event["timestamp"]).timestamp()
+
+
+class CoEditIndex:
+    """Files that the same agent tends to edit together."""
+
+    def __init__(self, limits: Optional[Dict] = None):
+        self.limits = dict(PREFETCH, **(limits or {}))
+        self.pairs: Dict[str, Dict[str, List[float]]] = {}  # file -> other -> [count, last paired]
+        self._recent: Dict[str, Deque[Tuple[float, str]]] = {}
+
+    def observe(self, agent: str, file_path: str, when: float) -> None:
+        """Record an edit and pair it with the agent's recent edits."""
+        recent = self._recent.setdefault(agent, deque(maxlen=self.limits['co_edit_recent']))
+        window = self.limits['co_edit_window_seconds']
+        for edited, other in recent:
+            if other != file_path and when - edited <= window:
+                self._pair(file_path, other, when, window)
+        recent.append((when, file_path))
+
+    def related(self, file_path: str, n: Optional[int] = None) -> List[str]:
+        """Most frequent co-edits of a file, at least `co_edit_min_count` times."""
+        n = self.limits['max_co_edits'] if n is None else n
+        frequent = [(count, other) for other, (count, _) in self.pairs.get(file_path, {}).items()
+                    if count >= self.limits['co_edit_min_count']]
+        return [other for _, other in sorted(frequent, key=lambda item: -item[0])[:n]]
+
+    def learn_log(self, log_file: Path) -> int:
+        """Replay modification events from a coordination log; returns the count."""
+        count = 0
+        try:
+            with open(log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Partially written line from a crashed writer
+                    if (event.get("topic") == TOPIC_FILE and event.get("action") == ACTION_MODIFIED
+                            and event.get("file")):
+                        self.observe(event["agent"], event["file"], event_time(event))
+                        count += 1
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            print(colored(f"Error learning co-edits from {log_file}: {e}", "yellow"))
+        return count
+
+    def _pair(self, a: str, b: str, when: float, window: float) -> None:
+        entry = self.pairs.setdefault(a, {}).setdefault(b, [0, float("-inf")])
+        if when - entry[1] <= window:
+            return  # Same editing session
+        entry[0] += 1
+        entry[1] = when
+        self.pairs.setdefault(b, {})[a] = entry  # Shared: the relation is symmetric
+
+
+class Prefetcher:
+    """Queues idle-priority warm-ups ahead of an agent's first save."""
+
+    def __init__(self, monitor, scheduler: CheckScheduler,
+                 bus: Optional[CoordinationBus] = None,
+                 co_edits: Optional[CoEditIndex] = None,
+                 limits: Optional[Dict] = None):
+        self.monitor = monitor
+        self.scheduler = scheduler
+        self.limits = dict(PREFETCH, **(limits or {}))
+        self.co_edits = co_edits or CoEditIndex(self.limits)
+        self.bus = bus
+        self.stats = {"triggers": 0, "queued": 0}
+        if bus:
+            if bus.log_file:
+                self.co_edits.learn_log(bus.log_file)
+            bus.subscribe(TOPIC_STATUS, self._on_status)
+            bus.subscribe(TOPIC_FILE, self._on_file)
+
+    def candidates(self, file_path: str, include_self: bool = True,
+                   include_imports: bool = True) -> List[str]:
+        """Files worth warming for an agent about to work on `file_path`."""
+        file_path = str(file_path)
+        found: Dict[str, None] = {file_path: None} if include_self else {}
+        if include_imports:
+            graph = self.monitor.import_graph
+            neighbours = graph.dependencies(file_path) + graph.dependents(file_path)
+            found.update(dict.fromkeys(neighbours[:self.limits['max_import_neighbours']]))
+        found.update(dict.fromkeys(self.co_edits.related(file_path)))
+        return [path for path in found if path.endswith('.py') and Path(path).exists()]
+
+    def prefetch(self, file_path: str, include_self: bool = True,
+                 include_imports: bool = True) -> int:
+        """Queue warm-ups for a file's neighbourhood; returns the number queued."""
+        self.stats["triggers"] += 1
+        queued = 0
+        for path in self.candidates(file_path, include_self, include_imports):
+            self.scheduler.submit(path, PRIORITY_IDLE, PREFETCH_AGENT)
+            queued += 1
+        self.stats["queued"] += queued
+        return queued
+
+    def _on_status(self, event: Dict) -> None:
+        if event["data"].get("status") == STATUS_IN_PROGRESS and event["file"]:
+            self.prefetch(event["file"])
+
+    def _on_file(self, event: Dict) -> None:
+        if not event["file"]:
+            return
+        if event["action"] == ACTION_OPENED:
+            self.prefetch(event["file"])
+        elif event["action"] == ACTION_MODIFIED:
+            agent = (self.bus.claimed_by(event["file"]) if self.bus else None) or event["agent"]
+            self.co_edits.observe(agent, event["file"], event_time(event))
+            # The saved file is checked right away; warm what usually follows it
+            self.prefetch(event["file"], include_self=False, include_imports=False)
@@ -1,49 +1,101 @@
 """Quality monitoring core module."""
 
 import ast
-from typing import Dict, List, Optional
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
 from termcolor import colored
 from pathlib import Path
 import json
 from datetime import datetime
 
 from config.quality_standards import (
-    MAX_FUNCTION_LINES,
-    MAX_NESTED_DEPTH,
-    MAX_LINE_LENGTH,
-    MIN_COMMENT_RATIO,
-    MIN_DOCSTRING_WORDS,
     REQUIRED_SECTIONS,
-    LEARNING_THRESHOLDS
+    LEARNING_THRESHOLDS,
+    ADAPTIVE_PERCENTILES
 )
-from .checkers import StyleChecker, DocumentationChecker, ComplexityChecker
+from .checkers import (
+    StyleChecker,
+    DocumentationChecker,
+    ComplexityChecker,
+    TokenChecker,
+    LineChecker,
+    collect_function_metrics
+)
+from .baseline import IssueBaseline
+from .bayesian import BayesianQualityModel, new_posterior_state
+from .clones import CloneIndex
+from .context import MODE_FULL, MODE_LINES, MODE_SKIP, AnalysisContext
+from .coordination import CoordinationBus
+from .history_store import CheckHistoryStore
+from .import_graph import ImportGraph
+from .ingestion import ingest_file, ingest_source
+from .learning_sync import LearningSync
+from .registry import CheckerRegistry
+from .metrics_store import FunctionMetricsStore
+from .quantiles import QuantileSketch
+from .runtime_config import RUNTIME_CONFIG, RuntimeConfig
+
+REPORT_WORST_FUNCTIONS = 5
+PREDICTION_MIN_COUNT = 3  # Issue occurrences before it is predicted
+
+# Runtime settings holding the thresholds that adapt to project percentiles
+ADAPTIVE_SETTINGS = {
+    'max_function_lines': 'MAX_FUNCTION_LINES',
+    'max_nested_depth': 'MAX_NESTED_DEPTH',
+    'min_docstring_words': 'MIN_DOCSTRING_WORDS'
+}
+
+def syntax_issue(error: SyntaxError) -> Dict:
+    """CRITICAL issue for source that does not parse."""
+    return {
+        "type": "CRITICAL",
+        "category": "Syntax",
+        "message": f"Syntax error: {error.msg} (line {error.lineno})",
+        "suggestion": "Fix the syntax error; earlier results are shown as stale",
+        "line": error.lineno
+    }
 
 class LearningSystem:
     """Learns from code quality patterns."""
     
-    def __init__(self):
+    def __init__(self, config: Optional[RuntimeConfig] = None):
+        self.config = config or RUNTIME_CONFIG
         self.history_file = Path("monitor_data/learning_history.json")
         self.history_file.parent.mkdir(exist_ok=True)
         self.patterns = {
             "successful_patterns": {},
             "issue_patterns": {},
             "effectiveness": {},
-            "threshold_adjustments": {}
+            "threshold_adjustments": {},
+            "posteriors": new_posterior_state()
         }
+        self.beliefs = BayesianQualityModel(
+            self.patterns["posteriors"], self.patterns["issue_patterns"]
+        )
+        self.metric_sketches = {
+            metric: QuantileSketch() for metric, _ in ADAPTIVE_PERCENTILES.values()
+        }
+        self.history = CheckHistoryStore()  # Indexed view of patterns["effectiveness"]
         print(colored("Learning System initialized", "green"))
     
-    def learn_from_file(self, file_path: str, issues: List[Dict], stats: Dict) -> None:
-        """Learn from file analysis results."""
+    def learn_from_file(self, file_path: str, issues: List[Dict], stats: Dict,
+                        function_metrics: Optional[List[Dict]] = None,
+                        context: Optional[AnalysisContext] = None) -> None:
+        """Learn from file analysis results (reads the file if no context is given)."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if context is None:
+                context = ingest_file(file_path)
+            
+            if function_metrics:
+                self._update_metric_sketches(function_metrics)
             
             # Learn from successful patterns if few issues
             if len(issues) <= LEARNING_THRESHOLDS['max_issues_to_learn']:
-                self._update_successful_patterns(content)
+                self._update_successful_patterns(context.lines)
             
             # Learn from issues found
             self._update_issue_patterns(issues)
+            self.beliefs.observe_file(file_path, issues)
             
             # Track effectiveness
             self._update_effectiveness(file_path, issues, stats)
@@ -51,11 +103,10 @@ class LearningSystem:
         except Exception as e:
             print(colored(f"Learning error: {str(e)}", "yellow"))
     
-    def _update_successful_patterns(self, content: str) -> None:
+    def _update_successful_patterns(self, lines: List[str]) -> None:
         """Update patterns from successful code."""
         try:
             # Extract meaningful code patterns
-            lines = content.split('\n')
             for i in range(len(lines) - 1):  # Look at pairs of lines
                 pattern = lines[i].strip()
                 next_pattern = lines[i + 1].strip()
@@ -74,13 +125,22 @@ class LearningSystem:
         except Exception as e:
             print(colored(f"Error updating patterns: {e}", "yellow"))
     
+    def _update_metric_sketches(self, function_metrics: List[Dict]) -> None:
+        """Feed per-function metrics into the streaming percentile sketches."""
+        try:
+            for metrics in function_metrics:
+                for metric, sketch in self.metric_sketches.items():
+                    # Docstring length percentiles only describe documented code
+                    if metric == "docstring_words" and not metrics[metric]:
+                        continue
+                    sketch.add(metrics[metric])
+        except Exception as e:
+            print(colored(f"Error updating metric sketches: {e}", "yellow"))
+    
     def _update_issue_patterns(self, issues: List[Dict]) -> None:
         """Update patterns from issues found."""
         try:
-            for issue in issues:
-                key = f"{issue['type']}:{issue['category']}"
-                self.patterns["issue_patterns"][key] = \
-                    self.patterns["issue_patterns"].get(key, 0) + 1
+            self.beliefs.observe_issues(issues)
                     
         except Exception as e:
             print(colored(f"Error updating issues: {e}", "yellow"))
@@ -91,46 +151,45 @@ class LearningSystem:
             if file_path not in self.patterns["effectiveness"]:
                 self.patterns["effectiveness"][file_path] = []
             
+            now = datetime.now()
             result = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "issues_found": len(issues),
                 "stats": stats,
                 "learning_confidence": self._calculate_learning_confidence()
             }
             
             self.patterns["effectiveness"][file_path].append(result)
+            self.history.record(file_path, now, len(issues), stats.get("lines", 0))
             
         except Exception as e:
             print(colored(f"Error updating effectiveness: {e}", "yellow"))
     
     def _calculate_learning_confidence(self) -> float:
-        """Calculate current confidence in learning system."""
+        """Calculate current confidence in learning system.
+        
+        One minus the average width of the credible intervals around the
+        current beliefs: 0 with no evidence, approaching 1 as beliefs settle.
+        """
         try:
-            pattern_count = len(self.patterns["successful_patterns"])
-            issue_count = len(self.patterns["issue_patterns"])
-            
-            if pattern_count + issue_count == 0:
-                return 0.0
-            
-            return pattern_count / (pattern_count + issue_count)
+            return self.beliefs.confidence()
             
         except Exception as e:
             print(colored(f"Error calculating confidence: {e}", "yellow"))
             return 0.0
     
-    def _predict_potential_issues(self, code: str) -> List[Dict]:
-        """Predict potential issues based on learning history."""
+    def _predict_potential_issues(self, code: str, file_path: Optional[str] = None) -> List[Dict]:
+        """Predict potential issues from cached posterior beliefs.
+        
+        With a file path, beliefs for its directory are used once the
+        directory has enough history.
+        """
         try:
-            predictions = []
-            for pattern, count in self.patterns["issue_patterns"].items():
-                if count >= 3:  # Pattern occurs frequently
-                    issue_type, message = pattern.split(':', 1)
-                    predictions.append({
-                        "type": issue_type,
-                        "message": message,
-                        "confidence": count / max(len(self.patterns["issue_patterns"]), 1)
-                    })
-            return sorted(predictions, key=lambda x: x["confidence"], reverse=True)
+            directory = str(Path(file_path).parent) if file_path else None
+            return [
+                prediction for prediction in self.beliefs.predictions(directory)
+                if prediction["count"] >= PREDICTION_MIN_COUNT  # Pattern occurs frequently
+            ]
         except Exception as e:
             print(colored(f"Error predicting issues: {e}", "yellow"))
             return []
@@ -144,68 +203,339 @@ class LearningSystem:
         """Adapt quality thresholds based on learning."""
         try:
             confidence = self._calculate_learning_confidence()
+            max_line_length = self.config["MAX_LINE_LENGTH"]
+            adjustments = [
+                {
+                    "confidence": confidence,
+                    "threshold": "max_line_length",
+                    "current": max_line_length,
+                    "suggested": max_line_length + (5 if confidence > 0.8 else 0)
+                }
+            ]
+            for threshold, (metric, percentile) in ADAPTIVE_PERCENTILES.items():
+                adjustments.append(self._percentile_adjustment(threshold, metric, percentile))
+            
             self.patterns["threshold_adjustments"] = {
-                "adjustments": [  # List of adjustment objects
-                    {
-                        "confidence": confidence,
-                        "threshold": "max_line_length",
-                        "current": MAX_LINE_LENGTH,
-                        "suggested": MAX_LINE_LENGTH + (5 if confidence > 0.8 else 0)
-                    },
-                    {
-                        "confidence": confidence,
-                        "threshold": "min_docstring_words",
-                        "current": MIN_DOCSTRING_WORDS,
-                        "suggested": MIN_DOCSTRING_WORDS - (2 if confidence > 0.9 else 0)
-                    }
-                ]
+                "adjustments": adjustments  # List of adjustment objects
             }
         except Exception as e:
             print(colored(f"Error adapting thresholds: {e}", "yellow"))
+    
+    def _percentile_adjustment(self, threshold: str, metric: str, percentile: float) -> Dict:
+        """Propose a threshold from an observed project percentile."""
+        sketch = self.metric_sketches[metric]
+        min_samples = LEARNING_THRESHOLDS['min_metric_samples']
+        current = self.config[ADAPTIVE_SETTINGS[threshold]]
+        observed = sketch.quantile(percentile)
+        
+        # Too few samples: keep the configured value
+        suggested = current
+        if observed is not None and sketch.count >= min_samples:
+            suggested = max(int(round(observed)), 1)
+        
+        return {
+            "confidence": sketch.count / (sketch.count + min_samples),
+            "threshold": threshold,
+            "current": current,
+            "suggested": suggested,
+            "percentile": percentile,
+            "samples": sketch.count
+        }
 
 class QualityMonitor:
     """Main quality monitoring class."""
     
-    def __init__(self):
-        self.learning_system = LearningSystem()
-        self.checkers = [
-            StyleChecker(),
-            DocumentationChecker(),
-            ComplexityChecker()
-        ]
+    def __init__(self, bus: Optional[CoordinationBus] = None,
+                 sync_dir: Optional[Path] = None,
+                 baseline: Optional[IssueBaseline] = None,
+                 config: Optional[RuntimeConfig] = None,
+                 metrics_file: Optional[Path] = None):
+        self.config = config or RUNTIME_CONFIG
+        self.config.maybe_reload()
+        self.learning_system = LearningSystem(self.config)
+        # Learning shared with other monitor processes through sync_dir
+        self.learning_sync = LearningSync(self.learning_system, sync_dir) if sync_dir else None
+        # Function metrics outlive the process when persisted to metrics_file
+        self.metrics_file = Path(metrics_file) if metrics_file else None
+        self.metrics_store = (FunctionMetricsStore.load(self.metrics_file, self.config)
+                              if self.metrics_file else FunctionMetricsStore(config=self.config))
+        self.bus = bus
+        self.token_checker = TokenChecker()
+        self.line_checker = LineChecker(self.config)
+        self.clone_index = CloneIndex()
+        self.import_graph = ImportGraph()
+        self.registry = CheckerRegistry()
+        for checker in (StyleChecker(self.config), DocumentationChecker(self.config),
+                        ComplexityChecker(self.config), self.clone_index, self.import_graph):
+            self.registry.register(checker)
         self.issues: Dict[str, List[Dict]] = {}
+        self.baseline = baseline  # Accepted issues; only others count as new
+        self.new_issues: Dict[str, List[Dict]] = {}
+        self.skipped: Dict[str, str] = {}
+        self._last_good: Dict[str, List[Dict]] = {}
+        self._failed_parses: Dict[str, Dict] = {}
+        self._signatures: Dict[str, tuple] = {}  # Stat signature of each file's current results
         print(colored("Quality Monitor initialized", "green"))
     
-    def check_file(self, file_path: str) -> None:
-        """Run quality checks on a file."""
+    @property
+    def checkers(self) -> List:
+        """Registered full-analysis checkers, cheapest first."""
+        return self.registry.checkers()
+    
+    def check_file(self, file_path: str) -> Optional[AnalysisContext]:
+        """Run quality checks on a file.
+        
+        Returns the file's AnalysisContext if it was checked in full or
+        line-only mode, or None if it was skipped or could not be parsed.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            tree = ast.parse(content)
-            all_issues = []
-            
-            # Run checks
-            for checker in self.checkers:
-                issues = checker.check(content, tree)
-                all_issues.extend(issues)
+            key = str(file_path)
+            failed = self._failed_parses.get(key)
+            signature = self._stat_signature(file_path)
+            if failed and failed["signature"] == signature:
+                return  # Still the same broken file
             
-            # Store results
-            self.issues[str(file_path)] = all_issues
-            
-            # Learn from results
-            stats = self._gather_statistics(content, tree)
-            self.learning_system.learn_from_file(file_path, all_issues, stats)
+            # Read once; every consumer below shares the derived views
+            context = self._check_context(key, ingest_file(file_path), signature)
+            self._signatures[key] = signature
+            return context
             
         except Exception as e:
             print(colored(f"Error checking {file_path}: {e}", "red"))
+            return None
+    
+    def remove_file(self, file_path: str) -> None:
+        """Drop a deleted or moved-away file from every result and index.
+        
+        Modules that imported it are queued for `take_dependents`.
+        """
+        key = str(file_path)
+        self.skipped.pop(key, None)
+        self._forget_file(key)
+        if self.bus:
+            self.bus.publish_quality(key, [])
+    
+    def prefetch(self, file_path: str) -> bool:
+        """Warm results, rule caches and indexes for a file before it is edited.
+        
+        Nothing is learned: a file is not evidence until it is checked for
+        real. Returns False if the file was already warm or could not be read.
+        """
+        try:
+            key = str(file_path)
+            signature = self._stat_signature(file_path)
+            failed = self._failed_parses.get(key)
+            if self._signatures.get(key) == signature or (failed and failed["signature"] == signature):
+                return False
+            self._check_context(key, ingest_file(file_path), signature, learn=False)
+            self._signatures[key] = signature
+            return True
+        except Exception as e:
+            print(colored(f"Error prefetching {file_path}: {e}", "yellow"))
+            return False
+    
+    def check_source(self, path: str, source: str) -> Optional[AnalysisContext]:
+        """Run quality checks on in-memory source text under a virtual path.
+        
+        Results, caches and learning are shared with check_file; nothing is
+        read from or written to disk.
+        """
+        try:
+            self._signatures.pop(str(path), None)  # Results no longer match the file on disk
+            return self._check_context(str(path), ingest_source(path, source))
+        except Exception as e:
+            print(colored(f"Error checking {path}: {e}", "red"))
+            return None
+    
+    def check_sources(self, sources: Iterable[Tuple[str, str]]) -> Dict[str, List[Dict]]:
+        """Check a batch of (virtual path, source text) pairs.
+        
+        Every module in the batch is indexed in the import graph and the
+        clone index before any is checked, so imports between them resolve
+        and duplicates are reported on both copies regardless of order.
+        Returns each path's issues; a path given twice keeps its last source.
+        """
+        contexts: Dict[str, AnalysisContext] = {}
+        for path, source in sources:
+            try:
+                contexts[str(path)] = ingest_source(path, source)
+            except Exception as e:
+                print(colored(f"Error reading source for {path}: {e}", "red"))
+        
+        for key, context in contexts.items():
+            if context.mode == MODE_FULL:
+                try:
+                    self.import_graph.update_file(key, context.tree)
+                    self.clone_index.update_file(key, context.content, context.tree, context.tokens)
+                except SyntaxError:
+                    pass  # Reported when the file is checked
+        
+        results = {}
+        for key, context in contexts.items():
+            try:
+                self._check_context(key, context)
+            except Exception as e:
+                print(colored(f"Error checking {key}: {e}", "red"))
+            results[key] = self.issues.get(key, [])
+        # Checked with the whole batch in view
+        self.import_graph.discard_pending(contexts)
+        self.clone_index.discard_pending(contexts)
+        return results
+    
+    def _check_context(self, key: str, context: AnalysisContext,
+                       signature: Optional[tuple] = None,
+                       learn: bool = True) -> Optional[AnalysisContext]:
+        """Check, store and (unless `learn` is False) learn from one ingested source."""
+        failed = self._failed_parses.get(key)
+        if context.mode == MODE_SKIP:
+            self._skip_file(key, context)
+            return
+        self.skipped.pop(key, None)
+        if failed and failed["hash"] == context.content_hash:
+            failed["signature"] = signature  # Touched, not changed
+            return
+        if context.mode == MODE_LINES:
+            self._check_lines_only(key, context)
+            return context
+        
+        try:
+            context.tree  # Parse now so syntax errors are handled here
+        except SyntaxError as e:
+            self._handle_syntax_error(key, context, e, signature)
+            return
+        self._failed_parses.pop(key, None)
+        
+        # Run checks, cheapest first; unchanged rules reuse cached results
+        all_issues = self.registry.run(context, key=key)
+        function_metrics = self._store_results(key, context, all_issues)
+        if not learn:
+            return context
+        
+        # Learn from results
+        stats = self._gather_statistics(context)
+        self.learning_system.learn_from_file(
+            key, all_issues, stats, function_metrics, context
+        )
+        if self.learning_sync:
+            self.learning_sync.maybe_sync()
+        return context
+    
+    def close(self) -> None:
+        """Save state that should survive a restart."""
+        if self.metrics_file:
+            self.metrics_store.save()
+    
+    def take_dependents(self) -> List[str]:
+        """Files to re-check because a module they import or code they duplicate changed."""
+        pending = dict.fromkeys(self.import_graph.take_pending() + self.clone_index.take_pending())
+        return [key for key in pending if os.path.exists(key)]
+    
+    def reload_config(self) -> List[str]:
+        """Apply changed settings without a restart.
+        
+        Only rules that read a changed setting run again; every other
+        cached result is kept. Learning is not repeated. Returns the files
+        whose results were refreshed.
+        """
+        changed = self.config.maybe_reload()
+        if not changed:
+            return []
+        affected = self.registry.invalidate(changed)
+        line_rules = changed & set(self.line_checker.settings)
+        refreshed = []
+        for key in list(self.issues):
+            if key in self._failed_parses or not os.path.exists(key):
+                continue
+            full = key in self._last_good
+            if (full and not affected) or (not full and not line_rules):
+                continue
+            try:
+                context = ingest_file(key)
+                if context.mode == MODE_LINES:
+                    self._check_lines_only(key, context)
+                elif context.mode != MODE_SKIP:
+                    self._store_results(key, context, self.registry.run(context, key=key))
+                refreshed.append(key)
+            except Exception as e:  # Broken since its last check; the next edit reports it
+                print(colored(f"Error refreshing {key}: {e}", "yellow"))
+        print(colored(f"Refreshed {len(refreshed)} files after a configuration change", "cyan"))
+        return refreshed
+    
+    def _store_results(self, key: str, context: AnalysisContext,
+                       issues: List[Dict]) -> List[Dict]:
+        """Record a full check's issues; returns the file's function metrics."""
+        self.issues[key] = issues
+        self._last_good[key] = issues
+        if self.baseline is not None:
+            self.new_issues[key] = self.baseline.new_issues(key, issues, context)
+        if self.bus:
+            self.bus.publish_quality(key, issues)
+        
+        function_metrics = collect_function_metrics(context.tree)
+        self.metrics_store.update_file(key, function_metrics, issues)
+        if self.metrics_file:
+            self.metrics_store.maybe_save()
+        return function_metrics
+    
+    def _handle_syntax_error(self, key: str, context: AnalysisContext, error: SyntaxError,
+                             signature: Optional[tuple]) -> None:
+        """Serve last good results plus token-level checks for a broken file."""
+        self._failed_parses[key] = {"signature": signature, "hash": context.content_hash}
+        
+        error_issue = syntax_issue(error)
+        issues = [dict(issue, stale=True) for issue in self._last_good.get(key, [])]
+        issues.append(error_issue)
+        issues.extend(self.token_checker.check(context))
+        
+        self.issues[key] = issues
+        if self.baseline is not None:
+            # Without a tree, other issues cannot be fingerprinted as in a full check
+            self.new_issues[key] = self.baseline.new_issues(key, [error_issue], context)
+        if self.bus:
+            self.bus.publish_quality(key, issues)
+        print(colored(f"Syntax error in {key} (line {error.lineno}), "
+                      f"skipping until it changes", "yellow"))
+    
+    def _skip_file(self, key: str, context: AnalysisContext) -> None:
+        """Drop results for a generated, vendored or oversized file."""
+        if key not in self.skipped:
+            print(colored(f"Skipping {key}: {context.note}", "cyan"))
+        self.skipped[key] = context.note
+        self._forget_file(key)
+    
+    def _check_lines_only(self, key: str, context: AnalysisContext) -> None:
+        """Degraded mode for files too large for AST-based checks."""
+        self._forget_file(key)
+        issues = self.line_checker.check(context)
+        self.issues[key] = issues
+        if self.bus:
+            self.bus.publish_quality(key, issues)
+    
+    def _forget_file(self, key: str) -> None:
+        """Remove a file from every per-file index."""
+        self.issues.pop(key, None)
+        self.new_issues.pop(key, None)
+        self._last_good.pop(key, None)
+        self._failed_parses.pop(key, None)
+        self._signatures.pop(key, None)
+        self.clone_index.remove_file(key)
+        self.import_graph.remove_file(key)
+        self.registry.forget(key)
+        self.metrics_store.remove_file(key)
+    
+    @staticmethod
+    def _stat_signature(file_path: str) -> tuple:
+        """Cheap change detector: modification time and size."""
+        stat = os.stat(file_path)
+        return (stat.st_mtime_ns, stat.st_size)
             
-    def _gather_statistics(self, content: str, tree: ast.AST) -> Dict:
+    def _gather_statistics(self, context: AnalysisContext) -> Dict:
         """Gather code statistics."""
+        nodes = list(ast.walk(context.tree))
         return {
-            "lines": len(content.split('\n')),
-            "functions": len([n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)]),
-            "classes": len([n for n in ast.walk(tree) if isinstance(n, ast.ClassDef)])
+            "lines": len(context.lines),
+            "functions": len([n for n in nodes if isinstance(n, ast.FunctionDef)]),
+            "classes": len([n for n in nodes if isinstance(n, ast.ClassDef)])
         }
     
     def generate_report(self) -> str:
@@ -219,11 +549,31 @@ class QualityMonitor:
                 report.append("✅ No issues found")
             else:
                 for issue in file_issues:
+                    stale = " (stale)" if issue.get("stale") else ""
                     report.append(
-                        f"⚠️  {issue['type']}: {issue['message']}\n"
+                        f"⚠️  {issue['type']}: {issue['message']}{stale}\n"
                         f"   Suggestion: {issue['suggestion']}"
                     )
         
+        if self.baseline is not None:
+            new = sum(len(issues) for issues in self.new_issues.values())
+            report.append(f"\nNew Issues (not in baseline): {new}")
+        
+        if self.skipped:
+            report.append(f"\nSkipped Files ({len(self.skipped)}):")
+            for file_path, reason in self.skipped.items():
+                report.append(f"  {file_path}: {reason}")
+        
+        # Highlight the weakest functions project-wide
+        worst = [f for f in self.metrics_store.top_worst(REPORT_WORST_FUNCTIONS) if f["score"] < 100]
+        if worst:
+            report.append("\nWorst Functions:")
+            for func in worst:
+                report.append(
+                    f"  {func['score']:3d}  {func['name']} "
+                    f"({func['file']}:{func['start_line']})"
+                )
+        
         # Add learning insights
         confidence = self.learning_system._calculate_learning_confidence()
         report.append(f"\nLearning Confidence: {confidence:.2f}")
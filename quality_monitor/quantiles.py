@@ -0,0 +1,94 @@
+"""Streaming quantile estimation for code metrics.
+
+Uses a log-bucketed sketch (in the style of DDSketch): each observation
+increments one bucket, so updates are O(1), memory grows only with the
+logarithm of the value range, and any quantile is answered within a fixed
+relative error. Two sketches combine by adding bucket counts.
+"""
+
+import math
+from typing import Dict, Optional
+
+# Relative accuracy of quantile estimates (2% keeps small integers exact)
+DEFAULT_RELATIVE_ACCURACY = 0.02
+
+
+class QuantileSketch:
+    """Compact streaming estimator for quantiles of non-negative values."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """Record an observation in constant time."""
+        if value < 0:
+            raise ValueError("QuantileSketch only accepts non-negative values")
+        if value == 0:
+            self.zero_count += weight
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + weight
+        self.count += weight
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1), or None if empty."""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                estimate = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add another sketch's observations into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        for bound in (other.min, other.max):
+            if bound is not None:
+                self.min = bound if self.min is None else min(self.min, bound)
+                self.max = bound if self.max is None else max(self.max, bound)
+
+    def to_dict(self) -> Dict:
+        """Serialize to a compact JSON-friendly dict."""
+        return {
+            "accuracy": self.relative_accuracy,
+            "zero": self.zero_count,
+            "buckets": sorted(self.buckets.items()),
+            "min": self.min,
+            "max": self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QuantileSketch":
+        """Rebuild a sketch from `to_dict` output."""
+        sketch = cls(data["accuracy"])
+        sketch.zero_count = data["zero"]
+        sketch.buckets = {int(index): count for index, count in data["buckets"]}
+        sketch.count = sketch.zero_count + sum(sketch.buckets.values())
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        return sketch
@@ -0,0 +1,117 @@
+"""Checker registry ordered by declared cost.
+
+Each checker declares a relative `cost` (a class attribute, or one given
+at registration). The registry runs checkers cheapest first, can stop at
+a cost ceiling, and tracks measured run time so declared costs can be
+checked against reality.
+
+Checkers that declare the runtime settings they read (a `settings`
+attribute, see quality_monitor.runtime_config) depend only on the file's
+content and those settings. When `run` is given a file key, their results
+are cached per file and reused while the content hash and the versions of
+their settings are unchanged. Checkers without `settings`, such as the
+project-wide clone index, always run.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional
+
+from termcolor import colored
+
+# Relative checker costs (rough work per file, AST walk = 1)
+COST_LINES = 1        # Single pass over lines
+COST_AST = 1          # Single walk of a parsed tree
+COST_TOKENS = 2       # Needs the full token stream
+COST_INDEX = 10       # Queries and updates a project-wide index
+COST_AI = 1000        # Network round trip to a language model
+
+
+class CheckerRegistry:
+    """Runs registered checkers in ascending cost order."""
+
+    def __init__(self):
+        self._entries: List[Dict] = []
+        self.timings: Dict[str, Dict] = {}
+        # file key -> checker name -> (content hash, settings stamp, issues)
+        self._results: Dict[str, Dict[str, tuple]] = {}
+        self.cache_stats = {"hits": 0, "misses": 0}
+
+    def register(self, checker, cost: Optional[int] = None, name: Optional[str] = None) -> None:
+        """Add a checker; `cost` defaults to the checker's declared cost."""
+        cost = cost if cost is not None else getattr(checker, "cost", COST_AST)
+        name = name or type(checker).__name__
+        self._entries.append({"name": name, "cost": cost, "checker": checker})
+        self._entries.sort(key=lambda entry: entry["cost"])  # Stable for equal costs
+        self.timings.setdefault(name, {"runs": 0, "seconds": 0.0})
+
+    def checkers(self, max_cost: Optional[int] = None) -> List:
+        """Registered checkers, cheapest first."""
+        return [entry["checker"] for entry in self._entries
+                if max_cost is None or entry["cost"] <= max_cost]
+
+    def run(self, context, max_cost: Optional[int] = None,
+            key: Optional[str] = None) -> List[Dict]:
+        """Run every checker up to `max_cost` on an AnalysisContext.
+        
+        With a file `key`, cached results of configured checkers are reused.
+        """
+        issues = []
+        for entry in self._entries:
+            if max_cost is not None and entry["cost"] > max_cost:
+                break
+            cached = self._cached(key, entry, context)
+            if cached is not None:
+                issues.extend(cached)
+                continue
+            started = time.perf_counter()
+            try:
+                found = entry["checker"].check(context)
+                self._store(key, entry, context, found)
+                issues.extend(found)
+            except SyntaxError:
+                raise  # Callers handle unparseable code
+            except Exception as e:
+                print(colored(f"Checker {entry['name']} failed: {e}", "yellow"))
+            timing = self.timings[entry["name"]]
+            timing["runs"] += 1
+            timing["seconds"] += time.perf_counter() - started
+        return issues
+
+    def invalidate(self, changed: Iterable[str]) -> List[str]:
+        """Drop cached results of checkers that read a changed setting.
+        
+        Returns the names of the affected checkers.
+        """
+        changed = set(changed)
+        affected = [entry["name"] for entry in self._entries
+                    if changed & set(getattr(entry["checker"], "settings", ()))]
+        for results in self._results.values():
+            for name in affected:
+                results.pop(name, None)
+        return affected
+
+    def forget(self, key: str) -> None:
+        """Drop every cached result for a file."""
+        self._results.pop(key, None)
+
+    def _cached(self, key: Optional[str], entry: Dict, context) -> Optional[List[Dict]]:
+        checker = entry["checker"]
+        if key is None or not hasattr(checker, "settings"):
+            return None
+        cached = self._results.get(key, {}).get(entry["name"])
+        if cached and cached[:2] == (context.content_hash, checker.config.stamp(checker.settings)):
+            self.cache_stats["hits"] += 1
+            return cached[2]
+        self.cache_stats["misses"] += 1
+        return None
+
+    def _store(self, key: Optional[str], entry: Dict, context, issues: List[Dict]) -> None:
+        checker = entry["checker"]
+        if key is not None and hasattr(checker, "settings"):
+            stamp = checker.config.stamp(checker.settings)
+            self._results.setdefault(key, {})[entry["name"]] = (context.content_hash, stamp, issues)
+
+    def total_cost(self, max_cost: Optional[int] = None) -> int:
+        """Declared cost of one `run` up to `max_cost`."""
+        return sum(entry["cost"] for entry in self._entries
+                   if max_cost is None or entry["cost"] <= max_cost)
@@ -0,0 +1,168 @@
+"""Routing of AI analyses across the AI_MODELS tiers.
+
+Small changes to low-risk files start on the FAST model. Everything else
+starts on DEFAULT. A result is escalated when it looks unreliable:
+
+* A FAST result with critical issues goes straight to DETAILED.
+* A result whose reported confidence is below `min_confidence`, or that
+  is incomplete (a malformed or partial response), moves up one tier. A
+  mid-range score on its own is not a reason: code can be mediocre.
+
+Routing thresholds are learned from outcomes. Every escalation, plus a
+DEFAULT audit of every `audit_every`-th FAST result, compares FAST with a
+stronger model. Disagreement rates are kept per size bucket (powers of
+two), and the FAST size limit is the largest run of buckets whose
+posterior disagreement rate stays under `max_disagreement`. FAST is
+turned off when its recent latency (the last `latency_window` timings)
+is not clearly below DEFAULT's. While it is off, every `probe_every`-th
+change that would have started on FAST is still sent there as an
+audited probe, so the limit recovers once FAST is worth using again.
+"""
+
+import statistics
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from config.ai_standards import AI_MODELS, AI_ROUTING
+
+from .ai_cache import AnalysisCache, emit_issues
+from .bayesian import BetaPosterior
+from .quantiles import QuantileSketch
+
+TIER_ORDER = ("FAST", "DEFAULT", "DETAILED")
+
+
+class ModelRouter:
+    """Picks a model tier per analysis and escalates unreliable results."""
+
+    def __init__(self, cache: Optional[AnalysisCache] = None, policy: Optional[Dict] = None):
+        self.cache = cache
+        self.policy = dict(AI_ROUTING, **(policy or {}))
+        self.fast_max_lines = self.policy['fast_max_lines']
+        self.latency = {tier: QuantileSketch() for tier in TIER_ORDER}
+        self.recent_latency = {tier: deque(maxlen=self.policy['latency_window'])
+                               for tier in TIER_ORDER}
+        self.disagreement: Dict[int, List[int]] = {}  # Size bucket -> [disagreed, compared]
+        self.stats = {"routed": dict.fromkeys(TIER_ORDER, 0), "escalations": 0, "audits": 0,
+                      "probes": 0}
+        self._fast_results = 0
+        self._probe_candidates = 0
+
+    def route(self, size: int, risk: Optional[float] = None) -> str:
+        """Starting tier for a change of `size` lines."""
+        if (self.fast_max_lines and size <= self.fast_max_lines
+                and (risk is None or risk < self.policy['fast_max_risk'])):
+            return "FAST"
+        return "DEFAULT"
+
+    async def analyze(self, analyzer, code: str, context=None,
+                      changed_lines: Optional[int] = None,
+                      risk: Optional[float] = None,
+                      on_issue: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Analyze code on the routed tier, escalating as needed.
+
+        `on_issue` receives partial issues from every tier tried, each
+        tagged with the model that produced it.
+        """
+        lines = context.lines if context is not None else code.split('\n')
+        size = changed_lines if changed_lines is not None else len(lines)
+        tier = self.route(size, risk)
+        probe = tier == "DEFAULT" and self._due_for_probe(size, risk)
+        if probe:
+            tier = "FAST"
+            self.stats["probes"] += 1
+        result = await self._call(analyzer, code, tier, context, on_issue)
+        escalations = []
+
+        audit = tier == "FAST" and (self._due_for_audit(result) or probe)
+        while tier != "DETAILED":
+            reason = self._escalation_reason(tier, result) or ("audit" if audit else None)
+            if reason is None:
+                break
+            target = "DETAILED" if tier == "FAST" and reason == "critical" \
+                else TIER_ORDER[TIER_ORDER.index(tier) + 1]
+            stronger = await self._call(analyzer, code, target, context, on_issue)
+            if tier == "FAST":
+                self._record_comparison(size, result, stronger)
+            escalations.append({"from": tier, "to": target, "reason": reason})
+            self.stats["audits" if reason == "audit" else "escalations"] += 1
+            tier, result, audit = target, stronger, False
+
+        return dict(result, tier=tier, model=AI_MODELS[tier], escalations=escalations)
+
+    def _escalation_reason(self, tier: str, result: Dict) -> Optional[str]:
+        if result.get("source") != "ai":
+            return None  # Heuristic fallback: a bigger model is not reachable either
+        if tier == "FAST" and any(i.get("type") == "CRITICAL" for i in result.get("issues", [])):
+            return "critical"
+        if result.get("incomplete"):
+            return "incomplete"
+        if result.get("confidence", 1.0) < self.policy['min_confidence']:
+            return "low_confidence"
+        return None
+
+    def _due_for_audit(self, result: Dict) -> bool:
+        """Every Nth genuine FAST result is double-checked on DEFAULT."""
+        if result.get("source") != "ai":
+            return False
+        self._fast_results += 1
+        return self._fast_results % self.policy['audit_every'] == 0
+
+    def _due_for_probe(self, size: int, risk: Optional[float]) -> bool:
+        """While FAST is off, every Nth change it would have taken goes there anyway."""
+        if self.fast_max_lines or size > self.policy['fast_max_lines']:
+            return False
+        if risk is not None and risk >= self.policy['fast_max_risk']:
+            return False
+        self._probe_candidates += 1
+        return self._probe_candidates % self.policy['probe_every'] == 0
+
+    async def _call(self, analyzer, code: str, tier: str, context, on_issue=None) -> Dict:
+        """Run one analysis on a tier and time uncached answers."""
+        model = AI_MODELS[tier]
+        tagged = (lambda issue: on_issue(dict(issue, model=model))) if on_issue else None
+        started = time.perf_counter()
+        if self.cache is not None:
+            result = await self.cache.analyze(analyzer, code, model=model, context=context,
+                                              on_issue=tagged)
+        else:
+            result = await analyzer.analyze_code(code, model=model, context=context)
+            emit_issues(result, tagged)
+        if result.get("source") == "ai" and not result.get("reused"):
+            elapsed = (time.perf_counter() - started) * 1000
+            self.latency[tier].add(elapsed)
+            self.recent_latency[tier].append(elapsed)
+        self.stats["routed"][tier] += 1
+        return result
+
+    def _record_comparison(self, size: int, fast: Dict, stronger: Dict) -> None:
+        """Count whether FAST agreed with a stronger model, then relearn."""
+        def critical(result):
+            return any(i.get("type") == "CRITICAL" for i in result.get("issues", []))
+
+        disagreed = (abs(fast.get("score", 0) - stronger.get("score", 0)) > self.policy['score_tolerance']
+                     or critical(fast) != critical(stronger))
+        counts = self.disagreement.setdefault(size.bit_length(), [0, 0])
+        counts[0] += int(disagreed)
+        counts[1] += 1
+        self._relearn()
+
+    def _relearn(self) -> None:
+        """Recompute the FAST size limit from disagreement and latency."""
+        fast, default = self.recent_latency["FAST"], self.recent_latency["DEFAULT"]
+        if min(len(fast), len(default)) >= self.policy['min_samples']:
+            if statistics.median(fast) > self.policy['max_latency_ratio'] * statistics.median(default):
+                self.fast_max_lines = 0  # FAST is not buying any speed
+                return
+
+        limit = self.policy['fast_max_lines']
+        for bucket in sorted(self.disagreement):
+            disagreed, compared = self.disagreement[bucket]
+            if compared < self.policy['min_samples']:
+                continue
+            if BetaPosterior(1 + disagreed, 1 + compared - disagreed).mean > self.policy['max_disagreement']:
+                limit = min(limit, (1 << max(bucket - 1, 0)) - 1)  # Below this bucket
+                break
+            limit = max(limit, (1 << bucket) - 1)  # Whole bucket is safe
+        self.fast_max_lines = limit
@@ -0,0 +1,134 @@
+"""Versioned runtime configuration.
+
+The thresholds in config.quality_standards are the defaults. A JSON file
+of overrides (setting name -> value) can be reloaded while the watcher
+runs, so there is no restart and warm caches are kept. Every change bumps
+a global version, and each setting records the version of its last change.
+Checkers declare the settings they read (`settings = ("MAX_NESTED_DEPTH",)`).
+A cached result is stamped with the versions of its checker's settings, so
+a reload invalidates only the results of rules that read a changed setting.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from termcolor import colored
+
+from config import quality_standards
+
+RUNTIME_CONFIG_FILE = Path("config/quality_overrides.json")
+
+# Settings that may be changed at runtime, with their defaults
+RELOADABLE_SETTINGS = (
+    'MAX_FUNCTION_LINES',
+    'MAX_NESTED_DEPTH',
+    'MAX_LINE_LENGTH',
+    'MIN_DOCSTRING_WORDS'
+)
+
+
+class RuntimeConfig:
+    """Reloadable settings with per-setting change versions."""
+
+    def __init__(self, config_file: Optional[Path] = RUNTIME_CONFIG_FILE,
+                 defaults: Optional[Dict] = None):
+        self.config_file = Path(config_file) if config_file else None
+        self.defaults = dict(defaults if defaults is not None else {
+            name: getattr(quality_standards, name) for name in RELOADABLE_SETTINGS
+        })
+        self.values = dict(self.defaults)
+        self.version = 0
+        self.setting_versions = {name: 0 for name in self.defaults}
+        self._listeners: List[Callable[[Set[str]], None]] = []
+        self._file_signature = None
+
+    def __getitem__(self, name: str):
+        return self.values[name]
+
+    def get(self, name: str, default=None):
+        return self.values.get(name, default)
+
+    def stamp(self, settings: Iterable[str]) -> Tuple[int, ...]:
+        """Versions of the given settings; changes whenever one of them does."""
+        return tuple(self.setting_versions.get(name, 0) for name in settings)
+
+    def subscribe(self, listener: Callable[[Set[str]], None]) -> None:
+        """Call `listener(changed_names)` after every effective change."""
+        self._listeners.append(listener)
+
+    def update(self, overrides: Dict) -> Set[str]:
+        """Apply overrides on top of the defaults; returns the changed names.
+
+        Settings missing from `overrides` go back to their defaults. Unknown
+        names and values of the wrong type are ignored with a warning.
+        """
+        values = dict(self.defaults)
+        for name, value in overrides.items():
+            if name not in self.defaults:
+                print(colored(f"Ignoring unknown setting {name}", "yellow"))
+            elif not self._valid(self.defaults[name], value):
+                print(colored(f"Ignoring {name}={value!r}: expected "
+                              f"{type(self.defaults[name]).__name__}", "yellow"))
+            else:
+                values[name] = value
+
+        changed = {name for name in values if values[name] != self.values[name]}
+        if not changed:
+            return changed
+        self.version += 1
+        self.values = values
+        for name in changed:
+            self.setting_versions[name] = self.version
+        for listener in self._listeners:
+            listener(changed)
+        return changed
+
+    def reload(self) -> Set[str]:
+        """Re-read the overrides file; a missing file means all defaults."""
+        if self.config_file is None:
+            return set()
+        self._file_signature = self._signature()
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                overrides = json.load(f)
+        except FileNotFoundError:
+            overrides = {}
+        except (OSError, ValueError) as e:
+            print(colored(f"Error reading {self.config_file}, keeping current settings: {e}",
+                          "yellow"))
+            return set()
+        if not isinstance(overrides, dict):
+            print(colored(f"Ignoring {self.config_file}: expected a JSON object", "yellow"))
+            return set()
+        changed = self.update(overrides)
+        if changed:
+            print(colored(f"Configuration v{self.version}: {', '.join(sorted(changed))} changed",
+                          "cyan"))
+        return changed
+
+    def maybe_reload(self) -> Set[str]:
+        """Reload only if the overrides file changed since the last read."""
+        if self.config_file is None or self._signature() == self._file_signature:
+            return set()
+        return self.reload()
+
+    def _signature(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _valid(default, value) -> bool:
+        if isinstance(default, bool) or isinstance(value, bool):
+            return type(default) is type(value)
+        if isinstance(default, float):
+            return isinstance(value, (int, float))
+        return isinstance(value, type(default))
+
+
+# Shared by every checker that is not given its own configuration
+RUNTIME_CONFIG = RuntimeConfig()
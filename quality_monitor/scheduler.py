@@ -0,0 +1,259 @@
+"""Priority scheduling for quality check jobs.
+
+Jobs are served by priority class first. Within a class, agents take turns
+(round robin) so one agent's bulk work cannot starve another's, and each
+agent's jobs run earliest-deadline-first. An overdue job jumps the
+round robin within its class.
+
+The idle class holds speculative work (see quality_monitor.prefetch). It
+runs only when no other class has jobs, through `idle_check` when one is
+given. A real check submitted for a file that is queued at idle priority
+takes over the job, so it gets a real check.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from termcolor import colored
+
+# Priority classes (lower runs first)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_CLAIMED = 1
+PRIORITY_BACKGROUND = 2
+PRIORITY_IDLE = 3
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_CLAIMED: "claimed",
+    PRIORITY_BACKGROUND: "background",
+    PRIORITY_IDLE: "idle"
+}
+
+# Default deadlines in seconds (plan target: response < 1 second)
+DEFAULT_DEADLINES = {
+    PRIORITY_INTERACTIVE: 1.0,
+    PRIORITY_CLAIMED: 5.0,
+    PRIORITY_BACKGROUND: None,
+    PRIORITY_IDLE: None
+}
+
+DEFAULT_AGENT = "system"
+WAIT_SAMPLE_SIZE = 1000
+
+
+class CheckJob:
+    """A pending check of one file."""
+
+    __slots__ = ("file_path", "priority", "agent", "deadline", "enqueued", "seq", "cancelled")
+
+    def __init__(self, file_path: str, priority: int, agent: str,
+                 deadline: float, enqueued: float, seq: int):
+        self.file_path = file_path
+        self.priority = priority
+        self.agent = agent
+        self.deadline = deadline
+        self.enqueued = enqueued
+        self.seq = seq
+        self.cancelled = False
+
+    def sort_key(self):
+        return (self.deadline, self.seq)
+
+
+class CheckScheduler:
+    """Orders check jobs by priority class, agent fairness and deadline."""
+
+    def __init__(self, run_check: Callable[[str], None],
+                 idle_check: Optional[Callable[[str], None]] = None):
+        self.run_check = run_check
+        self.idle_check = idle_check  # Runs idle jobs; defaults to run_check
+        self.running = False
+        self._classes: Dict[int, "OrderedDict[str, List]"] = {
+            priority: OrderedDict() for priority in PRIORITY_NAMES
+        }
+        self._pending: Dict[str, CheckJob] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._stats = {
+            priority: {
+                "completed": 0,
+                "total_wait": 0.0,
+                "max_wait": 0.0,
+                "deadline_misses": 0,
+                "recent_waits": deque(maxlen=WAIT_SAMPLE_SIZE)
+            }
+            for priority in PRIORITY_NAMES
+        }
+
+    def submit(self, file_path: str, priority: int = PRIORITY_BACKGROUND,
+               agent: Optional[str] = None, deadline: Optional[float] = None) -> CheckJob:
+        """Queue a check. A file already queued keeps one merged job.
+
+        `deadline` is in seconds from now; it defaults per priority class.
+        """
+        if priority not in PRIORITY_NAMES:
+            raise ValueError(f"Unknown priority class: {priority}")
+        file_path = str(file_path)
+        agent = agent or DEFAULT_AGENT
+        now = time.monotonic()
+        if deadline is None:
+            deadline = DEFAULT_DEADLINES[priority]
+        absolute_deadline = now + deadline if deadline is not None else math.inf
+
+        with self._cond:
+            enqueued = now
+            previous = self._pending.get(file_path)
+            if previous:
+                # Keep the most urgent view of the merged job
+                previous.cancelled = True
+                enqueued = previous.enqueued
+                absolute_deadline = min(absolute_deadline, previous.deadline)
+                if previous.priority < priority:
+                    priority, agent = previous.priority, previous.agent
+
+            job = CheckJob(file_path, priority, agent, absolute_deadline, enqueued, next(self._seq))
+            self._pending[file_path] = job
+            heapq.heappush(
+                self._classes[priority].setdefault(agent, []),
+                (job.sort_key(), job)
+            )
+            self._cond.notify()
+        return job
+
+    def next_job(self, max_priority: Optional[int] = None) -> Optional[CheckJob]:
+        """Remove and return the next job to run, or None if idle."""
+        with self._cond:
+            now = time.monotonic()
+            for priority, agents in self._classes.items():
+                if max_priority is not None and priority > max_priority:
+                    break
+                job = self._pop_from_class(agents, now)
+                if job:
+                    del self._pending[job.file_path]
+                    return job
+        return None
+
+    def run_next(self, max_priority: Optional[int] = None) -> bool:
+        """Run the next job. Returns False if there was nothing to run."""
+        job = self.next_job(max_priority)
+        if not job:
+            return False
+        self._record_wait(job)
+        speculative = job.priority == PRIORITY_IDLE and self.idle_check is not None
+        try:
+            (self.idle_check if speculative else self.run_check)(job.file_path)
+        except Exception as e:
+            print(colored(f"Scheduled check failed for {job.file_path}: {e}", "red"))
+        return True
+
+    def run_pending(self, limit: Optional[int] = None,
+                    max_priority: Optional[int] = None) -> int:
+        """Run queued jobs synchronously; returns the number run."""
+        count = 0
+        while (limit is None or count < limit) and self.run_next(max_priority):
+            count += 1
+        return count
+
+    def start(self) -> None:
+        """Start a background worker thread."""
+        with self._cond:
+            if self.running:
+                return
+            self.running = True
+        self._worker = threading.Thread(target=self._work, name="check-scheduler", daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background worker after its current job."""
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        if self._worker:
+            self._worker.join(timeout)
+            self._worker = None
+
+    def depth(self, priority: Optional[int] = None) -> int:
+        """Return the number of queued jobs, optionally for one class."""
+        with self._cond:
+            if priority is None:
+                return len(self._pending)
+            return sum(1 for job in self._pending.values() if job.priority == priority)
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Return queue depth and wait time statistics per priority class."""
+        with self._cond:
+            depths = {priority: 0 for priority in PRIORITY_NAMES}
+            for job in self._pending.values():
+                depths[job.priority] += 1
+
+            result = {}
+            for priority, name in PRIORITY_NAMES.items():
+                stats = self._stats[priority]
+                waits = sorted(stats["recent_waits"])
+                completed = stats["completed"]
+                result[name] = {
+                    "depth": depths[priority],
+                    "completed": completed,
+                    "mean_wait": stats["total_wait"] / completed if completed else 0.0,
+                    "p95_wait": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                    "max_wait": stats["max_wait"],
+                    "deadline_misses": stats["deadline_misses"]
+                }
+            return result
+
+    def _pop_from_class(self, agents: "OrderedDict[str, List]", now: float) -> Optional[CheckJob]:
+        """Pop the next job in a class: overdue first, else next agent in turn."""
+        for agent in list(agents):
+            self._drop_cancelled(agents, agent)
+        if not agents:
+            return None
+
+        # Overdue work wins; otherwise rotate through agents
+        overdue = min(agents, key=lambda name: agents[name][0][0])
+        agent = overdue if agents[overdue][0][0][0] < now else next(iter(agents))
+
+        _, job = heapq.heappop(agents[agent])
+        queue = agents.pop(agent)
+        self._drop_cancelled_heap(queue)
+        if queue:
+            agents[agent] = queue  # Re-append: this agent goes to the back
+        return job
+
+    def _drop_cancelled(self, agents: "OrderedDict[str, List]", agent: str) -> None:
+        """Remove superseded jobs from the head of an agent's queue."""
+        self._drop_cancelled_heap(agents[agent])
+        if not agents[agent]:
+            del agents[agent]
+
+    @staticmethod
+    def _drop_cancelled_heap(queue: List) -> None:
+        while queue and queue[0][1].cancelled:
+            heapq.heappop(queue)
+
+    def _record_wait(self, job: CheckJob) -> None:
+        """Update wait statistics for a job about to run."""
+        now = time.monotonic()
+        wait = now - job.enqueued
+        with self._cond:
+            stats = self._stats[job.priority]
+            stats["completed"] += 1
+            stats["total_wait"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+            stats["recent_waits"].append(wait)
+            if now > job.deadline:
+                stats["deadline_misses"] += 1
+
+    def _work(self) -> None:
+        """Worker loop: run jobs until stopped."""
+        while True:
+            with self._cond:
+                while self.running and not self._pending:
+                    self._cond.wait()
+                if not self.running:
+                    return
+            self.run_next()
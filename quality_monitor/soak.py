@@ -0,0 +1,239 @@
+"""Soak-test harness for the long-running watcher.
+
+Drives a FileChangeHandler with synthetic edit storms on a temporary tree
+for a configurable time, like weeks of agents editing compressed into
+minutes. Every edit is delivered as a watchdog-style modification and
+timed end to end. During the run the harness samples process RSS and the
+traced Python heap. After warmup it takes a tracemalloc snapshot, then one
+at the end of each of `rounds` equal measurement rounds. Heap growth is
+attributed per subsystem: the innermost frame of each allocation that
+lies in this project's packages, e.g. `quality_monitor.clones`.
+
+A leak grows the heap in every round, while one-off allocations (a cache
+filling late, garbage from earlier work) land in a single round. Heap
+growth is therefore judged by its steady slope: the median growth per
+round, times the number of rounds. The run fails when RSS growth, steady
+heap growth or p99 event latency exceed SOAK_LIMITS. Latencies include tracemalloc overhead, so they are
+pessimistic.
+
+Usage: python -m quality_monitor.soak [--duration SECONDS]
+"""
+
+import argparse
+import gc
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+from termcolor import colored
+
+from config.quality_standards import SOAK_LIMITS
+
+from .coordination import CoordinationBus
+from .file_monitor import FileChangeHandler
+from .quantiles import QuantileSketch
+
+SOAK_TRACE_FRAMES = 10  # Enough to reach project code; more frames slow every allocation
+SUBSYSTEM_PACKAGES = ("quality_monitor", "config")
+OTHER_SUBSYSTEM = "<other>"
+MB = 1024 * 1024
+
+# Edit variants: clean, undocumented, deeply nested, long lines, broken syntax
+VARIANTS = (
+    'def {name}(values):\n    """Return the total of the given values, ignoring None entries."""\n'
+    '    return sum(v for v in values if v is not None)\n',
+    'def {name}(values):\n    total = 0\n    for v in values:\n        total += v\n    return total\n',
+    'def {name}(values):\n    """Nested."""\n    for v in values:\n        if v:\n            if v > 1:\n'
+    '                if v > 2:\n                    if v > 3:\n                        return v\n',
+    'def {name}(values):\n    """Long."""\n    return [value for value in values if value is not None '
+    'and value > 0 and value < 100 and value % 2 == 0]\n',
+    'def {name}(values:\n    return values\n'
+)
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def subsystem_of(traceback: tracemalloc.Traceback, roots: Dict[str, str]) -> str:
+    """Dotted module of the innermost frame inside a project package."""
+    for frame in reversed(traceback):  # Oldest frame first; walk from the allocation outwards
+        for root, package in roots.items():
+            if frame.filename.startswith(root):
+                return f"{package}.{Path(frame.filename).stem}"
+    return OTHER_SUBSYSTEM
+
+
+def heap_by_subsystem(snapshot: tracemalloc.Snapshot, roots: Dict[str, str]) -> Dict[str, int]:
+    """Traced bytes per subsystem in a snapshot."""
+    sizes: Dict[str, int] = {}
+    for trace in snapshot.traces:
+        subsystem = subsystem_of(trace.traceback, roots)
+        sizes[subsystem] = sizes.get(subsystem, 0) + trace.size
+    return sizes
+
+
+def steady_growth_of(sizes: List[int]) -> float:
+    """Median growth between consecutive sizes, times the number of rounds."""
+    growth = sorted(after - before for before, after in zip(sizes, sizes[1:]))
+    return statistics.median(growth) * len(growth) if growth else 0.0
+
+
+class SoakHarness:
+    """Edit storms against a watcher, with memory and latency bounds."""
+
+    def __init__(self, limits: Optional[Dict] = None, root: Optional[Path] = None,
+                 handler_factory: Optional[Callable[[CoordinationBus], FileChangeHandler]] = None,
+                 seed: int = 0):
+        self.limits = dict(SOAK_LIMITS, **(limits or {}))
+        self.root = Path(root) if root else None
+        self.handler_factory = handler_factory or (lambda bus: FileChangeHandler(bus=bus))
+        self.random = random.Random(seed)
+        project = Path(__file__).resolve().parent.parent
+        self.roots = {str(project / package) + os.sep: package for package in SUBSYSTEM_PACKAGES}
+
+    def run(self) -> Dict:
+        """Run the storm and return a report; `report["failures"]` lists broken bounds."""
+        if self.root is not None:
+            return self._run(self.root)
+        with tempfile.TemporaryDirectory(prefix="soak-") as tmp:
+            return self._run(Path(tmp))
+
+    def _run(self, root: Path) -> Dict:
+        files = self._create_tree(root)
+        bus = CoordinationBus(log_file=root / "coordination_log.jsonl")
+        handler = self.handler_factory(bus)
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(SOAK_TRACE_FRAMES)
+
+        latency = QuantileSketch()
+        samples: List[Dict] = []
+        checkpoints: List[Dict] = []  # Snapshots after warmup and after each round
+        events = 0
+        try:
+            start = time.perf_counter()
+            end = start + self.limits['duration_seconds']
+            round_length = (self.limits['duration_seconds'] - self.limits['warmup_seconds']) \
+                / self.limits['rounds']
+            next_sample = start
+            next_round = start + self.limits['warmup_seconds']
+            while time.perf_counter() < end:
+                for _ in range(self.limits['edits_per_burst']):
+                    latency.add(self._edit(handler, self.random.choice(files)) * 1000)
+                    events += 1
+
+                now = time.perf_counter()
+                if now >= next_sample:
+                    samples.append(self._sample(now - start, events))
+                    next_sample = now + self.limits['sample_interval_seconds']
+                if now >= next_round and len(checkpoints) < self.limits['rounds']:
+                    checkpoints.append(self._snapshot(now - start, events))
+                    samples.append(checkpoints[-1]["sample"])
+                    next_round = now + round_length
+
+            checkpoints.append(self._snapshot(time.perf_counter() - start, events))
+            samples.append(checkpoints[-1]["sample"])
+        finally:
+            bus.close()
+            if started_tracing:
+                tracemalloc.stop()
+
+        return self._report(events, latency, samples, checkpoints)
+
+    def _create_tree(self, root: Path) -> List[str]:
+        files = []
+        for i in range(self.limits['files']):
+            path = root / f"pkg{i % 5}" / f"mod_{i}.py"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(VARIANTS[0].format(name=f"func_{i}"))
+            files.append(str(path))
+        return files
+
+    def _edit(self, handler: FileChangeHandler, file_path: str) -> float:
+        """Rewrite a file with a random variant and time its handling."""
+        variant = self.random.choice(VARIANTS)
+        Path(file_path).write_text(variant.format(name=f"func_{Path(file_path).stem}"))
+        started = time.perf_counter()
+        handler.on_modified(SimpleNamespace(src_path=file_path, is_directory=False))
+        return time.perf_counter() - started
+
+    def _sample(self, elapsed: float, events: int) -> Dict:
+        traced, _ = tracemalloc.get_traced_memory()
+        return {"elapsed": round(elapsed, 3), "events": events, "rss": rss_bytes(), "traced": traced}
+
+    def _snapshot(self, elapsed: float, events: int) -> Dict:
+        gc.collect()
+        return {"sample": self._sample(elapsed, events), "snapshot": tracemalloc.take_snapshot()}
+
+    def _report(self, events: int, latency: QuantileSketch, samples: List[Dict],
+                checkpoints: List[Dict]) -> Dict:
+        baseline, final = checkpoints[0], checkpoints[-1]
+        rss_growth = (final["sample"]["rss"] - baseline["sample"]["rss"]) / MB
+        traced_growth = (final["sample"]["traced"] - baseline["sample"]["traced"]) / MB
+        steady_growth = steady_growth_of([c["sample"]["traced"] for c in checkpoints]) / MB
+        # Attributed once tracing has stopped: walking frames while tracing is slow
+        heaps = [heap_by_subsystem(c["snapshot"], self.roots) for c in checkpoints]
+        subsystems = {
+            name: steady_growth_of([heap.get(name, 0) for heap in heaps])
+            for name in set().union(*heaps)
+        }
+        p99 = latency.quantile(0.99) or 0.0
+
+        failures = []
+        if rss_growth > self.limits['max_rss_growth_mb']:
+            failures.append(f"RSS grew {rss_growth:.1f} MB after warmup")
+        if steady_growth > self.limits['max_traced_growth_mb']:
+            top = max(subsystems, key=subsystems.get)
+            failures.append(
+                f"Python heap grew steadily by {steady_growth:.1f} MB after warmup "
+                f"(most in {top}: {subsystems[top] / MB:.1f} MB)"
+            )
+        if p99 > self.limits['max_p99_latency_ms']:
+            failures.append(f"p99 event latency {p99:.0f} ms")
+
+        return {
+            "events": events,
+            "p50_ms": latency.quantile(0.5) or 0.0,
+            "p99_ms": p99,
+            "rss_growth_mb": rss_growth,
+            "traced_growth_mb": traced_growth,
+            "steady_growth_mb": steady_growth,
+            "subsystem_growth": dict(sorted(subsystems.items(), key=lambda item: -item[1])),
+            "samples": samples,
+            "failures": failures
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Soak-test the file watcher.")
+    parser.add_argument("--duration", type=float, default=SOAK_LIMITS['duration_seconds'])
+    parser.add_argument("--files", type=int, default=SOAK_LIMITS['files'])
+    args = parser.parse_args()
+
+    report = SoakHarness({"duration_seconds": args.duration, "files": args.files}).run()
+    print(colored(
+        f"{report['events']} events, p50 {report['p50_ms']:.1f} ms, p99 {report['p99_ms']:.1f} ms, "
+        f"RSS +{report['rss_growth_mb']:.1f} MB, heap +{report['traced_growth_mb']:.1f} MB", "cyan"
+    ))
+    for name, growth in list(report["subsystem_growth"].items())[:5]:
+        print(f"  {name}: {growth / 1024:+.0f} KB")
+    for failure in report["failures"]:
+        print(colored(f"FAIL: {failure}", "red"))
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
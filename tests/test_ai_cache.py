@@ -0,0 +1,113 @@
+"""
+Test suite for semantic reuse of AI analysis results.
+
+Tests that formatting-only changes share a fingerprint, that real changes
+do not, and that the cache deduplicates requests.
+"""
+
+import asyncio
+
+import pytest
+
+from quality_monitor.ai_cache import AnalysisCache, semantic_fingerprint
+
+ORIGINAL = '''
+def total(items):
+    """Return the sum of item prices.
+
+    Args:
+        items: priced things
+    """
+    return sum(item.price for item in items)  # fast path
+'''
+
+REFORMATTED = '''
+# Module reformatted by a code formatter
+def total( items ):
+    """Return the sum of item prices.
+
+        Args:
+            items: priced things
+    """
+
+    return sum(
+        item.price
+        for item in items
+    )
+'''
+
+CHANGED_LOGIC = '''
+def total(items):
+    """Return the sum of item prices.
+
+    Args:
+        items: priced things
+    """
+    return sum(item.cost for item in items)
+'''
+
+CHANGED_DOCSTRING = '''
+def total(items):
+    """Add up prices."""
+    return sum(item.price for item in items)
+'''
+
+class StubAnalyzer:
+    """Counts paid requests and answers after a short delay."""
+
+    def __init__(self, source="ai"):
+        self.calls = 0
+        self.source = source
+
+    async def analyze_code(self, code, model=None, context=None):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"score": 80, "issues": [{"type": "STYLE"}], "suggestions": [], "source": self.source}
+
+def test_fingerprint_ignores_formatting_only():
+    """Test which edits change the semantic fingerprint."""
+    original = semantic_fingerprint(ORIGINAL)
+    assert semantic_fingerprint(REFORMATTED) == original
+    assert semantic_fingerprint(CHANGED_LOGIC) != original
+    assert semantic_fingerprint(CHANGED_DOCSTRING) != original
+    assert semantic_fingerprint("def broken(:\n    pass") == semantic_fingerprint("def broken(:  pass")
+
+@pytest.mark.asyncio
+async def test_reformatted_code_reuses_result():
+    """Test that a formatter run does not trigger new requests."""
+    cache, analyzer = AnalysisCache(), StubAnalyzer()
+    first = await cache.analyze(analyzer, ORIGINAL)
+    second = await cache.analyze(analyzer, REFORMATTED)
+
+    assert analyzer.calls == 1
+    assert second["reused"] and "reused" not in first
+    assert second["issues"] == first["issues"]
+
+    await cache.analyze(analyzer, CHANGED_LOGIC)
+    await cache.analyze(analyzer, ORIGINAL, model="gpt-3.5-turbo")
+    assert analyzer.calls == 3
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_call():
+    """Test in-flight deduplication of equivalent code."""
+    cache, analyzer = AnalysisCache(), StubAnalyzer()
+    results = await asyncio.gather(*(cache.analyze(analyzer, REFORMATTED) for _ in range(5)))
+    assert analyzer.calls == 1
+    assert cache.stats["shared"] == 4
+    assert all(r["score"] == 80 for r in results)
+
+@pytest.mark.asyncio
+async def test_heuristic_fallbacks_are_not_cached(tmp_path):
+    """Test that fallback results are retried and that saves round-trip."""
+    cache, analyzer = AnalysisCache(), StubAnalyzer(source="heuristic")
+    await cache.analyze(analyzer, ORIGINAL)
+    await cache.analyze(analyzer, ORIGINAL)
+    assert analyzer.calls == 2
+
+    analyzer.source = "ai"
+    await cache.analyze(analyzer, ORIGINAL)
+    cache.save(tmp_path / "cache.json")
+    restored = AnalysisCache()
+    restored.load(tmp_path / "cache.json")
+    assert (await restored.analyze(analyzer, REFORMATTED))["reused"]
+    assert analyzer.calls == 3
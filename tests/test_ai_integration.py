@@ -35,4 +35,5 @@ async def test_integrated_checker():
     # Check bad code
     results = await checker.check_code(BAD_CODE)
     assert results["score"] < 50, "Bad code should score poorly"
-    assert len(results["suggestions"]) > 0, "Should have suggestions" 
\ No newline at end of file
+    assert len(results["suggestions"]) > 0, "Should have suggestions" 
+    await checker.close()
@@ -0,0 +1,84 @@
+"""
+Test suite for the issue baseline.
+
+Tests that fingerprints survive line shifts and change with the flagged
+code, that duplicates are counted, and that a QualityMonitor with a saved
+baseline reports only new issues, syntax errors included.
+"""
+
+from quality_monitor.baseline import IssueBaseline, issue_fingerprints
+from quality_monitor.context import AnalysisContext
+from quality_monitor.quality_monitor import QualityMonitor
+
+LEGACY = '''
+class Loader:
+    def load(self, path):
+        try:
+            return open(path).read()
+        except:
+            return None
+'''
+
+def issues_for(code):
+    return [{"type": "IMPORTANT", "category": "ErrorHandling", "message": "Bare except clause",
+             "line": i + 1} for i, line in enumerate(code.split("\n")) if line.strip().startswith("except:")]
+
+def fingerprints(code, path="pkg/loader.py"):
+    return issue_fingerprints(path, issues_for(code), AnalysisContext(code), root=None)
+
+def test_fingerprints_survive_line_shifts():
+    """Test inserted lines above an issue keep its fingerprint."""
+    shifted = '"""Module docstring."""\nimport os\n\n' + LEGACY
+    assert fingerprints(shifted) == fingerprints(LEGACY)
+    # Whitespace on the flagged line does not matter; its code does
+    assert fingerprints(LEGACY.replace("except:", "except:  ")) == fingerprints(LEGACY)
+    assert fingerprints(LEGACY.replace("except:", "except:  # noqa")) != fingerprints(LEGACY)
+
+def test_fingerprints_follow_symbol_file_and_duplicates():
+    """Test the enclosing symbol, path and occurrence are part of the identity."""
+    assert fingerprints(LEGACY.replace("def load", "def fetch")) != fingerprints(LEGACY)
+    assert fingerprints(LEGACY, "pkg/other.py") != fingerprints(LEGACY)
+
+    first, second = fingerprints(LEGACY + LEGACY)  # Same class defined twice
+    assert first != second and first == fingerprints(LEGACY)[0]
+
+def test_monitor_reports_only_new_issues(tmp_path, monkeypatch):
+    """Test a saved baseline hides legacy issues but not new ones."""
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / "loader.py"
+    source.write_text(LEGACY)
+
+    monitor = QualityMonitor()
+    context = monitor.check_file(str(source))
+    baseline = IssueBaseline()
+    baseline.record(str(source), monitor.issues[str(source)], context)
+    baseline.save(tmp_path / "baseline")
+    assert len(IssueBaseline.load(tmp_path / "baseline")) == len(monitor.issues[str(source)]) > 0
+
+    monitor = QualityMonitor(baseline=IssueBaseline.load(tmp_path / "baseline"))
+    source.write_text("import os\n" + LEGACY)
+    monitor.check_file(str(source))
+    assert monitor.new_issues[str(source)] == []
+
+    source.write_text(LEGACY + "\ndef parse(text):\n    try:\n        return int(text)\n    except:\n        return 0\n")
+    monitor.check_file(str(source))
+    new = monitor.new_issues[str(source)]
+    assert {issue["category"] for issue in new} >= {"ErrorHandling"}
+    assert all(issue["line"] > LEGACY.count("\n") for issue in new)
+    assert "New Issues (not in baseline)" in monitor.generate_report()
+
+def test_syntax_error_is_a_new_issue(tmp_path, monkeypatch):
+    """Test a file that stops parsing fails the baseline gate."""
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / "loader.py"
+    source.write_text(LEGACY)
+    monitor = QualityMonitor()
+    context = monitor.check_file(str(source))
+    baseline = IssueBaseline()
+    baseline.record(str(source), monitor.issues[str(source)], context)
+
+    monitor = QualityMonitor(baseline=baseline)
+    monitor.check_file(str(source))
+    source.write_text(LEGACY + "\ndef broken(:\n")
+    monitor.check_file(str(source))
+    assert [issue["category"] for issue in monitor.new_issues[str(source)]] == ["Syntax"]
@@ -0,0 +1,100 @@
+"""
+Test suite for recording and replaying AI analyses.
+
+Records a scripted live analyzer to a cassette file, then replays it
+offline with and without latency emulation, including streamed issue
+timing and behaviour behind the analysis cache.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from config.ai_standards import AI_MODELS
+from quality_monitor.ai_cache import AnalysisCache
+from quality_monitor.cassette import Cassette, RecordingAnalyzer, ReplayAnalyzer
+
+ISSUES = [{"type": "STYLE", "message": "first"}, {"type": "CRITICAL", "message": "second"}]
+
+class LiveStub:
+    """Stands in for AIQualityAnalyzer: streams two issues 20 ms apart."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def analyze_code_stream(self, code, model=None, context=None, on_issue=None):
+        self.calls += 1
+        for issue in ISSUES:
+            await asyncio.sleep(0.02)
+            if on_issue:
+                on_issue(issue)
+        return {"score": 40 + self.calls, "issues": list(ISSUES), "suggestions": [], "source": "ai"}
+
+    async def analyze_code(self, code, model=None, context=None):
+        return await self.analyze_code_stream(code, model, context)
+
+    async def heuristic_analysis(self, code, context=None):
+        return {"score": 70, "issues": [], "suggestions": [], "source": "heuristic"}
+
+@pytest.fixture
+def recorded(tmp_path):
+    """Cassette file with two takes of one request and a heuristic take."""
+    path = tmp_path / "cassette.json"
+    recorder = RecordingAnalyzer(LiveStub(), Cassette())
+
+    async def record():
+        await recorder.analyze_code_stream("x = 1", on_issue=lambda issue: None)
+        await recorder.analyze_code("x = 1")
+        await recorder.heuristic_analysis("x = 1")
+
+    asyncio.run(record())
+    recorder.cassette.save(path)
+    return path
+
+def test_recording_keeps_timings(recorded):
+    """Test takes survive a save/load with their latency and issue offsets."""
+    cassette = Cassette(recorded)
+    assert len(cassette) == 3 and cassette.ai_takes() == 2
+    take = cassette.next_take("x = 1", AI_MODELS["DEFAULT"])
+    assert take["request"] == {"model": AI_MODELS["DEFAULT"], "code": "x = 1"}
+    assert take["latency_ms"] >= 40
+    assert 20 <= take["issue_offsets_ms"][0] < take["issue_offsets_ms"][1]
+
+@pytest.mark.asyncio
+async def test_replay_cycles_takes_and_misses_loudly(recorded):
+    """Test takes replay in recorded order and unknown requests raise."""
+    replay = ReplayAnalyzer(Cassette(recorded), latency_scale=0)
+    scores = [(await replay.analyze_code("x = 1"))["score"] for _ in range(3)]
+    assert scores == [41, 42, 41]
+    assert (await replay.heuristic_analysis("x = 1"))["score"] == 70
+
+    with pytest.raises(KeyError):
+        await replay.analyze_code("y = 2")
+    fallback = ReplayAnalyzer(Cassette(recorded), latency_scale=0, fallback=LiveStub())
+    assert (await fallback.analyze_code("y = 2"))["source"] == "ai"
+    assert fallback.stats == {"replayed": 0, "missed": 1}
+
+@pytest.mark.asyncio
+async def test_latency_emulation(recorded):
+    """Test issues stream at their recorded offsets, scaled."""
+    replay = ReplayAnalyzer(Cassette(recorded), latency_scale=1.0)
+    arrivals, started = [], time.perf_counter()
+    result = await replay.analyze_code_stream(
+        "x = 1", on_issue=lambda issue: arrivals.append(time.perf_counter() - started)
+    )
+    elapsed = time.perf_counter() - started
+    assert result["issues"] == ISSUES
+    assert 0.015 <= arrivals[0] < arrivals[1] <= elapsed and elapsed >= 0.04
+
+    fast, started = ReplayAnalyzer(Cassette(recorded), latency_scale=0), time.perf_counter()
+    await fast.analyze_code("x = 1")
+    assert time.perf_counter() - started < 0.01
+
+@pytest.mark.asyncio
+async def test_replay_behind_cache(recorded):
+    """Test concurrent identical requests reach the replay backend once."""
+    replay, cache = ReplayAnalyzer(Cassette(recorded), latency_scale=0.5), AnalysisCache()
+    results = await asyncio.gather(*(cache.analyze(replay, "x = 1") for _ in range(5)))
+    assert {r["score"] for r in results} == {41}
+    assert replay.stats["replayed"] == 1 and cache.stats["shared"] == 4
@@ -0,0 +1,85 @@
+"""
+Test suite for checking in-memory sources.
+
+Tests that batches of (virtual path, source) pairs are checked without
+disk access, share results, caches and learning with check_file, resolve
+imports between modules of the same batch, and run on the pipeline's
+check executor.
+"""
+
+import asyncio
+
+import pytest
+
+from quality_monitor import quality_monitor as monitor_module
+from quality_monitor.pipeline import QualityPipeline
+from quality_monitor.quality_monitor import QualityMonitor
+
+HELPERS = '''
+def slugify(text):
+    """Turn text into a lowercase, dash separated slug for use in URLs."""
+    return "-".join(text.lower().split())
+'''
+
+VIEWS = '''
+from agent.helpers import slugify, titlecase
+
+def handler(title):
+    """Build the URL path of a page from its title, slugified for routing."""
+    try:
+        return "/" + slugify(title)
+    except:
+        return "/"
+'''
+
+@pytest.fixture
+def monitor(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    def no_disk(file_path):
+        raise AssertionError(f"read {file_path} from disk")
+
+    monkeypatch.setattr(monitor_module, "ingest_file", no_disk)
+    return QualityMonitor()
+
+def test_batch_checks_virtual_paths_without_disk(monitor, tmp_path):
+    """Test a batch is checked, stored and learned from without any file."""
+    results = monitor.check_sources([
+        ("agent/views.py", VIEWS),  # Imports a module that comes later in the batch
+        ("agent/helpers.py", HELPERS),
+        ("agent/broken.py", "def half(:\n"),
+        ("agent/gen.py", "# @generated\nx = 1\n"),
+    ])
+    assert list(results) == ["agent/views.py", "agent/helpers.py", "agent/broken.py", "agent/gen.py"]
+    assert results["agent/helpers.py"] == []
+    views = {issue["category"]: issue["message"] for issue in results["agent/views.py"]}
+    assert views["ErrorHandling"] == "Found bare except clause"
+    assert views["Imports"] == "'titlecase' is not defined in module 'agent.helpers'"
+    assert results["agent/broken.py"][0]["category"] == "Syntax"
+    assert results["agent/gen.py"] == [] and "agent/gen.py" in monitor.skipped
+
+    assert monitor.issues["agent/views.py"] == results["agent/views.py"]
+    assert "agent/views.py" in monitor.learning_system.patterns["effectiveness"]
+    assert monitor.take_dependents() == []
+    assert list(tmp_path.iterdir()) == [tmp_path / "monitor_data"]  # Created by LearningSystem
+
+def test_resubmitted_sources_reuse_cached_rules(monitor):
+    """Test an unchanged source hits the rule cache; a changed one does not."""
+    monitor.check_sources([("agent/helpers.py", HELPERS)])
+    hits = monitor.registry.cache_stats["hits"]
+    monitor.check_source("agent/helpers.py", HELPERS)
+    assert monitor.registry.cache_stats["hits"] == hits + 3
+
+    monitor.check_source("agent/helpers.py", HELPERS.replace('"""Turn', '"""Make'))
+    assert monitor.registry.cache_stats["hits"] == hits + 3
+
+def test_pipeline_runs_batch_on_check_executor(monitor):
+    """Test the pipeline runs batches on its check worker."""
+    async def run():
+        pipeline = QualityPipeline(monitor=monitor, sinks=[])
+        await pipeline.start()
+        results = await pipeline.check_sources([("agent/helpers.py", HELPERS)])
+        await pipeline.stop()
+        return results
+
+    assert asyncio.run(run()) == {"agent/helpers.py": []}
@@ -0,0 +1,150 @@
+"""
+Test suite for cross-file duplicate detection.
+
+Tests near-duplicate functions found through MinHash LSH, shared blocks
+found through winnowed fingerprints, incremental re-indexing, and the
+earlier copy being queued so both copies report the pair.
+"""
+
+import ast
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from quality_monitor import clones
+from quality_monitor.clones import CloneIndex, SortedRunIndex, kgram_hashes, winnow
+from quality_monitor.quality_monitor import QualityMonitor
+
+ORIGINAL = '''
+def summarize_orders(orders):
+    """Summarize order totals per customer."""
+    totals = {}
+    for order in orders:
+        customer = order["customer"]
+        if customer not in totals:
+            totals[customer] = 0
+        totals[customer] += order["amount"] * order["quantity"]
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return [name for name, total in ranked if total > 100]
+'''
+
+# Same logic with renamed identifiers and different formatting
+RENAMED = '''
+def rank_buyers(purchases):
+    """Rank buyers by spend."""
+    spend = {}
+    for purchase in purchases:
+        buyer = purchase["buyer"]
+        if buyer not in spend:
+            spend[buyer] = 0
+        spend[buyer] += purchase["price"] * purchase["count"]
+    ordered = sorted(spend.items(), key=lambda pair: pair[1], reverse=True)
+    return [who for who, value in ordered if value > 250]
+'''
+
+UNRELATED = '''
+def parse_header(line):
+    """Split a header line into key and value."""
+    key, _, value = line.partition(":")
+    return key.strip().lower(), value.strip()
+'''
+
+def index_source(index, path, source):
+    """Index one in-memory file."""
+    return index.update_file(path, source, ast.parse(source))
+
+def test_renamed_function_is_reported():
+    """Test that a renamed copy is flagged as a near duplicate."""
+    index = CloneIndex()
+    assert index_source(index, "orders.py", ORIGINAL) == []
+    assert index_source(index, "header.py", UNRELATED) == []
+
+    issues = index_source(index, "buyers.py", RENAMED)
+    assert len(issues) == 1
+    assert issues[0]["category"] == "Duplication"
+    assert "summarize_orders" in issues[0]["message"]
+    assert "orders.py:2" in issues[0]["message"]
+
+def test_updates_are_incremental():
+    """Test that changed or removed files stop matching."""
+    index = CloneIndex()
+    index_source(index, "orders.py", ORIGINAL)
+    index_source(index, "orders.py", UNRELATED)
+    assert index_source(index, "buyers.py", RENAMED) == []
+
+    index_source(index, "orders.py", ORIGINAL)
+    index.remove_file("buyers.py")
+    assert index_source(index, "copy.py", ORIGINAL) != []
+    index.remove_file("orders.py")
+    index.remove_file("copy.py")
+    assert index_source(index, "again.py", ORIGINAL) == []
+
+def test_earlier_copy_is_queued_for_recheck():
+    """Test the file a new copy matches is queued once, and again when the copy goes."""
+    index = CloneIndex()
+    index_source(index, "orders.py", ORIGINAL)
+    index_source(index, "buyers.py", RENAMED)
+    assert index.take_pending() == ["orders.py"]
+
+    issues = index_source(index, "orders.py", ORIGINAL)
+    assert len(issues) == 1 and "rank_buyers" in issues[0]["message"]
+    assert index.take_pending() == []  # Both copies agree: no ping-pong
+
+    index.remove_file("buyers.py")
+    assert index.take_pending() == ["orders.py"]
+    assert index_source(index, "orders.py", ORIGINAL) == []
+    assert index.take_pending() == []
+
+def test_shared_block_outside_functions():
+    """Test winnowing catches duplicated module-level code."""
+    block = "\n".join(f"CONFIG_{i} = load_setting('key_{i}', default={i})" for i in range(12))
+    index = CloneIndex()
+    index_source(index, "settings_a.py", block)
+    issues = index_source(index, "settings_b.py", "import os\n" + block)
+    assert len(issues) == 1
+    assert issues[0]["message"].startswith("Lines 2-")
+
+def test_winnowing_guarantee():
+    """Test that any shared run of k + w - 1 tokens shares a fingerprint."""
+    rng = np.random.default_rng(1)
+    left, right = rng.integers(1, 1000, 300), rng.integers(1, 1000, 300)
+    shared = rng.integers(1, 1000, clones.WINNOW_KGRAM + clones.WINNOW_WINDOW - 1)
+    left[100:100 + len(shared)] = shared
+    right[10:10 + len(shared)] = shared
+
+    def fingerprints(tokens):
+        hashes = kgram_hashes(tokens.astype(np.uint64), clones.WINNOW_KGRAM)
+        return set(hashes[winnow(hashes, clones.WINNOW_WINDOW)].tolist())
+
+    assert fingerprints(left) & fingerprints(right)
+
+def test_sorted_runs_merge_and_retire(monkeypatch):
+    """Test lookups across flushed runs with retired owners."""
+    monkeypatch.setattr(clones, "RUN_SIZE", 4)
+    versions = np.array([1, 1, 1], dtype=np.int32)
+    index = SortedRunIndex()
+    for owner in range(3):
+        keys = np.array([10, 20, 30 + owner], dtype=np.uint64)
+        index.add(keys, owner, np.arange(3), 1, versions)
+
+    versions[1] = 2  # Owner 1 re-indexed elsewhere
+    query, owners, payloads, found_versions = index.lookup(np.array([20, 31], dtype=np.uint64))
+    live = found_versions == versions[owners]
+    assert sorted(owners[live & (query == 0)].tolist()) == [0, 2]
+    assert not np.any(live & (query == 1))
+
+def test_monitor_reports_duplicates():
+    """Test duplicates flow through check_file like any other issue."""
+    monitor = QualityMonitor()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, source in (("orders.py", ORIGINAL), ("buyers.py", RENAMED)):
+            path = Path(tmpdir) / name
+            path.write_text(source, encoding="utf-8")
+            monitor.check_file(path)
+        buyers_issues = monitor.issues[str(Path(tmpdir) / "buyers.py")]
+        assert monitor.take_dependents() == [str(Path(tmpdir) / "orders.py")]
+    assert any(i["category"] == "Duplication" for i in buyers_issues)
+
+    batch = monitor.check_sources([("a.py", ORIGINAL), ("b.py", RENAMED)])
+    assert all(any(i["category"] == "Duplication" for i in batch[path]) for path in batch)
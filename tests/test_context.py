@@ -0,0 +1,68 @@
+"""
+Test suite for the shared per-file analysis context.
+
+Tests that derived views are computed once and shared, and that a file
+check reads, tokenizes and parses its source a single time.
+"""
+
+import ast
+import tempfile
+import tokenize
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from quality_monitor.ai_cache import semantic_fingerprint
+from quality_monitor.context import AnalysisContext
+from quality_monitor.quality_monitor import QualityMonitor
+
+SOURCE = '''
+def load(path):
+    """Load a file."""
+    with open(path) as f:
+        return f.read()
+'''
+
+def test_views_are_lazy_and_cached():
+    """Test each derived view is computed on demand and reused."""
+    context = AnalysisContext(SOURCE, "load.py")
+    assert context.tree is context.tree
+    assert context.tokens is context.tokens
+    assert context.line(2) == "def load(path):"
+    assert context.line(99) == ""
+    assert SOURCE[context.line_offsets[2]:].startswith('    """Load')
+    assert len(context.content_hash) == 32
+
+def test_parse_error_is_remembered():
+    """Test a broken file is parsed once and its tokens stop at the error."""
+    context = AnalysisContext("def broken(:\n    pass\n")
+    with mock.patch("quality_monitor.context.ast.parse", side_effect=SyntaxError("bad")) as parse:
+        for _ in range(2):
+            with pytest.raises(SyntaxError):
+                context.tree
+    assert parse.call_count == 1
+    assert AnalysisContext("x = (1,\n").tokens
+
+def test_check_file_reads_and_parses_once():
+    """Test checkers, duplicates and learning share one parse and tokenize."""
+    monitor = QualityMonitor()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "load.py"
+        path.write_text(SOURCE, encoding="utf-8")
+        with mock.patch("quality_monitor.context.ast.parse", wraps=ast.parse) as parse, \
+                mock.patch("quality_monitor.context.tokenize.generate_tokens",
+                           wraps=tokenize.generate_tokens) as tokens, \
+                mock.patch("builtins.open", wraps=open) as opened:
+            monitor.check_file(path)
+    assert parse.call_count == 1
+    assert tokens.call_count == 1
+    assert opened.call_count == 1
+    assert str(path) in monitor.issues
+
+def test_fingerprint_leaves_shared_tree_untouched():
+    """Test AI fingerprinting does not rewrite the shared AST's docstrings."""
+    source = 'def f():\n    """Spread   over\n    lines."""\n'
+    context = AnalysisContext(source)
+    assert semantic_fingerprint(source, context.tree) == semantic_fingerprint(source)
+    assert ast.get_docstring(context.tree.body[0], clean=False) == "Spread   over\n    lines."
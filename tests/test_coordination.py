@@ -0,0 +1,109 @@
+"""
+Test suite for the Coordination Bus.
+
+Tests file claims, status tracking, quality-result subscriptions,
+pre-checks of claimed files and the append-only log.
+"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from quality_monitor.coordination import (
+    CoordinationBus,
+    STATUS_AVAILABLE,
+    STATUS_IN_PROGRESS,
+    STATUS_NEEDS_REVIEW,
+    TOPIC_QUALITY
+)
+from quality_monitor.file_monitor import FileChangeHandler
+from quality_monitor.quality_monitor import QualityMonitor
+
+SAMPLE_CODE = '''
+def add(a, b):
+    return a + b
+'''
+
+@pytest.fixture
+def bus_dir():
+    """Provide a temporary directory for the coordination log."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+def test_claims_and_release(bus_dir):
+    """Test that only one agent can hold a file at a time."""
+    bus = CoordinationBus(bus_dir / "log.jsonl")
+
+    assert bus.claim("src/api.py", "agent_1")
+    assert not bus.claim("src/api.py", "agent_2")
+    assert bus.claimed_by("src/api.py") == "agent_1"
+    assert bus.status_of("src/api.py") == STATUS_IN_PROGRESS
+
+    assert not bus.release("src/api.py", "agent_2")
+    assert bus.release("src/api.py", "agent_1", needs_review=True)
+    assert bus.status_of("src/api.py") == STATUS_NEEDS_REVIEW
+    assert bus.claim("src/api.py", "agent_2")
+    bus.close()
+
+def test_statuses_survive_restart(bus_dir):
+    """Test that statuses are rebuilt from the append-only log."""
+    log_file = bus_dir / "log.jsonl"
+    bus = CoordinationBus(log_file)
+    bus.claim("ui.py", "agent_1")
+    bus.claim("data.py", "agent_2")
+    bus.release("data.py", "agent_2")
+    bus.close()
+
+    restored = CoordinationBus(log_file)
+    assert restored.claimed_files() == [str(Path("ui.py").resolve())]
+    assert restored.status_of("data.py") == STATUS_AVAILABLE
+    assert len(log_file.read_text(encoding="utf-8").splitlines()) == 3
+    restored.close()
+
+def test_quality_subscription(bus_dir):
+    """Test that per-file subscribers receive results from the monitor."""
+    bus = CoordinationBus(bus_dir / "log.jsonl")
+    source = bus_dir / "sample.py"
+    source.write_text(SAMPLE_CODE, encoding="utf-8")
+
+    received = []
+    bus.subscribe(TOPIC_QUALITY, received.append, file_path=source)
+    QualityMonitor(bus=bus).check_file(source)
+
+    assert len(received) == 1
+    assert any("Missing docstring" in i["message"] for i in received[0]["data"]["issues"])
+
+    # The log stores counts, not full issue lists
+    entry = json.loads((bus_dir / "log.jsonl").read_text(encoding="utf-8").splitlines()[-1])
+    assert "issues" not in entry["data"]
+    assert entry["data"]["issue_counts"]["IMPORTANT"] >= 1
+    bus.close()
+
+def test_claim_is_checked_without_worker(bus_dir):
+    """Test a claimed file is pre-checked even when no worker thread runs."""
+    bus = CoordinationBus(bus_dir / "log.jsonl")
+    handler = FileChangeHandler(bus=bus)
+    source = bus_dir / "sample.py"
+    source.write_text(SAMPLE_CODE, encoding="utf-8")
+
+    bus.claim(str(source), "agent_1")
+    assert str(source.resolve()) in handler.quality_monitor.issues
+    assert handler.scheduler.metrics()["claimed"]["completed"] == 1
+    bus.close()
+
+def test_delivery_latency(bus_dir):
+    """Test that local delivery stays under a millisecond."""
+    bus = CoordinationBus(bus_dir / "log.jsonl")
+    latencies = []
+    bus.subscribe(TOPIC_QUALITY, lambda event: latencies.append(time.perf_counter() - start))
+
+    for _ in range(200):
+        start = time.perf_counter()
+        bus.publish_quality("mod.py", [{"type": "STYLE"}])
+
+    latencies.sort()
+    assert latencies[len(latencies) // 2] < 0.001
+    bus.close()
@@ -0,0 +1,84 @@
+"""
+Test suite for the live dashboard.
+
+Tests incremental totals, the worst-files view with superseded results,
+bus-fed updates and that redraws touch only changed screen lines, also
+with 50k monitored files.
+"""
+
+import io
+import time
+
+from quality_monitor.coordination import STATUS_IN_PROGRESS, CoordinationBus
+from quality_monitor.dashboard import DashboardModel, TerminalDashboard
+
+CRITICAL = {"type": "CRITICAL", "category": "Nesting"}
+STYLE = {"type": "STYLE", "category": "Naming"}
+
+def test_totals_follow_replaced_results():
+    """Test totals change by the difference between old and new rows."""
+    model = DashboardModel()
+    model.update("a.py", [CRITICAL, STYLE])
+    model.update("b.py", [STYLE])
+    assert model.totals["issues"] == {"CRITICAL": 1, "IMPORTANT": 0, "STYLE": 2}
+    assert model.mean_score() == (70 + 95) / 2
+
+    model.update("a.py", [])
+    model.remove("b.py")
+    assert model.totals["issues"] == {"CRITICAL": 0, "IMPORTANT": 0, "STYLE": 0}
+    assert model.totals["files"] == 1 and model.mean_score() == 100
+
+def test_worst_files_skip_superseded_results():
+    """Test the worst view reflects only each file's latest result."""
+    model = DashboardModel()
+    model.update("a.py", [CRITICAL, CRITICAL])
+    model.update("b.py", [STYLE])
+    model.update("c.py", [])
+    assert [path for path, _ in model.worst(5)] == ["a.py", "b.py"]
+
+    model.update("a.py", [])
+    worst = model.worst(5)
+    assert [path for path, _ in worst] == ["b.py"]
+    assert worst[0][1]["score"] == 95
+
+def test_bus_feeds_results_and_statuses():
+    """Test quality results and claims published on the bus reach the model."""
+    bus, model = CoordinationBus(log_file=None), DashboardModel()
+    model.attach(bus)
+    bus.publish_quality("pkg/a.py", [CRITICAL])
+    bus.claim("pkg/a.py", "agent_1")
+
+    (path, row), = model.worst()
+    assert path.endswith("a.py")
+    assert row["status"] == STATUS_IN_PROGRESS and row["counts"]["CRITICAL"] == 1
+    assert model.totals["statuses"][STATUS_IN_PROGRESS] == 1
+
+def test_redraw_writes_only_changed_lines():
+    """Test a single result change rewrites a few lines, not the screen."""
+    model, out = DashboardModel(), io.StringIO()
+    for i in range(10):
+        model.update(f"f{i}.py", [STYLE] * (i + 1))
+    dashboard = TerminalDashboard(model, out, rows=5)
+    assert dashboard.refresh() == 8  # Header, blank line and five rows
+
+    assert dashboard.refresh() == 0  # Nothing changed
+    model.update("f9.py", [STYLE] * 11)
+    # Header totals and the top row change
+    assert dashboard.refresh() == 3
+    assert "🟢  45  🔴0 🟡0 🔵11  f9.py" in out.getvalue()
+
+def test_responsive_with_50k_files():
+    """Test updates and redraws stay fast with 50k monitored files."""
+    model = DashboardModel()
+    for i in range(50_000):
+        model.update(f"pkg{i % 100}/mod_{i}.py", [STYLE] * (i % 7))
+    dashboard = TerminalDashboard(model, io.StringIO())
+    dashboard.refresh()
+
+    started = time.perf_counter()
+    for i in range(1000):
+        model.update(f"pkg{i % 100}/mod_{i}.py", [CRITICAL] * (i % 3))
+        if i % 100 == 0:
+            dashboard.refresh()
+    assert time.perf_counter() - started < 0.5
+    assert model.totals["files"] == 50_000
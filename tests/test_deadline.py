@@ -0,0 +1,138 @@
+"""
+Test suite for latency-budgeted AI analysis.
+
+Tests the on-time path, heuristic fallback with late replacement, hedged
+duplicate requests and their streamed issues, the late result reaching checker subscribers and
+one budget covering a routed analysis with its escalations.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from config.ai_standards import RESET_ISSUES
+from quality_monitor.ai_cache import AnalysisCache
+from quality_monitor.ai_integration import EVENT_RESULT, IntegratedQualityChecker
+from quality_monitor.deadline import LatencyBudget
+from quality_monitor.gating import AIGate
+
+class TimedStub:
+    """Remote answers after scripted delays (one per call); heuristic is instant."""
+
+    def __init__(self, *delays):
+        self.delays = list(delays)
+        self.calls = 0
+
+    async def analyze_code(self, code, model=None, context=None):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        return {"score": 88, "issues": [{"type": "STYLE", "message": f"after {delay}s"}],
+                "suggestions": ["remote"], "source": "ai"}
+
+    async def heuristic_analysis(self, code, context=None):
+        return {"score": 60, "issues": [], "suggestions": ["local"], "source": "heuristic"}
+
+class UnsureStub(TimedStub):
+    """Remote answers with low confidence, so the router escalates them."""
+
+    async def analyze_code(self, code, model=None, context=None):
+        return dict(await super().analyze_code(code, model, context), confidence=0.1)
+
+@pytest.mark.asyncio
+async def test_fast_answer_is_returned_directly():
+    """Test an on-time answer and no hedge."""
+    budget, stub = LatencyBudget(budget=0.5, hedge_after=0.2), TimedStub(0.01)
+    result = await budget.bind(stub).analyze_code("x = 1")
+    assert result["source"] == "ai" and stub.calls == 1
+    assert budget.stats["on_time"] == 1 and budget.stats["hedged"] == 0
+
+@pytest.mark.asyncio
+async def test_slow_answer_falls_back_then_replaces():
+    """Test the heuristic is served in budget and the late answer is cached."""
+    cache = AnalysisCache()
+    budget = LatencyBudget(budget=0.05, cache=cache, hedge=False)
+    late, stub = [], TimedStub(0.2)
+
+    started = time.perf_counter()
+    result = await budget.bind(stub, on_late=late.append).analyze_code("x = 1")
+    assert time.perf_counter() - started < 0.15
+    assert result["source"] == "heuristic" and result["deadline_exceeded"]
+
+    await budget.wait_for_late()
+    assert late[0]["suggestions"] == ["remote"]
+    assert (await cache.analyze(stub, "x = 1"))["reused"]
+    assert stub.calls == 1
+    assert budget.stats == dict(budget.stats, fallbacks=1, late_results=1)
+
+@pytest.mark.asyncio
+async def test_hedged_request_wins():
+    """Test a duplicate request sent at the hedge point answers first."""
+    budget, stub = LatencyBudget(budget=0.3, hedge_after=0.02), TimedStub(1.0, 0.01)
+    result = await budget.bind(stub).analyze_code("x = 1")
+    assert result["issues"][0]["message"] == "after 0.01s"
+    assert stub.calls == 2
+    assert budget.stats["hedge_wins"] == 1
+    await budget.wait_for_late()
+
+class StreamingStub(TimedStub):
+    """Streams one partial issue, then answers after the scripted delay."""
+
+    async def analyze_code_stream(self, code, model=None, context=None, on_issue=None):
+        on_issue({"type": "STYLE", "message": "partial"})
+        return await self.analyze_code(code, model, context)
+
+@pytest.mark.asyncio
+async def test_winning_hedge_replaces_streamed_issues():
+    """Test a hedge's issues replace the primary's partial ones."""
+    budget, stub = LatencyBudget(budget=0.3, hedge_after=0.02), StreamingStub(1.0, 0.01)
+    streamed = []
+    result = await budget.bind(stub).analyze_code_stream("x = 1", on_issue=streamed.append)
+    assert budget.stats["hedge_wins"] == 1
+    assert streamed[0]["message"] == "partial"
+    assert streamed[1] == {RESET_ISSUES: True, "source": "ai"}
+    assert streamed[2:] == result["issues"]
+
+@pytest.mark.asyncio
+async def test_fallback_replaces_streamed_issues():
+    """Test the heuristic's issues after a deadline follow a reset."""
+    budget, stub = LatencyBudget(budget=0.05, hedge=False), StreamingStub(0.5)
+    streamed = []
+    result = await budget.bind(stub).analyze_code_stream("x = 1", on_issue=streamed.append)
+    assert result["deadline_exceeded"]
+    assert streamed == [{"type": "STYLE", "message": "partial"},
+                        {RESET_ISSUES: True, "source": "heuristic"}]
+    await budget.cancel_late()
+
+@pytest.mark.asyncio
+async def test_checker_publishes_late_replacement(tmp_path, monkeypatch):
+    """Test subscribers get the heuristic result, then the late AI one."""
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    checker = IntegratedQualityChecker()
+    checker.ai_checker = TimedStub(0.1)
+    checker.ai_gate = AIGate({"uncertain_score_range": (0, 100)}, log_file=tmp_path / "gate.jsonl")
+    checker.latency_budget = LatencyBudget(budget=0.02, hedge=False, cache=checker.ai_cache)
+    results = []
+    checker.subscribe(lambda e: results.append(e["result"]) if e["event"] == EVENT_RESULT else None)
+
+    first = await checker.check_code("def f():\n    return 1\n")
+    assert first["deadline_exceeded"] and first["suggestions"] == ["local"]
+    await checker.latency_budget.wait_for_late()
+    assert [r.get("late", False) for r in results] == [False, True]
+    assert results[1]["score"] == 88 and results[1]["suggestions"] == ["remote"]
+
+@pytest.mark.asyncio
+async def test_budget_covers_escalations(tmp_path, monkeypatch):
+    """Test escalated tiers share one budget instead of getting one each."""
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    checker = IntegratedQualityChecker()
+    checker.ai_checker = UnsureStub(0.4)  # Each tier alone is within budget
+    checker.ai_gate = AIGate({"uncertain_score_range": (0, 100)}, log_file=tmp_path / "gate.jsonl")
+    checker.latency_budget = LatencyBudget(budget=0.6, cache=checker.ai_cache)
+
+    result = await checker.check_code("def f():\n    return 1\n")
+    assert result["deadline_exceeded"] and result["suggestions"] == ["local"]
+    await checker.close()
+    assert checker.ai_checker.calls == 2  # The escalation was abandoned on close
+    assert checker.latency_budget.stats["late_results"] == 0
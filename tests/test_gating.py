@@ -0,0 +1,96 @@
+"""
+Test suite for cost-aware tiered analysis.
+
+Tests the checker registry's cost ordering, each AI gating policy, the
+skip audit log and the gated IntegratedQualityChecker flow.
+"""
+
+import json
+
+import pytest
+
+from quality_monitor.ai_integration import IntegratedQualityChecker
+from quality_monitor.context import AnalysisContext
+from quality_monitor.gating import AIGate, cheap_score
+from quality_monitor.registry import COST_AST, COST_INDEX, CheckerRegistry
+
+CRITICAL = {"type": "CRITICAL", "category": "Security", "message": "eval", "suggestion": "Remove eval"}
+IMPORTANT = {"type": "IMPORTANT", "category": "Documentation", "message": "doc", "suggestion": "Add docs"}
+
+class FixedChecker:
+    """Returns canned issues and records call order."""
+
+    def __init__(self, name, cost, calls):
+        self.name, self.cost, self.calls = name, cost, calls
+
+    def check(self, context):
+        self.calls.append(self.name)
+        return [dict(IMPORTANT, message=self.name)]
+
+class StubAnalyzer:
+    """Counts AI requests."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def analyze_code(self, code, model=None, context=None):
+        self.calls += 1
+        return {"score": 75, "issues": [], "suggestions": ["Consider typing"], "source": "ai"}
+
+def test_registry_runs_cheapest_first():
+    """Test declared costs order execution and cap it."""
+    calls, registry = [], CheckerRegistry()
+    registry.register(FixedChecker("index", COST_INDEX, calls))
+    registry.register(FixedChecker("ast", COST_AST, calls))
+
+    assert [i["message"] for i in registry.run(AnalysisContext("x = 1"))] == ["ast", "index"]
+    assert registry.run(AnalysisContext("x = 1"), max_cost=COST_AST)
+    assert calls == ["ast", "index", "ast"]
+    assert registry.timings["FixedChecker"]["runs"] == 3
+    assert registry.total_cost() == COST_AST + COST_INDEX
+
+def test_policies_in_order(tmp_path):
+    """Test each policy's verdict and the skip-only audit log."""
+    gate = AIGate(log_file=tmp_path / "gate.jsonl")
+    assert cheap_score([CRITICAL, IMPORTANT]) == 60
+
+    assert gate.decide([CRITICAL], risk=0.9)["policy"] == "critical"
+    assert gate.decide([IMPORTANT], changed_lines=1)["policy"] == "changed_lines"
+    assert gate.decide([], risk=0.7)["run"]
+    assert gate.decide([IMPORTANT, IMPORTANT])["run"]  # Score 70 is inconclusive
+    clean = gate.decide([], "clean.py")
+    assert not clean["run"] and "clearly clean" in clean["reason"]
+
+    logged = [json.loads(line) for line in (tmp_path / "gate.jsonl").read_text().splitlines()]
+    assert [d["policy"] for d in logged] == ["critical", "changed_lines", "uncertainty"]
+    assert logged[-1]["file"] == "clean.py"
+    assert gate.stats["run"] == 2 and gate.stats["skipped"] == 3
+
+@pytest.mark.asyncio
+async def test_check_code_calls_ai_only_when_worth_it(tmp_path, monkeypatch):
+    """Test clean, unparsable and barely changed code skip the AI; inconclusive code does not."""
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    checker = IntegratedQualityChecker()
+    checker.ai_checker = StubAnalyzer()
+    checker.ai_gate = AIGate(log_file=tmp_path / "gate.jsonl")
+
+    clean = 'def add(a, b):\n    """Add two numbers and return their sum to the caller."""\n    return a + b\n'
+    results = await checker.check_code(clean, "calc.py")
+    assert results["ai_decision"]["run"] is False and results["score"] == 100
+    assert checker.ai_checker.calls == 0
+
+    undocumented = "def add(a, b):\n    return a + b\n\nclass Calc:\n    x = 1\n"
+    results = await checker.check_code(undocumented, "calc.py")
+    assert checker.ai_checker.calls == 1
+    assert results["score"] == 75 and results["suggestions"] == ["Consider typing"]
+
+    results = await checker.check_code(undocumented.replace("x = 1", "x = 2"), "calc.py")
+    assert results["ai_decision"]["policy"] == "changed_lines"
+    assert results["suggestions"] == ["Add descriptive docstring"]
+    assert checker.ai_checker.calls == 1
+
+    results = await checker.check_code("def broken(:\n    return 1\n", "broken.py")
+    assert results["ai_decision"]["policy"] == "critical"
+    assert results["issues"][0]["category"] == "Syntax"
+    assert checker.ai_checker.calls == 1
+    await checker.close()
@@ -0,0 +1,97 @@
+"""
+Test suite for the time-indexed check history.
+
+Tests per-file history, time range queries, regressions between two
+points in time, directory aggregates and out-of-order inserts, plus
+query latency on a 100k-file history.
+"""
+
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from quality_monitor.history_store import CheckHistoryStore
+from quality_monitor.quality_monitor import LearningSystem
+
+DAY = 86400.0
+
+@pytest.fixture
+def store():
+    """Three days of checks: api files get worse, ui files improve."""
+    store = CheckHistoryStore()
+    for day in range(3):
+        for i in range(4):
+            store.record(f"api/mod_{i}.py", day * DAY + i, issues=i + day * (i + 1), lines=100)
+            store.record(f"ui/view_{i}.py", day * DAY + i, issues=6 - 2 * day, lines=50)
+    return store
+
+def test_last_checks_newest_first(store):
+    """Test per-file history without scanning other files."""
+    checks = store.last_checks("api/mod_3.py", n=2)
+    assert [c["issues_found"] for c in checks] == [11, 7]
+    assert checks[0]["timestamp"] == datetime.fromtimestamp(2 * DAY + 3).isoformat()
+    assert store.last_checks("missing.py") == []
+
+def test_checks_between(store):
+    """Test range queries are half-open and time ordered."""
+    day_two = store.checks_between(DAY, 2 * DAY)
+    assert len(day_two["file_id"]) == 8
+    assert np.all(np.diff(day_two["timestamp"]) >= 0)
+    assert [store.files[i] for i in day_two["file_id"][:2]] == ["api/mod_0.py", "ui/view_0.py"]
+
+def test_top_regressions(store):
+    """Test files ranked by issue growth between two points."""
+    worst = store.top_regressions(since=0.5 * DAY, n=2)
+    assert worst == [
+        {"file": "api/mod_3.py", "before": 3, "after": 11, "delta": 8},
+        {"file": "api/mod_2.py", "before": 2, "after": 8, "delta": 6}
+    ]
+    assert store.top_regressions(since=DAY + 10, until=DAY + 20) == []
+    # Files first seen after `since` have no baseline
+    store.record("api/new.py", 2.5 * DAY, issues=9)
+    assert "api/new.py" not in [r["file"] for r in store.top_regressions(since=DAY)]
+
+def test_directory_aggregates_follow_latest_checks(store):
+    """Test aggregates reflect each file's latest result."""
+    aggregates = store.directory_aggregates()
+    assert aggregates["api"] == {"files": 4, "checks": 12, "issues": 26, "mean_issues": 6.5}
+    assert aggregates["ui"]["issues"] == 8
+
+    store.record("api/mod_0.py", 3 * DAY, issues=4)
+    assert store.directory_aggregates()["api"]["issues"] == 28
+
+def test_out_of_order_results(store):
+    """Test a late-arriving older result joins history without becoming latest."""
+    store.record("ui/view_0.py", 1.5 * DAY, issues=40)
+    assert [c["issues_found"] for c in store.last_checks("ui/view_0.py", 3)] == [2, 40, 4]
+    assert store.directory_aggregates()["ui"]["issues"] == 8
+    assert len(store.checks_between(1.5 * DAY, 1.6 * DAY)["file_id"]) == 1
+    assert store.top_regressions(since=DAY, until=1.75 * DAY)[0]["file"] == "ui/view_0.py"
+
+def test_learning_system_feeds_history():
+    """Test effectiveness tracking also indexes the check."""
+    system = LearningSystem()
+    system._update_effectiveness("pkg/a.py", [{"type": "STYLE"}], {"lines": 12})
+    assert system.history.last_checks("pkg/a.py") == [dict(
+        file="pkg/a.py", timestamp=system.patterns["effectiveness"]["pkg/a.py"][0]["timestamp"],
+        issues_found=1, lines=12
+    )]
+
+def test_queries_fast_at_scale():
+    """Test queries answer in milliseconds across 100k files."""
+    store, files = CheckHistoryStore(), 100_000
+    issues = np.random.default_rng(7).integers(0, 10, size=(2, files))
+    for day in range(2):
+        for i in range(files):
+            store.record(f"pkg{i % 500}/mod_{i}.py", day * DAY + i * 0.1, int(issues[day, i]))
+
+    for query in (lambda: store.top_regressions(since=DAY - 1, n=20),
+                  lambda: store.checks_between(0.5 * DAY, 1.5 * DAY),
+                  lambda: store.directory_aggregates(),
+                  lambda: store.last_checks("pkg7/mod_7.py")):
+        query()
+        started = time.perf_counter()
+        query()
+        assert time.perf_counter() - started < 0.05
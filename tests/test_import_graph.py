@@ -0,0 +1,142 @@
+"""
+Test suite for the import graph.
+
+Tests module resolution, that only importers using a changed export are
+queued, reporting of imports broken by a rename, watcher re-checks of
+dependents, deleted and moved files being forgotten, and update and
+query speed on a large project.
+"""
+
+import ast
+import time
+from types import SimpleNamespace
+
+from quality_monitor.file_monitor import FileChangeHandler
+from quality_monitor.import_graph import ImportGraph, module_name
+from quality_monitor.scheduler import PRIORITY_BACKGROUND
+
+UTILS = '''
+def parse(text):
+    """Parse text."""
+    return text.split()
+
+def render(items):
+    return " ".join(items)
+'''
+
+def index(graph, files):
+    for path, source in files.items():
+        graph.update_file(path, ast.parse(source))
+
+def test_module_names_and_relative_imports(tmp_path):
+    """Test paths map to dotted modules and relative imports resolve."""
+    assert module_name(str(tmp_path / "pkg" / "sub" / "mod.py"), tmp_path) == "pkg.sub.mod"
+    assert module_name(str(tmp_path / "pkg" / "__init__.py"), tmp_path) == "pkg"
+
+    graph = ImportGraph(root=tmp_path)
+    utils, app = str(tmp_path / "pkg" / "utils.py"), str(tmp_path / "pkg" / "app.py")
+    index(graph, {utils: UTILS, app: "from .utils import parse\n"})
+    assert graph.dependents(utils) == [app]
+    assert graph.dependencies(app) == [utils]
+
+def test_only_importers_of_changed_names_are_queued(tmp_path):
+    """Test an edit queues importers that use the changed export, or all of it."""
+    graph = ImportGraph(root=tmp_path)
+    utils = str(tmp_path / "utils.py")
+    uses_parse, uses_render, whole = (str(tmp_path / f"{name}.py") for name in ("a", "b", "c"))
+    index(graph, {
+        uses_parse: "from utils import parse\n",
+        uses_render: "from utils import render\n",
+        whole: "import utils\n",
+    })
+    assert graph.take_pending() == []
+    graph.update_file(utils, ast.parse(UTILS))
+    assert set(graph.take_pending()) == {uses_parse, uses_render, whole}  # New module
+
+    # Body-only edit: no export changed, nothing to re-check
+    assert graph.update_file(utils, ast.parse(UTILS.replace("split()", "split(',')"))) == []
+    # A docstring added to render affects its importers only
+    edited = UTILS.replace("def render(items):\n", 'def render(items):\n    """Render."""\n')
+    assert graph.update_file(utils, ast.parse(edited)) == [uses_render, whole]
+    assert graph.take_pending() == [uses_render, whole]
+
+    assert graph.dependents(utils, transitive=True) == [uses_parse, uses_render, whole]
+    assert set(graph.remove_file(utils)) == {uses_parse, uses_render, whole}
+
+def test_renamed_symbol_is_reported_in_importer(tmp_path):
+    """Test importing a name the module no longer defines is an issue."""
+    graph = ImportGraph(root=tmp_path)
+    utils, app = str(tmp_path / "utils.py"), str(tmp_path / "app.py")
+    app_tree = ast.parse("from utils import parse, render\n")
+    index(graph, {utils: UTILS})
+    graph.update_file(app, app_tree)
+    assert graph.missing_imports(app, app_tree) == []
+
+    graph.update_file(utils, ast.parse(UTILS.replace("def parse", "def tokenize")))
+    issues = graph.missing_imports(app, app_tree)
+    assert [issue["message"] for issue in issues] == ["'parse' is not defined in module 'utils'"]
+
+    # Modules with dynamic exports are not judged
+    graph.update_file(utils, ast.parse(UTILS + "def __getattr__(name):\n    return name\n"))
+    assert graph.missing_imports(app, ast.parse("from utils import anything\n")) == []
+
+def test_watcher_rechecks_affected_dependents(tmp_path, monkeypatch):
+    """Test a rename queues the importer in the background and flags it."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "utils.py").write_text(UTILS)
+    (tmp_path / "app.py").write_text('"""App."""\nfrom utils import parse\n')
+    handler = FileChangeHandler()
+    for name in ("utils.py", "app.py"):
+        handler.on_modified(SimpleNamespace(src_path=str(tmp_path / name), is_directory=False))
+    assert handler.scheduler.depth() == 0
+
+    (tmp_path / "utils.py").write_text(UTILS.replace("def parse", "def tokenize"))
+    handler.on_modified(SimpleNamespace(src_path=str(tmp_path / "utils.py"), is_directory=False))
+    assert handler.scheduler.depth(PRIORITY_BACKGROUND) == 1
+
+    handler.scheduler.run_pending()
+    issues = handler.quality_monitor.issues[str(tmp_path / "app.py")]
+    assert any(issue["category"] == "Imports" for issue in issues)
+
+def test_watcher_forgets_deleted_and_moved_files(tmp_path, monkeypatch):
+    """Test a move re-indexes the file under its new path and a delete drops it."""
+    monkeypatch.chdir(tmp_path)
+    utils, helpers, app = tmp_path / "utils.py", tmp_path / "helpers.py", tmp_path / "app.py"
+    utils.write_text(UTILS)
+    app.write_text('"""App."""\nfrom utils import parse\n')
+    handler = FileChangeHandler()
+    monitor = handler.quality_monitor
+    for path in (utils, app):
+        handler.on_modified(SimpleNamespace(src_path=str(path), is_directory=False))
+    functions = len(monitor.metrics_store)
+    assert functions == 2
+
+    utils.rename(helpers)
+    handler.on_moved(SimpleNamespace(src_path=str(utils), dest_path=str(helpers),
+                                     is_directory=False))
+    assert str(utils) not in monitor.issues and str(helpers) in monitor.issues
+    assert len(monitor.metrics_store) == functions
+    assert handler.scheduler.depth(PRIORITY_BACKGROUND) == 1  # app.py lost its import
+    handler.scheduler.run_pending()
+
+    helpers.unlink()
+    handler.on_deleted(SimpleNamespace(src_path=str(helpers), is_directory=False))
+    assert str(helpers) not in monitor.issues
+    assert len(monitor.metrics_store) == 0 and len(monitor.import_graph) == 1
+
+def test_updates_and_queries_stay_fast_at_scale(tmp_path):
+    """Test a 10k-module graph answers hot-path updates in well under a millisecond."""
+    graph = ImportGraph(root=tmp_path)
+    trees = [ast.parse(f"from pkg{i % 50}.mod_{(i * 7) % 10_000} import helper\n"
+                       f"def helper():\n    return {i}\n") for i in range(10_000)]
+    for i, tree in enumerate(trees):
+        graph.update_file(str(tmp_path / f"pkg{i % 50}" / f"mod_{i}.py"), tree)
+    graph.take_pending()
+
+    started = time.perf_counter()
+    for i in range(1000):
+        path = str(tmp_path / f"pkg{i % 50}" / f"mod_{i}.py")
+        graph.update_file(path, trees[i])
+        graph.dependents(path)
+    assert time.perf_counter() - started < 0.5
+    assert len(graph) == 10_000
@@ -0,0 +1,78 @@
+"""
+Test suite for source file ingestion.
+
+Tests encoding cookies, generated and vendored code detection, the
+memory-mapped path and the degraded line-based mode for large files.
+"""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from config.quality_standards import INGESTION_LIMITS
+from quality_monitor.context import MODE_FULL, MODE_LINES, MODE_SKIP
+from quality_monitor.ingestion import ingest_file
+from quality_monitor.quality_monitor import QualityMonitor
+
+@pytest.fixture
+def tmpdir_path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+def test_pep263_cookie_is_honoured(tmpdir_path):
+    """Test latin-1 sources decode by their cookie and newlines normalize."""
+    path = tmpdir_path / "legacy.py"
+    path.write_bytes(b"# -*- coding: latin-1 -*-\r\nNAME = 'caf\xe9'\r\n")
+    context = ingest_file(path)
+    assert context.encoding == "iso-8859-1"
+    assert context.lines[1] == "NAME = 'café'"
+    assert context.mode == MODE_FULL
+
+def test_generated_and_vendored_files_are_skipped(tmpdir_path):
+    """Test header sniffing and vendored directories."""
+    generated = tmpdir_path / "service_pb2.py"
+    generated.write_text("# Generated by the protocol buffer compiler.  DO NOT EDIT!\nx = 1\n")
+    vendored = tmpdir_path / "third_party" / "lib.py"
+    vendored.parent.mkdir()
+    vendored.write_text("x = 1\n")
+
+    assert ingest_file(generated).mode == MODE_SKIP
+    assert "generated" in ingest_file(generated).note
+    assert ingest_file(vendored).mode == MODE_SKIP
+
+def test_markers_outside_the_header_comments_are_ignored(tmpdir_path):
+    """Test markers in docstrings and string literals do not skip a file."""
+    path = tmpdir_path / "writer.py"
+    path.write_text('#!/usr/bin/env python\n"""Writes files marked DO NOT EDIT."""\n'
+                    'HEADER = "# @generated by writer.py"\n')
+    assert ingest_file(path).mode == MODE_FULL
+
+    project = Path(__file__).resolve().parent.parent
+    sources = [p for d in ("config", "quality_monitor", "tests") for p in (project / d).glob("*.py")]
+    assert [p.name for p in sources if ingest_file(p).mode == MODE_SKIP] == []
+
+def test_large_files_are_mapped_and_degraded(tmpdir_path, monkeypatch):
+    """Test mmap ingestion and the size limits."""
+    monkeypatch.setitem(INGESTION_LIMITS, "mmap_min_bytes", 64)
+    monkeypatch.setitem(INGESTION_LIMITS, "max_full_check_bytes", 1024)
+    monkeypatch.setitem(INGESTION_LIMITS, "max_read_bytes", 4096)
+    source = "def f():\n    try:\n        pass\n    except:\n        pass\n" * 30
+    path = tmpdir_path / "big.py"
+    path.write_text(source, encoding="utf-8-sig")
+
+    context = ingest_file(path)
+    assert context.mode == MODE_LINES
+    assert context.content.startswith("def f():")
+
+    monitor = QualityMonitor()
+    monitor.check_file(path)
+    issues = monitor.issues[str(path)]
+    assert issues[0]["category"] == "Size"
+    assert sum(i["category"] == "ErrorHandling" for i in issues) == 30
+
+    path.write_text(source * 3, encoding="utf-8")
+    monitor.check_file(path)
+    assert str(path) not in monitor.issues
+    assert "too large" in monitor.skipped[str(path)]
+    assert "Skipped Files (1)" in monitor.generate_report()
@@ -0,0 +1,86 @@
+"""
+Test suite for merging learning state across monitor processes.
+
+Tests that replicas syncing through a shared directory converge on the
+state a single learner would reach, that late joiners catch up and that
+half-written log lines are left for the next sync.
+"""
+
+import json
+
+import pytest
+
+from quality_monitor.context import AnalysisContext
+from quality_monitor.learning_sync import COUNTER_KEYS, LearningSync
+from quality_monitor.quality_monitor import LearningSystem
+
+FILES = {
+    f"pkg{i % 3}/mod_{i}.py": (
+        f"def handler_{i}(data):\n    result = process(data)\n    return result\n",
+        [{"type": "STYLE", "category": "Naming"}] if i % 2 else []
+    )
+    for i in range(9)
+}
+
+def learn(system, names):
+    for name in names:
+        code, issues = FILES[name]
+        metrics = [{"body_length": 2 + len(name), "nesting_depth": 1, "docstring_words": 0}]
+        system.learn_from_file(name, issues, {"lines": 3}, metrics, AnalysisContext(code, name))
+
+def state(system):
+    return (
+        {key: system.patterns[key] for key in COUNTER_KEYS},
+        {metric: sketch.to_dict() for metric, sketch in system.metric_sketches.items()},
+        {path: len(history) for path, history in system.patterns["effectiveness"].items()}
+    )
+
+@pytest.fixture
+def replicas(tmp_path):
+    systems = [LearningSystem() for _ in range(3)]
+    syncs = [LearningSync(s, tmp_path, replica_id=f"r{i}") for i, s in enumerate(systems)]
+    names = sorted(FILES)
+    for i, system in enumerate(systems):
+        learn(system, names[i::3])
+    return systems, syncs
+
+def test_replicas_converge_to_single_learner(replicas):
+    """Test two sync rounds give every replica the combined state."""
+    systems, syncs = replicas
+    for _ in range(2):
+        for sync in syncs:
+            sync.sync()
+
+    single = LearningSystem()
+    learn(single, sorted(FILES))
+    for system in systems:
+        assert state(system) == state(single)
+    assert systems[0].beliefs.file_rate("STYLE:Naming").mean == \
+        single.beliefs.file_rate("STYLE:Naming").mean
+
+    # Applied deltas are not published again
+    assert [sync.stats["published"] for sync in syncs] == [1, 1, 1]
+    assert all(sync.delta() == {} for sync in syncs)
+
+def test_late_joiner_catches_up(replicas, tmp_path):
+    """Test a new replica reads every log from the start."""
+    systems, syncs = replicas
+    for sync in syncs:
+        sync.sync()
+    newcomer = LearningSystem()
+    assert LearningSync(newcomer, tmp_path, replica_id="new").sync() == {
+        "published": False, "applied": 3
+    }
+    assert sum(newcomer.patterns["issue_patterns"].values()) == 4
+
+def test_partial_line_waits_for_next_sync(tmp_path):
+    """Test a line still being written is applied once complete."""
+    reader = LearningSync(LearningSystem(), tmp_path, replica_id="reader")
+    line = json.dumps({"replica": "w", "delta": {"counters": {"issue_patterns": {"STYLE:Naming": 2}}}})
+    log_file = tmp_path / "writer.jsonl"
+    log_file.write_text(line[:20])
+    assert reader.sync()["applied"] == 0
+
+    log_file.write_text(line + "\n")
+    assert reader.sync()["applied"] == 1
+    assert reader.learning.patterns["issue_patterns"] == {"STYLE:Naming": 2}
@@ -134,5 +134,66 @@ def test_adaptation(learning_system):
     assert len(adjustments) > 0
     assert all(isinstance(adj["confidence"], float) for adj in adjustments)
 
+def test_percentile_thresholds(learning_system):
+    """Test thresholds proposed from observed function metrics."""
+    function_metrics = [
+        {"body_length": 5 + i % 10, "nesting_depth": i % 3, "docstring_words": 20}
+        for i in range(100)
+    ]
+    learning_system._update_metric_sketches(function_metrics)
+    learning_system._adapt_thresholds()
+    
+    adjustments = {
+        adj["threshold"]: adj
+        for adj in learning_system.patterns["threshold_adjustments"]["adjustments"]
+    }
+    assert adjustments["max_function_lines"]["suggested"] == 14
+    assert adjustments["max_nested_depth"]["suggested"] == 2
+    assert adjustments["min_docstring_words"]["suggested"] == 20
+    assert adjustments["max_function_lines"]["samples"] == 100
+
+def test_bayesian_beliefs(learning_system):
+    """Test posterior updates, directory scopes and cached predictions."""
+    nesting = {"type": "CRITICAL", "category": "Nesting"}
+    for i in range(10):
+        learning_system.beliefs.observe_file(f"api/mod_{i}.py", [nesting])
+        learning_system.beliefs.observe_file(f"ui/mod_{i}.py", [])
+    learning_system._update_issue_patterns([nesting] * 10)
+    
+    rate = learning_system.beliefs.file_rate("CRITICAL:Nesting")
+    assert rate.mean == pytest.approx(11 / 22)
+    low, high = rate.interval()
+    assert low < rate.mean < high
+    
+    api = learning_system._predict_potential_issues("", file_path="api/new.py")
+    ui = learning_system._predict_potential_issues("", file_path="ui/new.py")
+    assert api[0]["confidence"] > 0.8
+    assert ui[0]["confidence"] < 0.2
+    
+    # Served from cache until new evidence arrives
+    cached = learning_system.beliefs.predictions("api")
+    assert learning_system.beliefs.predictions("api") is cached
+    learning_system.beliefs.observe_file("ui/other.py", [])
+    assert learning_system.beliefs.predictions("api") is cached  # Other scope
+    learning_system._update_issue_patterns([nesting])
+    assert learning_system.beliefs.predictions("api") is cached
+    assert cached[0]["count"] == 11 and cached[0]["share"] == pytest.approx(12 / 13)
+    learning_system.beliefs.observe_file("api/other.py", [])
+    assert learning_system.beliefs.predictions("api") is not cached
+    
+    # The prior covers every issue type, not only the ones seen so far
+    assert learning_system.beliefs.category_types("Nesting") == pytest.approx(
+        {"CRITICAL": 12 / 14, "IMPORTANT": 1 / 14, "STYLE": 1 / 14}
+    )
+
+def test_confidence_grows_with_evidence(learning_system):
+    """Test that confidence reflects how settled beliefs are."""
+    assert learning_system._calculate_learning_confidence() == 0.0
+    learning_system.beliefs.observe_file("a.py", [])
+    early = learning_system._calculate_learning_confidence()
+    for i in range(50):
+        learning_system.beliefs.observe_file(f"b{i}.py", [])
+    assert 0 < early < learning_system._calculate_learning_confidence() <= 1
+
 if __name__ == "__main__":
-    pytest.main([__file__]) 
\ No newline at end of file
+    pytest.main([__file__]) 
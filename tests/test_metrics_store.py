@@ -0,0 +1,121 @@
+"""
+Test suite for the columnar Function Metrics Store.
+
+Tests per-function rows, issue attribution, vectorized aggregates
+and persistence, on its own and across QualityMonitor restarts.
+"""
+
+import ast
+import tempfile
+from pathlib import Path
+
+from quality_monitor.checkers import collect_function_metrics
+from quality_monitor.metrics_store import FunctionMetricsStore
+from quality_monitor.quality_monitor import QualityMonitor
+
+SAMPLE_CODE = '''
+def documented(values):
+    """Return the total of all values passed in by the caller."""
+    return sum(values)
+
+def nested(a):
+    try:
+        if a:
+            for i in a:
+                if i:
+                    while i:
+                        i -= 1
+    except:
+        pass
+'''
+
+def make_store():
+    """Build a store holding the sample file twice under different names."""
+    store = FunctionMetricsStore()
+    metrics = collect_function_metrics(ast.parse(SAMPLE_CODE))
+    issues = [
+        {"type": "IMPORTANT", "line": 6},
+        {"type": "IMPORTANT", "line": 13},
+        {"type": "STYLE", "line": 2}
+    ]
+    store.update_file("a.py", metrics, issues)
+    store.update_file("b.py", metrics, [])
+    return store
+
+def test_rows_and_issue_attribution():
+    """Test that issues are counted against their enclosing function."""
+    store = make_store()
+    assert len(store) == 4
+
+    worst = store.top_worst(1)[0]
+    assert worst["file"] == "a.py"
+    assert worst["name"] == "nested"
+    assert worst["score"] == 70
+
+def test_update_replaces_file_rows():
+    """Test that re-checking a file replaces its previous rows."""
+    store = make_store()
+    store.update_file("a.py", [], [])
+    assert len(store) == 2
+    assert store.aggregates()["files"] == 1
+    assert all(f["file"] == "b.py" for f in store.top_worst(5))
+
+def test_aggregates_and_distribution():
+    """Test vectorized project-wide aggregates."""
+    store = make_store()
+    summary = store.aggregates()
+    assert summary["functions"] == 4
+    assert summary["nesting_depth"]["max"] == 5
+    assert summary["over_nesting"] == 2
+    assert summary["issues"]["important_issues"] == 2
+
+    distribution = store.score_distribution(bins=10)
+    assert sum(distribution["counts"]) == 4
+    assert distribution["counts"][-1] == 3
+
+def test_growth_compaction_and_persistence():
+    """Test many updates, then a save/load round trip."""
+    store = FunctionMetricsStore()
+    metrics = collect_function_metrics(ast.parse(SAMPLE_CODE))
+    for round_number in range(5):
+        for i in range(600):
+            store.update_file(f"mod_{i}.py", metrics, [])
+    assert len(store) == 1200
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        target = Path(tmpdir) / "metrics.npz"
+        store.save(target)
+        restored = FunctionMetricsStore.load(target)
+    assert len(restored) == 1200
+    assert restored.aggregates() == store.aggregates()
+
+    restored.update_file("mod_0.py", [], [])
+    assert len(restored) == 1198
+
+def test_monitor_populates_store():
+    """Test that check_file feeds the store and the report."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source = Path(tmpdir) / "sample.py"
+        source.write_text(SAMPLE_CODE, encoding="utf-8")
+        monitor = QualityMonitor()
+        monitor.check_file(source)
+
+    assert monitor.metrics_store.aggregates()["functions"] == 2
+    assert "Worst Functions" in monitor.generate_report()
+
+def test_monitor_persists_store_across_restarts(tmp_path, monkeypatch):
+    """Test a monitor with a metrics file saves on close and reloads on start."""
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / "sample.py"
+    source.write_text(SAMPLE_CODE, encoding="utf-8")
+    metrics_file = tmp_path / "metrics.npz"
+
+    monitor = QualityMonitor(metrics_file=metrics_file)
+    monitor.check_file(source)
+    assert not metrics_file.exists()  # Checkpoints are rate limited
+    monitor.close()
+
+    restarted = QualityMonitor(metrics_file=metrics_file)
+    assert restarted.metrics_store.aggregates() == monitor.metrics_store.aggregates()
+    assert restarted.metrics_store.top_worst(1)[0]["name"] == "nested"
+    assert restarted.metrics_store.maybe_save(interval=0) is False  # Nothing new to save
@@ -0,0 +1,136 @@
+"""
+Test suite for the asyncio quality pipeline.
+
+Tests the flow from submitted paths through checks, AI analysis and report
+sinks, along with coalescing, concurrency limits, the watchdog bridge and
+removal of deleted or moved files.
+"""
+
+import asyncio
+import tempfile
+from pathlib import Path
+
+import pytest
+from watchdog.events import FileModifiedEvent, FileMovedEvent
+
+from quality_monitor.pipeline import (
+    STAGE_AI,
+    STAGE_CHECK,
+    STAGE_REPORT,
+    QualityPipeline,
+    WatchdogBridge
+)
+
+class StubAnalyzer:
+    """Tracks how many analyses overlap."""
+
+    def __init__(self):
+        self.active = self.peak = self.calls = 0
+
+    async def analyze_code(self, code, model=None, context=None):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return {"score": 90, "issues": [], "suggestions": [], "source": "ai"}
+
+@pytest.fixture
+def source_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for i in range(6):
+            path = Path(tmpdir) / f"module_{i}.py"
+            path.write_text(f"def handler_{i}(event):\n    return event + {i}\n", encoding="utf-8")
+            paths.append(str(path))
+        yield paths
+
+@pytest.mark.asyncio
+async def test_events_flow_through_every_stage(source_files):
+    """Test checks, bounded AI concurrency and latency accounting."""
+    reported = []
+
+    async def collect(event):
+        reported.append(event)
+
+    analyzer = StubAnalyzer()
+    pipeline = QualityPipeline(analyzer=analyzer, sinks=[collect], ai_concurrency=2, queue_size=2)
+    await pipeline.start()
+    for path in source_files:
+        await pipeline.submit(path)
+    await pipeline.stop()
+
+    assert sorted(e.file_path for e in reported) == sorted(source_files)
+    assert analyzer.calls == 6 and analyzer.peak <= 2
+    event = reported[0]
+    assert event.issues and event.ai_result["score"] == 90
+    assert event.timings[STAGE_CHECK] <= event.timings[STAGE_AI] <= event.timings[STAGE_REPORT]
+    metrics = pipeline.metrics()
+    assert metrics["completed"] == 6
+    assert metrics["latency_ms"]["p99"] >= metrics["latency_ms"]["p50"] > 0
+    assert metrics["depths"] == {STAGE_CHECK: 0, STAGE_AI: 0, STAGE_REPORT: 0}
+
+@pytest.mark.asyncio
+async def test_repeated_events_are_coalesced_and_sink_errors_isolated(source_files):
+    """Test a path waiting for its check is queued once and a bad sink is contained."""
+    reported = []
+
+    async def broken(event):
+        raise RuntimeError("disk full")
+
+    async def collect(event):
+        reported.append(event.file_path)
+
+    pipeline = QualityPipeline(sinks=[broken, collect])
+    await pipeline.start()
+    assert await pipeline.submit(source_files[0])
+    assert not await pipeline.submit(source_files[0])
+    await pipeline.drain()
+    assert await pipeline.submit(source_files[0])  # Checked since, so queued again
+    await pipeline.stop()
+
+    assert reported == [source_files[0]] * 2
+    assert pipeline.stats["coalesced"] == 1
+    assert pipeline.stats["sink_errors"] == 2
+
+@pytest.mark.asyncio
+async def test_watchdog_bridge_submits_from_observer_thread(source_files):
+    """Test events raised on another thread reach the loop."""
+    reported = []
+
+    async def collect(event):
+        reported.append(event.file_path)
+
+    pipeline = QualityPipeline(sinks=[collect])
+    await pipeline.start()
+    bridge = WatchdogBridge(pipeline, asyncio.get_running_loop())
+    await asyncio.to_thread(bridge.on_modified, FileModifiedEvent(source_files[1]))
+    await asyncio.to_thread(bridge.on_modified, FileModifiedEvent(source_files[1] + ".txt"))
+    await pipeline.stop()
+    assert reported == [source_files[1]]
+
+@pytest.mark.asyncio
+async def test_moved_file_is_removed_and_importers_rechecked(tmp_path, monkeypatch):
+    """Test a rename drops the old path, checks the new one and re-checks importers."""
+    monkeypatch.chdir(tmp_path)
+    base, core, user = tmp_path / "base.py", tmp_path / "core.py", tmp_path / "user.py"
+    base.write_text("def helper(value):\n    return value\n")
+    user.write_text("from base import helper\n\nRESULT = helper(1)\n")
+    reported = []
+
+    async def collect(event):
+        reported.append((event.file_path, event.removed))
+
+    pipeline = QualityPipeline(sinks=[collect])
+    await pipeline.start()
+    for path in (base, user):
+        await pipeline.submit(str(path))
+    await pipeline.drain()
+
+    base.rename(core)
+    bridge = WatchdogBridge(pipeline, asyncio.get_running_loop())
+    await asyncio.to_thread(bridge.on_moved, FileMovedEvent(str(base), str(core)))
+    await pipeline.stop()
+    assert sorted(reported[2:]) == [(str(base), True), (str(core), False), (str(user), False)]
+    assert str(base) not in pipeline.monitor.issues
+    assert pipeline.monitor.import_graph.dependents(str(core)) == []
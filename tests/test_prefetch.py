@@ -0,0 +1,92 @@
+"""
+Test suite for speculative pre-analysis.
+
+Tests co-edit learning from live events and the coordination log, that
+warm-ups fill caches without learning, and that a claim queues the file
+and its import neighbours at idle priority.
+"""
+
+from quality_monitor.coordination import CoordinationBus, normalize_path
+from quality_monitor.file_monitor import FileChangeHandler
+from quality_monitor.prefetch import CoEditIndex
+from quality_monitor.quality_monitor import QualityMonitor
+from quality_monitor.scheduler import PRIORITY_IDLE
+
+MODELS = '''
+class User:
+    """A registered user of the service, identified by a unique email."""
+'''
+
+VIEWS = '''
+from models import User
+
+def profile(email):
+    """Render the profile page of the user registered with this email."""
+    return User()
+'''
+
+def test_co_edits_count_sessions_not_saves():
+    """Test pairs within the window count once per session and need repeats."""
+    index = CoEditIndex({"co_edit_window_seconds": 60, "co_edit_min_count": 2})
+    for save in range(5):  # One session with many saves
+        index.observe("agent_1", "models.py", 10 + save)
+        index.observe("agent_1", "views.py", 11 + save)
+    index.observe("agent_2", "tests.py", 12)  # Other agent: not a co-edit
+    assert index.related("models.py") == []
+
+    index.observe("agent_1", "models.py", 1000)
+    index.observe("agent_1", "views.py", 1030)
+    assert index.related("models.py") == ["views.py"]
+    assert index.related("views.py") == ["models.py"]
+
+def test_co_edits_learned_from_log(tmp_path):
+    """Test modification history in the coordination log is replayed."""
+    bus = CoordinationBus(log_file=tmp_path / "log.jsonl")
+    for _ in range(2):
+        bus.publish("file", "agent_1", "modified", "a.py")
+        bus.publish("file", "agent_1", "modified", "b.py")
+    bus.close()
+
+    index = CoEditIndex({"co_edit_min_count": 1})
+    assert index.learn_log(tmp_path / "log.jsonl") == 4
+    assert index.related(normalize_path("a.py")) == [normalize_path("b.py")]
+
+def test_prefetch_warms_without_learning(tmp_path, monkeypatch):
+    """Test a warm-up fills the rule cache but is not learned from."""
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / "models.py"
+    source.write_text(MODELS)
+    monitor = QualityMonitor()
+
+    assert monitor.prefetch(str(source)) is True
+    assert monitor.prefetch(str(source)) is False  # Already warm
+    assert str(source) in monitor.issues
+    assert str(source) not in monitor.learning_system.patterns["effectiveness"]
+
+    hits = monitor.registry.cache_stats["hits"]
+    monitor.check_file(str(source))
+    assert monitor.registry.cache_stats["hits"] == hits + 3
+    assert str(source) in monitor.learning_system.patterns["effectiveness"]
+
+def test_claim_prefetches_file_and_import_neighbours(tmp_path, monkeypatch):
+    """Test a claim queues idle warm-ups that run only when nothing else waits."""
+    monkeypatch.chdir(tmp_path)
+    models, views = tmp_path / "models.py", tmp_path / "views.py"
+    models.write_text(MODELS)
+    views.write_text(VIEWS)
+    handler = FileChangeHandler(bus=CoordinationBus(log_file=None))
+    monitor = handler.quality_monitor
+    for path in (models, views):
+        monitor.check_file(str(path))
+    checks = len(monitor.learning_system.patterns["effectiveness"][str(views)])
+
+    views.write_text(VIEWS + "\n# Edited by another agent\n")
+    handler.bus.claim(str(models), "agent_1")
+    # models.py is queued as a claimed check; its importer views.py at idle priority
+    assert handler.scheduler.depth(PRIORITY_IDLE) == 1
+    assert handler.prefetcher.stats["queued"] == 2
+
+    handler.scheduler.run_pending()
+    assert handler.scheduler.depth() == 0
+    assert monitor.prefetch(str(views)) is False  # Warmed
+    assert len(monitor.learning_system.patterns["effectiveness"][str(views)]) == checks
@@ -0,0 +1,46 @@
+"""
+Test suite for streaming quantile sketches.
+
+Tests accuracy, merging and compact serialization.
+"""
+
+import random
+
+import pytest
+
+from quality_monitor.quantiles import QuantileSketch
+
+def test_quantiles_within_relative_error():
+    """Test that estimates stay within the configured accuracy."""
+    rng = random.Random(7)
+    values = [rng.expovariate(0.05) for _ in range(5000)]
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+
+    values.sort()
+    for q in (0.1, 0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.03)
+
+def test_small_integers_are_exact():
+    """Test that integer metrics such as nesting depth come back exactly."""
+    sketch = QuantileSketch()
+    for value in [0, 0, 1, 1, 1, 2, 3, 4]:
+        sketch.add(value)
+    assert sketch.quantile(0.0) == 0.0
+    assert round(sketch.quantile(0.5)) == 1
+    assert round(sketch.quantile(1.0)) == 4
+
+def test_merge_and_round_trip():
+    """Test that merged sketches match one sketch fed everything."""
+    left, right, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in range(1, 500):
+        (left if value % 2 else right).add(value)
+        combined.add(value)
+
+    left.merge(right)
+    restored = QuantileSketch.from_dict(left.to_dict())
+    assert restored.count == combined.count
+    for q in (0.25, 0.5, 0.95):
+        assert restored.quantile(q) == combined.quantile(q)
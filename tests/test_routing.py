@@ -0,0 +1,125 @@
+"""
+Test suite for model routing across AI_MODELS tiers.
+
+Runs offline against a stub backend whose per-model answers and latency
+are scripted. Tests the starting tier, escalation, the learned
+routing thresholds and FAST recovering after it was turned off.
+"""
+
+import asyncio
+
+import pytest
+
+from config.ai_standards import AI_MODELS
+from quality_monitor.routing import ModelRouter
+
+CRITICAL = {"type": "CRITICAL", "category": "Security", "message": "eval", "suggestion": "Remove eval"}
+
+class StubBackend:
+    """Scripted per-model answers with simulated latency."""
+
+    def __init__(self, scores=None, issues=None, delays=None, confidences=None):
+        self.scores = scores or {}
+        self.confidences = confidences or {}
+        self.issues = issues or {}
+        self.delays = delays or {}
+        self.models = []
+
+    async def analyze_code(self, code, model=None, context=None):
+        self.models.append(model)
+        await asyncio.sleep(self.delays.get(model, 0))
+        result = {
+            "score": self.scores.get(model, 90),
+            "issues": list(self.issues.get(model, [])),
+            "suggestions": [],
+            "source": "ai"
+        }
+        if model in self.confidences:
+            result["confidence"] = self.confidences[model]
+        return result
+
+def code_of(lines):
+    return "\n".join(f"value_{i} = {i}" for i in range(lines))
+
+@pytest.mark.asyncio
+async def test_small_low_risk_changes_start_fast():
+    """Test the starting tier from size and risk."""
+    router, backend = ModelRouter(), StubBackend()
+    result = await router.analyze(backend, code_of(10))
+    assert result["tier"] == "FAST" and result["escalations"] == []
+
+    await router.analyze(backend, code_of(10), risk=0.9)
+    await router.analyze(backend, code_of(200), changed_lines=2)
+    await router.analyze(backend, code_of(200))
+    assert backend.models == [AI_MODELS["FAST"], AI_MODELS["DEFAULT"],
+                              AI_MODELS["FAST"], AI_MODELS["DEFAULT"]]
+
+@pytest.mark.asyncio
+async def test_escalation_on_critical_and_low_confidence():
+    """Test critical FAST findings jump to DETAILED; unsure results climb one tier."""
+    backend = StubBackend(issues={AI_MODELS["FAST"]: [CRITICAL]})
+    result = await ModelRouter().analyze(backend, code_of(5))
+    assert result["tier"] == "DETAILED"
+    assert result["escalations"] == [{"from": "FAST", "to": "DETAILED", "reason": "critical"}]
+
+    backend = StubBackend(confidences={AI_MODELS["FAST"]: 0.2, AI_MODELS["DEFAULT"]: 0.3})
+    result = await ModelRouter().analyze(backend, code_of(5))
+    assert [e["to"] for e in result["escalations"]] == ["DEFAULT", "DETAILED"]
+    assert result["model"] == AI_MODELS["DETAILED"]
+
+@pytest.mark.asyncio
+async def test_mid_range_score_alone_does_not_escalate():
+    """Test a confident mediocre score stays put; an incomplete answer climbs."""
+    backend = StubBackend(scores={AI_MODELS["FAST"]: 50}, confidences={AI_MODELS["FAST"]: 0.9})
+    result = await ModelRouter().analyze(backend, code_of(5))
+    assert result["tier"] == "FAST" and result["escalations"] == []
+    backend = StubBackend(scores={AI_MODELS["FAST"]: 50})  # No confidence reported
+    assert (await ModelRouter().analyze(backend, code_of(5)))["escalations"] == []
+
+    class PartialBackend(StubBackend):
+        async def analyze_code(self, code, model=None, context=None):
+            result = await super().analyze_code(code, model, context)
+            return dict(result, incomplete=True) if model == AI_MODELS["FAST"] else result
+
+    result = await ModelRouter().analyze(PartialBackend(), code_of(5))
+    assert result["escalations"] == [{"from": "FAST", "to": "DEFAULT", "reason": "incomplete"}]
+
+@pytest.mark.asyncio
+async def test_fast_limit_learned_from_disagreement():
+    """Test audits shrink the FAST limit where FAST disagrees with DEFAULT."""
+    backend = StubBackend(scores={AI_MODELS["FAST"]: 95, AI_MODELS["DEFAULT"]: 70},
+                          delays={AI_MODELS["DEFAULT"]: 0.01})
+    router = ModelRouter(policy={"audit_every": 1, "min_samples": 3})
+    for _ in range(3):
+        await router.analyze(backend, code_of(40))
+    assert router.stats["audits"] == 3
+    assert router.fast_max_lines == 31  # Below the 32-63 line bucket
+    assert (await router.analyze(backend, code_of(40)))["escalations"] == []
+    assert router.route(40) == "DEFAULT" and router.route(20) == "FAST"
+
+@pytest.mark.asyncio
+async def test_fast_disabled_when_not_faster():
+    """Test FAST is dropped when its latency is no better than DEFAULT's."""
+    backend = StubBackend(delays={AI_MODELS["FAST"]: 0.01, AI_MODELS["DEFAULT"]: 0.01})
+    router = ModelRouter(policy={"audit_every": 1, "min_samples": 2})
+    for _ in range(2):
+        await router.analyze(backend, code_of(10))
+    assert router.fast_max_lines == 0
+    assert router.route(1) == "DEFAULT"
+
+@pytest.mark.asyncio
+async def test_fast_recovers_through_probes():
+    """Test probes re-enable FAST once its recent latency beats DEFAULT's."""
+    backend = StubBackend(delays={AI_MODELS["FAST"]: 0.02, AI_MODELS["DEFAULT"]: 0.01})
+    router = ModelRouter(policy={"audit_every": 1, "min_samples": 2, "probe_every": 2,
+                                 "latency_window": 2})
+    for _ in range(2):
+        await router.analyze(backend, code_of(10))
+    assert router.fast_max_lines == 0
+
+    backend.delays[AI_MODELS["FAST"]] = 0
+    results = [await router.analyze(backend, code_of(10)) for _ in range(4)]
+    assert [r["tier"] for r in results[:2]] == ["DEFAULT", "DEFAULT"]  # Probe audited
+    assert results[1]["escalations"] == [{"from": "FAST", "to": "DEFAULT", "reason": "audit"}]
+    assert router.stats["probes"] == 2
+    assert router.fast_max_lines == 60 and router.route(10) == "FAST"
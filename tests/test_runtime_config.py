@@ -0,0 +1,92 @@
+"""
+Test suite for the runtime-reloadable configuration.
+
+Tests versioning and validation of reloaded settings, and that a running
+QualityMonitor applies a changed threshold by re-running only the rules
+that read it, queued behind the watcher's checks.
+"""
+
+import json
+from types import SimpleNamespace
+
+from quality_monitor.file_monitor import FileChangeHandler
+from quality_monitor.quality_monitor import QualityMonitor
+from quality_monitor.runtime_config import RuntimeConfig
+
+NESTED = '''
+def walk(items):
+    """Walk the nested items and print every positive value found in them."""
+    for item in items:
+        if item:
+            for value in item:
+                if value > 0:
+                    print(value)
+'''
+
+def write_overrides(config, overrides):
+    config.config_file.write_text(json.dumps(overrides))
+    return config.reload()
+
+def test_reload_versions_only_changed_settings(tmp_path):
+    """Test a reload bumps the version of changed settings only."""
+    config = RuntimeConfig(tmp_path / "overrides.json")
+    assert config.reload() == set() and config.version == 0
+
+    assert write_overrides(config, {"MAX_NESTED_DEPTH": 4}) == {"MAX_NESTED_DEPTH"}
+    assert config["MAX_NESTED_DEPTH"] == 4 and config.version == 1
+    assert config.stamp(["MAX_NESTED_DEPTH", "MAX_LINE_LENGTH"]) == (1, 0)
+
+    # Unknown names and wrong types are ignored; removed overrides revert
+    changed = write_overrides(config, {"MAX_LINE_LENGTH": "wide", "NOT_A_SETTING": 1})
+    assert changed == {"MAX_NESTED_DEPTH"} and config["MAX_NESTED_DEPTH"] == 3
+    assert config["MAX_LINE_LENGTH"] == 80
+
+    config.config_file.write_text("{not json")
+    assert config.reload() == set() and config.version == 2
+
+def test_maybe_reload_skips_unchanged_file(tmp_path):
+    """Test polling reads the file only after it changes."""
+    config = RuntimeConfig(tmp_path / "overrides.json")
+    (tmp_path / "overrides.json").write_text('{"MIN_DOCSTRING_WORDS": 3}')
+    assert config.maybe_reload() == {"MIN_DOCSTRING_WORDS"}
+    assert config.maybe_reload() == set()
+
+def test_monitor_reruns_only_affected_rules(tmp_path):
+    """Test a threshold change refreshes results without re-running other rules."""
+    config = RuntimeConfig(tmp_path / "overrides.json")
+    source = tmp_path / "walk.py"
+    source.write_text(NESTED)
+    monitor = QualityMonitor(config=config)
+    monitor.check_file(str(source))
+    assert any(issue["category"] == "Complexity" for issue in monitor.issues[str(source)])
+
+    calls = []
+    for checker in monitor.checkers:
+        original = checker.check
+        checker.check = lambda context, c=checker, f=original: calls.append(type(c).__name__) or f(context)
+
+    (tmp_path / "overrides.json").write_text('{"MAX_NESTED_DEPTH": 5}')
+    assert monitor.reload_config() == [str(source)]
+    assert not any(issue["category"] == "Complexity" for issue in monitor.issues[str(source)])
+    # Project-wide indexes always run
+    assert sorted(calls) == ["CloneIndex", "ComplexityChecker", "ImportGraph"]
+
+    calls.clear()
+    assert monitor.reload_config() == []
+    monitor.check_file(str(source))  # Unchanged content: configured rules are cached
+    assert calls == ["CloneIndex", "ImportGraph"]
+
+def test_watcher_reloads_on_check_worker(tmp_path, monkeypatch):
+    """Test a saved config file is reloaded as a scheduled job, not inline."""
+    handler = FileChangeHandler()
+    monitor = handler.quality_monitor
+    monkeypatch.setattr(monitor.config, "config_file", tmp_path / "overrides.json")
+    reloads = []
+    monkeypatch.setattr(monitor, "reload_config", lambda: reloads.append(True) or [])
+
+    handler.scheduler.running = True  # As if a worker were mid-check
+    handler.on_modified(SimpleNamespace(src_path=str(tmp_path / "overrides.json"), is_directory=False))
+    assert reloads == [] and handler.scheduler.depth() == 1
+
+    handler.scheduler.run_pending()
+    assert reloads == [True]
@@ -0,0 +1,92 @@
+"""
+Test suite for the Check Scheduler.
+
+Tests priority classes, fairness between agents, deadline ordering
+and per-class metrics.
+"""
+
+import time
+
+from quality_monitor.scheduler import (
+    CheckScheduler,
+    PRIORITY_BACKGROUND,
+    PRIORITY_CLAIMED,
+    PRIORITY_IDLE,
+    PRIORITY_INTERACTIVE
+)
+
+def make_scheduler():
+    """Create a scheduler that records the order files are checked in."""
+    order = []
+    return CheckScheduler(order.append), order
+
+def test_interactive_jumps_background_scan():
+    """Test that an edit is checked before a queued background scan."""
+    scheduler, order = make_scheduler()
+    for i in range(100):
+        scheduler.submit(f"bulk_{i}.py", PRIORITY_BACKGROUND)
+    scheduler.submit("claimed.py", PRIORITY_CLAIMED, agent="agent_1")
+    scheduler.submit("saved.py", PRIORITY_INTERACTIVE, agent="agent_2")
+
+    scheduler.run_pending(limit=2)
+    assert order == ["saved.py", "claimed.py"]
+    assert scheduler.depth(PRIORITY_BACKGROUND) == 100
+
+def test_agents_share_fairly():
+    """Test that agents take turns within a priority class."""
+    scheduler, order = make_scheduler()
+    for i in range(3):
+        scheduler.submit(f"a{i}.py", PRIORITY_CLAIMED, agent="agent_a")
+    scheduler.submit("b0.py", PRIORITY_CLAIMED, agent="agent_b")
+
+    scheduler.run_pending()
+    assert order.index("b0.py") <= 1
+
+def test_deadline_ordering_and_resubmit():
+    """Test EDF ordering within an agent and merging of repeated saves."""
+    scheduler, order = make_scheduler()
+    scheduler.submit("later.py", PRIORITY_CLAIMED, agent="agent_1", deadline=10.0)
+    scheduler.submit("sooner.py", PRIORITY_CLAIMED, agent="agent_1", deadline=1.0)
+    scheduler.submit("later.py", PRIORITY_BACKGROUND, agent="agent_1")
+
+    assert scheduler.depth() == 2
+    scheduler.run_pending()
+    assert order == ["sooner.py", "later.py"]
+
+def test_metrics_report_depth_and_wait():
+    """Test that per-class queue depth and wait time are exposed."""
+    scheduler, _ = make_scheduler()
+    scheduler.submit("one.py", PRIORITY_INTERACTIVE)
+    scheduler.submit("two.py", PRIORITY_BACKGROUND)
+    assert scheduler.metrics()["background"]["depth"] == 1
+
+    scheduler.run_pending()
+    metrics = scheduler.metrics()
+    assert metrics["interactive"]["completed"] == 1
+    assert metrics["interactive"]["mean_wait"] >= 0.0
+    assert metrics["background"]["depth"] == 0
+
+def test_idle_jobs_run_last_through_idle_check():
+    """Test speculative jobs wait for all other work and yield to real checks."""
+    order, warmed = [], []
+    scheduler = CheckScheduler(order.append, idle_check=warmed.append)
+    scheduler.submit("warm.py", PRIORITY_IDLE)
+    scheduler.submit("edited.py", PRIORITY_IDLE)
+    scheduler.submit("bulk.py", PRIORITY_BACKGROUND)
+    scheduler.submit("edited.py", PRIORITY_INTERACTIVE)  # Real save takes over
+    
+    scheduler.run_pending()
+    assert order == ["edited.py", "bulk.py"]
+    assert warmed == ["warm.py"]
+
+def test_background_worker():
+    """Test that the worker thread drains the queue."""
+    scheduler, order = make_scheduler()
+    scheduler.start()
+    scheduler.submit("threaded.py", PRIORITY_INTERACTIVE)
+    for _ in range(100):
+        if order:
+            break
+        time.sleep(0.01)
+    scheduler.stop(timeout=1.0)
+    assert order == ["threaded.py"]
@@ -0,0 +1,48 @@
+"""
+Test suite for the soak-test harness.
+
+Runs short edit storms against a real FileChangeHandler: one within the
+bounds, one with an injected leak that must be caught and attributed to
+the leaking subsystem.
+"""
+
+import itertools
+
+from quality_monitor.file_monitor import FileChangeHandler
+from quality_monitor.soak import SoakHarness
+
+SHORT_RUN = {"duration_seconds": 1.5, "warmup_seconds": 0.3, "sample_interval_seconds": 0.2,
+             "files": 10, "edits_per_burst": 5, "rounds": 3}
+
+def test_short_storm_within_bounds(tmp_path):
+    """Test a short storm reports latency, samples and no failures."""
+    report = SoakHarness(SHORT_RUN, root=tmp_path).run()
+    assert report["events"] >= 5
+    assert 0 < report["p50_ms"] <= report["p99_ms"]
+    assert len(report["samples"]) >= 3
+    assert all(sample["rss"] > 0 for sample in report["samples"])
+    assert report["failures"] == []
+
+def test_leak_is_caught_and_attributed(tmp_path):
+    """Test heap growth past the bound fails and names the subsystem."""
+    serial = itertools.count()
+
+    def leaky_handler(bus):
+        handler = FileChangeHandler(bus=bus)
+        learning = handler.quality_monitor.learning_system
+        check = handler.quality_monitor.check_file
+
+        def check_and_leak(file_path):
+            # Unique lines make the pattern table grow without bound
+            lines = [f"leaked_{next(serial)} = {'x' * 200!r}" for _ in range(20)]
+            learning._update_successful_patterns(lines)
+            return check(file_path)
+
+        handler.scheduler.run_check = check_and_leak
+        return handler
+
+    limits = dict(SHORT_RUN, max_traced_growth_mb=0.2, max_rss_growth_mb=1024)
+    report = SoakHarness(limits, root=tmp_path, handler_factory=leaky_handler).run()
+    assert len(report["failures"]) == 1
+    assert "quality_monitor.quality_monitor" in report["failures"][0]
+    assert next(iter(report["subsystem_growth"])) == "quality_monitor.quality_monitor"
@@ -0,0 +1,129 @@
+"""
+Test suite for streamed AI analysis.
+
+Tests the incremental issues parser on awkwardly split responses, the
+streaming analyzer against a fake completion stream (including one that
+fails midway), and partial results reaching IntegratedQualityChecker
+subscribers.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from config.ai_standards import AI_MODELS, RESET_ISSUES, AIQualityAnalyzer, IncrementalIssueParser
+from quality_monitor.ai_integration import (
+    EVENT_AI_ISSUE,
+    EVENT_RESULT,
+    EVENT_STANDARD_ISSUES,
+    IntegratedQualityChecker
+)
+from quality_monitor.gating import AIGate
+
+RESPONSE = {
+    "score": 62,
+    "issues": [
+        {"type": "CRITICAL", "category": "Security", "message": "eval() on \"input\" {raw}",
+         "suggestion": "Use ast.literal_eval", "lines": [3, 4]},
+        {"type": "STYLE", "category": "Naming", "message": "Name 'x' is too short \\ vague",
+         "suggestion": "Rename"}
+    ],
+    "suggestions": ["Validate input [early]"]
+}
+
+def chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def test_parser_emits_each_issue_when_complete():
+    """Test issues appear as soon as their closing brace arrives."""
+    text = json.dumps(RESPONSE, indent=2)
+    first_end = text.index('}', text.index('"lines"')) + 1
+    parser, emitted_at = IncrementalIssueParser(), []
+    for piece in chunks(text, 5):
+        for issue in parser.feed(piece):
+            emitted_at.append((len(parser.text), issue))
+
+    assert [issue for _, issue in emitted_at] == RESPONSE["issues"]
+    assert first_end <= emitted_at[0][0] < first_end + 5
+    assert parser.finish() == RESPONSE
+
+def test_parser_ignores_issue_like_text_elsewhere():
+    """Test arrays under other keys and strings containing brackets."""
+    parser = IncrementalIssueParser()
+    text = '{"notes": "issues: [{}]", "suggestions": [{"a": 1}], "issues": []}'
+    assert parser.feed(text) == []
+
+def completion_stream(text, fail_after=None):
+    """Fake OpenAI stream yielding the text in small deltas, optionally dropping midway."""
+    async def stream():
+        for piece in chunks(text, 8)[:fail_after]:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+        if fail_after is not None:
+            raise ConnectionError("stream dropped")
+
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+        return stream()
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+@pytest.mark.asyncio
+async def test_streaming_analyzer(monkeypatch):
+    """Test issues are emitted during the stream and the result matches."""
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    analyzer = AIQualityAnalyzer()
+    analyzer.client = completion_stream(json.dumps(RESPONSE))
+    received = []
+
+    result = await analyzer.analyze_code_stream("x = eval(input())", on_issue=received.append)
+    assert received == RESPONSE["issues"]
+    assert result["score"] == 62 and result["source"] == "ai"
+    assert "incomplete" not in result and "confidence" not in result
+
+    truncated = {"issues": RESPONSE["issues"], "confidence": 0.3}  # No score
+    analyzer.client = completion_stream(json.dumps(truncated))
+    result = await analyzer.analyze_code_stream("x = eval(input())", on_issue=received.append)
+    assert result["incomplete"] and result["confidence"] == 0.3
+
+@pytest.mark.asyncio
+async def test_failed_stream_resets_before_fallback_issues(monkeypatch):
+    """Test heuristic issues replace partial AI issues after a reset marker."""
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    analyzer = AIQualityAnalyzer()
+    text = json.dumps(RESPONSE)
+    analyzer.client = completion_stream(text, fail_after=text.index('"STYLE"') // 8)
+    received = []
+
+    result = await analyzer.analyze_code_stream("x = eval(input())", on_issue=received.append)
+    assert received[0] == RESPONSE["issues"][0]
+    assert received[1] == {RESET_ISSUES: True, "source": result["source"]}
+    assert result["source"] != "ai" and received[2:] == result["issues"]
+
+class StreamingStub:
+    """Streams two scripted issues."""
+
+    async def analyze_code_stream(self, code, model=None, context=None, on_issue=None):
+        for issue in RESPONSE["issues"]:
+            on_issue(issue)
+        return dict(RESPONSE, source="ai")
+
+@pytest.mark.asyncio
+async def test_subscribers_receive_partial_results(tmp_path, monkeypatch):
+    """Test standard issues, streamed AI issues and the final result in order."""
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    checker = IntegratedQualityChecker()
+    checker.ai_checker = StreamingStub()
+    checker.ai_gate = AIGate({"uncertain_score_range": (0, 100)}, log_file=tmp_path / "gate.jsonl")
+    events = []
+    checker.subscribe(events.append)
+
+    results = await checker.check_code("def f():\n    return 1\n")
+    # The critical FAST finding escalates, so DETAILED streams its issues too
+    assert [e["event"] for e in events] == [EVENT_STANDARD_ISSUES] + [EVENT_AI_ISSUE] * 4 + [EVENT_RESULT]
+    assert [e["issue"]["model"] for e in events[1:5]] == (
+        [AI_MODELS["FAST"]] * 2 + [AI_MODELS["DETAILED"]] * 2
+    )
+    assert events[-1]["result"] is results
+    assert results["first_ai_issue_ms"] >= 0
+    await checker.close()
@@ -0,0 +1,94 @@
+"""
+Test suite for syntax-error backoff.
+
+Tests that files saved mid-edit are not re-parsed until they change,
+that last good results are served as stale, and that the token-based
+checks still report on the broken version.
+"""
+
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from quality_monitor.checkers import TokenChecker
+from quality_monitor.context import AnalysisContext
+from quality_monitor.quality_monitor import QualityMonitor
+
+GOOD_VERSION = '''
+def load(path):
+    """Load a file from disk and return its contents to the caller."""
+    try:
+        return open(path).read()
+    except:
+        return None
+'''
+
+BROKEN_VERSION = '''
+def load(path):
+    """Load a file from disk and return its contents to the caller."""
+    try:
+        return open(path).read(
+    except:
+        return None
+
+def save(path, data):
+    pass
+'''
+
+@pytest.fixture
+def source_file():
+    """Provide a temporary source file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir) / "editing.py"
+
+def test_stale_results_and_token_checks(source_file):
+    """Test the issue set served while a file does not parse."""
+    monitor = QualityMonitor()
+    source_file.write_text(GOOD_VERSION, encoding="utf-8")
+    monitor.check_file(source_file)
+    good_issues = monitor.issues[str(source_file)]
+    assert good_issues and not any(i.get("stale") for i in good_issues)
+
+    source_file.write_text(BROKEN_VERSION, encoding="utf-8")
+    monitor.check_file(source_file)
+    issues = monitor.issues[str(source_file)]
+
+    assert sum(1 for i in issues if i.get("stale")) == len(good_issues)
+    assert any(i["category"] == "Syntax" for i in issues)
+    fresh = [i for i in issues if not i.get("stale")]
+    assert any("bare except" in i["message"] for i in fresh)
+    assert "(stale)" in monitor.generate_report()
+
+def test_unchanged_broken_file_is_not_reparsed(source_file):
+    """Test that repeated events on the same broken content skip parsing."""
+    monitor = QualityMonitor()
+    source_file.write_text(BROKEN_VERSION, encoding="utf-8")
+    monitor.check_file(source_file)
+
+    with mock.patch("quality_monitor.quality_monitor.ast.parse") as parse:
+        monitor.check_file(source_file)
+        source_file.touch()
+        monitor.check_file(source_file)
+        assert parse.call_count == 0
+
+    source_file.write_text(GOOD_VERSION, encoding="utf-8")
+    monitor.check_file(source_file)
+    assert not any(i.get("stale") for i in monitor.issues[str(source_file)])
+
+def test_token_checker_on_partial_code():
+    """Test token checks up to the point where tokenizing fails."""
+    issues = TokenChecker().check(AnalysisContext('''
+class Store:
+    def get(self):
+        try:
+            return 1
+        except ValueError:
+            pass
+    def put(self, value,
+'''))
+    messages = [i["message"] for i in issues]
+    assert "Missing docstring in classdef 'Store'" in messages
+    assert "Missing docstring in functiondef 'get'" in messages
+    assert "Silent failure with pass in except block" in messages